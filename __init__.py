@@ -48,7 +48,7 @@ from .grader_helper.file_operations.extract_studentid_grade import (
     extract_studentid_grade,
 )
 from .grader_helper.file_operations.catch_grades import catch_grades
-from .grader_helper.brightspace_name_folders import brightspace_name_folders
+from .grader_helper.file_operations.brightspace_name_folders import brightspace_name_folders
 
 
 __all__ = [
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compare weighting a large cohort column by column with `apply_weights`.
+
+Builds a frame of random raw scores for several pieces of coursework, then
+times `calculate_weighted_score` per column followed by
+`calculate_total_module_score` against one `apply_weights` call, and checks
+that both give the same totals.
+
+    python benchmarks/bench_apply_weights.py [n_students] [n_coursework]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from grader_helper.dataframe_operations import (
+    apply_weights,
+    calculate_total_module_score,
+    calculate_weighted_score,
+)
+
+
+def make_cohort(n_students: int, n_coursework: int) -> tuple[pd.DataFrame, dict[str, float]]:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "Student ID": np.arange(24000000, 24000000 + n_students).astype(str),
+            "Name": "Student",
+        }
+    )
+    for i in range(1, n_coursework + 1):
+        df[f"Coursework {i} ({100})"] = rng.integers(0, 101, n_students).astype(float)
+    # weights in whole percentages that add up to 1
+    pct = np.full(n_coursework, 100 // n_coursework)
+    pct[-1] += 100 - pct.sum()
+    weights = {f"Coursework {i} (100)": p / 100 for i, p in enumerate(pct, start=1)}
+    return df, weights
+
+
+def per_column(df: pd.DataFrame, weights: dict[str, float]) -> pd.Series:
+    for col, w in weights.items():
+        calculate_weighted_score(df, col, float(w))
+    calculate_total_module_score(df)
+    return df["Total % Grade"]
+
+
+def matrix(df: pd.DataFrame, weights: dict[str, float]) -> pd.Series:
+    apply_weights(df, weights)
+    return df["Total % Grade"]
+
+
+def best_of(fn, df: pd.DataFrame, weights: dict[str, float], repeats: int = 5) -> tuple[float, pd.Series]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        frame = df.copy()
+        start = time.perf_counter()
+        result = fn(frame, weights)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n_students = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_coursework = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    df, weights = make_cohort(n_students, n_coursework)
+    t_cols, total_cols = best_of(per_column, df, weights)
+    t_matrix, total_matrix = best_of(matrix, df, weights)
+
+    print(f"students: {n_students}, coursework columns: {n_coursework}")
+    print(f"per column:    {1000 * t_cols:8.1f} ms")
+    print(f"apply_weights: {1000 * t_matrix:8.1f} ms")
+    print(f"speed-up: {t_cols / t_matrix:.1f}x, totals match: {np.allclose(total_cols, total_matrix)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time `assign_graders_constrained` on a faculty-sized allocation.
+
+Builds a cohort split into tutorial groups, with tutors who can't mark their
+own groups, capped graders, weighted graders, students who can't go back to
+last year's grader and a few preferred pairs, then times the solve and checks
+every constraint held. Also times the worst case for the solver, where every
+student has their own preferences (so no two students can be solved together).
+
+    python benchmarks/bench_assign_constrained.py [n_students] [n_graders]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from grader_helper.assignment import assign_graders_constrained
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    rng = np.random.default_rng(0)
+
+    ids = [str(24000000 + i) for i in range(n)]
+    graders = [f"Grader {j}" for j in range(k)]
+    df = pd.DataFrame({"Student ID": ids, "Group": [f"T{i % (k + k // 2)}" for i in range(n)]})
+    tutors = {g: [f"T{j}"] for j, g in enumerate(graders)}
+    capacity = {g: n // (2 * k) for g in graders[: k // 4]}
+    weights = {g: 2 if j < k // 8 else 1 for j, g in enumerate(graders)}
+    forbidden = [(ids[i], graders[rng.integers(k)]) for i in rng.choice(n, n // 5, replace=False)]
+    preferences = {(ids[i], graders[rng.integers(k)]): -1.0 for i in rng.choice(n, n // 10, replace=False)}
+
+    start = time.perf_counter()
+    out = assign_graders_constrained(
+        df, graders, weights=weights, capacity=capacity, forbidden=forbidden,
+        tutors=tutors, preferences=preferences, seed=1,
+    )
+    took = time.perf_counter() - start
+
+    counts = out["grader"].value_counts()
+    over = sum(counts.get(g, 0) > c for g, c in capacity.items())
+    own = sum(((out["grader"] == g) & out["Group"].isin(t)).sum() for g, t in tutors.items())
+    pairs = set(zip(out["Student ID"], out["grader"]))
+    print(f"{n} students, {k} graders")
+    print(f"  constrained:  {1000 * took:8.1f} ms")
+    print(f"  over capacity: {over}, own group: {own}, forbidden: {len(pairs & set(forbidden))}, "
+          f"preferences met: {len(pairs & set(preferences))}/{len(preferences)}")
+
+    distinct = {(s, graders[j]): float(rng.normal()) for s in ids for j in rng.choice(k, 3, replace=False)}
+    start = time.perf_counter()
+    assign_graders_constrained(df, graders, preferences=distinct, seed=1)
+    print(f"  every student distinct: {1000 * (time.perf_counter() - start):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compare loading a faculty-wide Brightspace classlist the old way with
+`load_brightspace_classlist`.
+
+Writes a classlist export (the usual Brightspace columns, most of them not
+needed) as .csv and .xlsx, then times reading each with pandas' defaults plus
+the rename/select/`#`-stripping `import_brightspace_classlist` used to do,
+against `load_brightspace_classlist` (needed columns only, pinned text dtypes,
+calamine for xlsx, pyarrow for csv), and checks both give the same students.
+
+    python benchmarks/bench_classlist.py [n_students]
+"""
+
+import sys
+import tempfile
+import time
+import pathlib as pl
+
+import numpy as np
+import pandas as pd
+
+from grader_helper.ingesting import load_brightspace_classlist
+
+
+def make_classlist(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    ids = np.arange(24000000, 24000000 + n)
+    return pd.DataFrame({
+        "OrgDefinedId": ids,
+        "Username": [f"#{i}" for i in ids],
+        "Last Name": rng.choice(["Murphy", "Kelly", "O'Sullivan", "Walsh", "Smith"], n),
+        "First Name": rng.choice(["Aoife", "Conor", "Niamh", "Sean", "Ciara"], n),
+        "Email": [f"{i}@studentmail.ul.ie" for i in ids],
+        "Role": "Student",
+        "Section": rng.choice(["LEC01", "LEC02"], n),
+        "Last Accessed": "01/09/2025 10:00",
+        "Group Name": rng.choice([f"Group {g}" for g in range(1, 200)], n),
+        "End-of-Line Indicator": "#",
+    })
+
+
+def old_way(path: pl.Path) -> pd.DataFrame:
+    """What import_brightspace_classlist did before: read everything, then trim."""
+    df = pd.read_csv(path) if path.suffix == ".csv" else pd.read_excel(path)
+    df = df.rename(columns={"Username": "Student ID"})
+    df = df[["Student ID", "Last Name", "First Name"]]
+    df["Student ID"] = df["Student ID"].str.replace("#", "")
+    return df
+
+
+def best_of(fn, path: pl.Path, repeats: int) -> tuple[float, pd.DataFrame]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    classlist = make_classlist(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix, repeats in ((".csv", 5), (".xlsx", 2)):
+            path = pl.Path(tmp) / f"classlist{suffix}"
+            if suffix == ".csv":
+                classlist.to_csv(path, index=False)
+            else:
+                classlist.to_excel(path, index=False)
+
+            t_old, old = best_of(old_way, path, repeats)
+            t_new, new = best_of(load_brightspace_classlist, path, repeats)
+            same = old["Student ID"].tolist() == new.index.tolist()
+
+            print(f"{suffix} ({n} students)")
+            print(f"  pandas defaults:            {1000 * t_old:8.1f} ms")
+            print(f"  load_brightspace_classlist: {1000 * t_new:8.1f} ms")
+            print(f"  speed-up: {t_old / t_new:.1f}x, same students: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measure how long `import grader_helper` takes and what it drags in.
+
+Each measurement runs in a fresh interpreter (so nothing is already cached in
+sys.modules) and is repeated; the best time is reported. Also lists the
+slowest imports from `python -X importtime` and checks that the optional
+backends (xlwings, pythoncom, matplotlib, openpyxl, tqdm) are not loaded until
+something actually uses them.
+
+    python benchmarks/bench_import_time.py [repeats]
+"""
+
+import json
+import subprocess
+import sys
+
+
+HEAVY = ("xlwings", "pythoncom", "matplotlib", "openpyxl", "tqdm", "pandas")
+
+SNIPPETS = {
+    "python (baseline)": "pass",
+    "import grader_helper": "import grader_helper",
+    "... + gh.catch_grades": "import grader_helper as gh; gh.catch_grades",
+    "... + gh.make_letter_grade": "import grader_helper as gh; gh.make_letter_grade",
+}
+
+
+def time_snippet(code: str) -> tuple[float, list[str]]:
+    """Wall time of `code` in a fresh interpreter, and which HEAVY modules it loaded."""
+    probe = (
+        "import sys, time, json\n"
+        "t = time.perf_counter()\n"
+        f"{code}\n"
+        "t = time.perf_counter() - t\n"
+        f"print(json.dumps([t, [m for m in {HEAVY!r} if m in sys.modules]]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    t, loaded = json.loads(out.stdout)
+    return t, loaded
+
+
+def slowest_imports(code: str, n: int = 10) -> list[tuple[int, str]]:
+    """Cumulative microseconds per module from -X importtime, slowest first."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for label, code in SNIPPETS.items():
+        runs = [time_snippet(code) for _ in range(repeats)]
+        best = min(t for t, _ in runs)
+        loaded = runs[0][1]
+        print(f"{label:<30} {1000 * best:8.1f} ms   loads: {', '.join(loaded) or '-'}")
+
+    print("\nslowest imports under `import grader_helper` (cumulative):")
+    for us, name in slowest_imports("import grader_helper"):
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
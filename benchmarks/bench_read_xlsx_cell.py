@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compare the two .xlsx engines of `extract_studentid_grade` on one cell.
+
+Builds a folder of identical feedback sheets (a rubric with styles and
+shared strings), then times reading the grade cell with
+openpyxl's read-only loader and with the streaming reader.
+
+    python benchmarks/bench_read_xlsx_cell.py [n_files]
+"""
+
+import sys
+import tempfile
+import time
+import pathlib as pl
+from shutil import copy2
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill
+
+from grader_helper.file_operations.extract_studentid_grade import _read_openpyxl_value
+from grader_helper.file_operations.read_xlsx_cell import read_xlsx_cell
+
+
+CELL = "B42"
+
+
+def make_template(path: pl.Path) -> None:
+    wb = Workbook()
+    ws = wb.active
+    header = Font(bold=True)
+    fill = PatternFill("solid", fgColor="DDDDDD")
+    for row in range(1, 41):
+        ws.cell(row, 1, f"Criterion {row}").font = header
+        ws.cell(row, 1).fill = fill
+        ws.cell(row, 2, row % 10)
+        ws.cell(row, 3, f"Comment text for criterion {row} " * 5)
+    # openpyxl can't store a formula's cached result, so write the total
+    # directly; that's what both engines see in a sheet Excel has saved.
+    ws[CELL] = 67.5
+    for row in range(43, 200):
+        ws.cell(row, 1, f"Guidance {row}")
+    wb.save(path)
+
+
+def time_reader(reader, paths: list[pl.Path]) -> float:
+    start = time.perf_counter()
+    for p in paths:
+        reader(p, CELL)
+    return time.perf_counter() - start
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pl.Path(tmp)
+        template = root / "template.xlsx"
+        make_template(template)
+        size = template.stat().st_size
+        paths = []
+        for i in range(n_files):
+            p = root / f"Feedback sheet {24000000 + i}.xlsx"
+            copy2(template, p)
+            paths.append(p)
+
+        same = all(
+            _read_openpyxl_value(p, c) == read_xlsx_cell(p, c)
+            for p in paths[:20]
+            for c in (CELL, "A10", "C5", "Z99")
+        )
+
+        t_openpyxl = time_reader(_read_openpyxl_value, paths)
+        t_stream = time_reader(read_xlsx_cell, paths)
+
+    print(f"files:    {n_files} ({size / 1024:.1f} KiB each), cell {CELL}")
+    print(f"openpyxl: {t_openpyxl:.3f}s ({1000 * t_openpyxl / n_files:.2f} ms/file)")
+    print(f"stream:   {t_stream:.3f}s ({1000 * t_stream / n_files:.2f} ms/file)")
+    print(f"speed-up: {t_openpyxl / t_stream:.1f}x, values match: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,60 +5,136 @@
 """ This is the init file the folder that contains all the sub-modules. But it's not the top-level init file."""
 
 
-# ingesting
-from .ingesting.load_graders import load_graders
-from .ingesting.import_brightspace_classlist import import_brightspace_classlist
-from .ingesting.ingest_completed_graderfiles import ingest_completed_graderfiles
+import importlib
 
-# grader assignment
-from .assignment.assign_graders_individual import assign_graders_individual
-from .assignment.assign_graders_groups import assign_graders_groups
-from .assignment.find_unsubmitted import find_unsubmitted
+# Public name -> submodule defining it. Submodules are only imported when one
+# of their names is first used, so `import grader_helper` stays cheap and
+# doesn't pull in pandas, openpyxl or the Excel/COM backends up front.
+_EXPORTS = {
+    # ingesting
+    "load_graders": ".ingesting.load_graders",
+    "import_brightspace_classlist": ".ingesting.import_brightspace_classlist",
+    "load_brightspace_classlist": ".ingesting.load_brightspace_classlist",
+    "ClasslistFormatError": ".ingesting.load_brightspace_classlist",
+    "ingest_completed_graderfiles": ".ingesting.ingest_completed_graderfiles",
+    "ParsedCache": ".ingesting.parsed_cache",
+    "find_grader_conflicts": ".ingesting.find_grader_conflicts",
+    "StudentRegistry": ".ingesting.student_registry",
+    "Student": ".ingesting.student_registry",
 
-# dataframe operations
-from .dataframe_operations.make_letter_grade import make_letter_grade
-from .dataframe_operations.calculate_weighted_score import calculate_weighted_score
-from .dataframe_operations.calculate_total_module_score import (
-    calculate_total_module_score,
-)
-from .dataframe_operations.sort_order_columns import sort_order_columns
-from .dataframe_operations.check_for_weighted_columns import check_for_weighted_columns
-from .dataframe_operations.prepare_data_for_departmental_template import (
-    prepare_data_for_departmental_template,
-)
+    # grader assignment
+    "assign_graders_individual": ".assignment.assign_graders_individual",
+    "assign_graders_groups": ".assignment.assign_graders_groups",
+    "assign_graders_constrained": ".assignment.assign_graders_constrained",
+    "assign_incremental": ".assignment.assign_incremental",
+    "schedule_assessments": ".assignment.schedule_assessments",
+    "find_unsubmitted": ".assignment.find_unsubmitted",
+    "submission_status": ".assignment.find_unsubmitted",
+
+    # dataframe operations
+    "CourseworkSchema": ".dataframe_operations.coursework_schema",
+    "CourseworkColumn": ".dataframe_operations.coursework_schema",
+    "make_letter_grade": ".dataframe_operations.make_letter_grade",
+    "make_letter_grades": ".dataframe_operations.make_letter_grades",
+    "calculate_weighted_score": ".dataframe_operations.calculate_weighted_score",
+    "apply_weights": ".dataframe_operations.apply_weights",
+    "calculate_total_module_score": ".dataframe_operations.calculate_total_module_score",
+    "sort_order_columns": ".dataframe_operations.sort_order_columns",
+    "check_for_weighted_columns": ".dataframe_operations.check_for_weighted_columns",
+    "prepare_data_for_departmental_template": ".dataframe_operations.prepare_data_for_departmental_template",
+    "prepare_departmental_batch": ".dataframe_operations.prepare_departmental_batch",
+    "DepartmentalBatch": ".dataframe_operations.prepare_departmental_batch",
+
+    # file operations
+    "distribute_feedback_sheets": ".file_operations.distribute_feedback_sheets",
+    "distribute_feedback_sheets_groups": ".file_operations.distribute_feedback_sheets",
+    "alphabetise_folders": ".file_operations.alphabetise_folders",
+    "save_distributed_graders": ".file_operations.save_distributed_graders",
+    "save_grader_sheets": ".file_operations.save_grader_sheets",
+    "extract_studentid_grade": ".file_operations.extract_studentid_grade",
+    "extract_cells": ".file_operations.extract_cells",
+    "read_xlsx_cell": ".file_operations.read_xlsx_cell",
+    "recalculate_cell": ".file_operations.recalculate_cell",
+    "UnsupportedFormulaError": ".file_operations.recalculate_cell",
+    "catch_grades": ".file_operations.catch_grades",
+    "iter_grades": ".file_operations.catch_grades",
+    "watch_grades": ".file_operations.watch_grades",
+    "GradeCache": ".file_operations.grade_cache",
+    "GradeCheckpoint": ".file_operations.grade_checkpoint",
+    "SubmissionIndex": ".file_operations.submission_index",
+    "SubmissionFolder": ".file_operations.submission_index",
+    "brightspace_name_folders": ".file_operations.brightspace_name_folders",
+    "moderation_sample": ".file_operations.moderation_sample",
+    "make_sub_date": ".file_operations.scan_multiple_submissions",
+    "scan_multiple_subs": ".file_operations.scan_multiple_submissions",
+    "write_departmental_template": ".file_operations.write_departmental_template",
+    "write_departmental_batch": ".file_operations.write_departmental_template",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
-# file operations
-from .file_operations.distribute_feedback_sheets import distribute_feedback_sheets
-from .file_operations.distribute_feedback_sheets import distribute_feedback_sheets_groups
-from .file_operations.alphabetise_folders import alphabetise_folders
-from .file_operations.save_distributed_graders import save_distributed_graders
-from .file_operations.save_grader_sheets import save_grader_sheets
-from .file_operations.extract_studentid_grade import extract_studentid_grade
-from .file_operations.catch_grades import catch_grades
-from .file_operations.brightspace_name_folders import brightspace_name_folders
-from .file_operations.scan_multiple_submissions import make_sub_date, scan_multiple_subs
 
 __all__ = [
     "load_graders",
     "distribute_feedback_sheets",
-    "distribute_feedback_sheets_group",
+    "distribute_feedback_sheets_groups",
     "assign_graders_individual",
     "assign_graders_groups",
+    "assign_graders_constrained",
+    "assign_incremental",
+    "schedule_assessments",
     "import_brightspace_classlist",
+    "load_brightspace_classlist",
+    "ClasslistFormatError",
     "alphabetise_folders",
     "save_distributed_graders",
     "save_grader_sheets",
     "ingest_completed_graderfiles",
+    "ParsedCache",
+    "find_grader_conflicts",
+    "StudentRegistry",
+    "Student",
     "extract_studentid_grade",
+    "extract_cells",
+    "read_xlsx_cell",
+    "recalculate_cell",
+    "UnsupportedFormulaError",
     "catch_grades",
+    "iter_grades",
+    "watch_grades",
+    "GradeCache",
+    "GradeCheckpoint",
+    "SubmissionIndex",
+    "SubmissionFolder",
+    "CourseworkSchema",
+    "CourseworkColumn",
     "make_letter_grade",
+    "make_letter_grades",
     "calculate_weighted_score",
+    "apply_weights",
     "calculate_total_module_score",
     "sort_order_columns",
     "check_for_weighted_columns",
     "prepare_data_for_departmental_template",
+    "prepare_departmental_batch",
+    "DepartmentalBatch",
     "brightspace_name_folders",
+    "moderation_sample",
     "make_sub_date",
     "scan_multiple_subs",
-    "find_unsubmitted"
+    "write_departmental_template",
+    "write_departmental_batch",
+    "find_unsubmitted",
+    "submission_status",
 ]
@@ -5,11 +5,18 @@
 
 from .assign_graders_individual import assign_graders_individual
 from .assign_graders_groups import assign_graders_groups
-from .find_unsubmitted import find_unsubmitted
+from .assign_graders_constrained import assign_graders_constrained
+from .assign_incremental import assign_incremental
+from .schedule_assessments import schedule_assessments
+from .find_unsubmitted import find_unsubmitted, submission_status
 
 
 __all__ = [
     "assign_graders_individual",
     "assign_graders_groups",
-    "find_unsubmitted"
+    "assign_graders_constrained",
+    "assign_incremental",
+    "schedule_assessments",
+    "find_unsubmitted",
+    "submission_status",
 ]
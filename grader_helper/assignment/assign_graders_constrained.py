@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from typing import Iterable, Mapping, Sequence
+from ..dependencies import pd, np
+from ..ingesting.student_registry import StudentRegistry, _norm_id
+from .assign_graders_individual import _hamilton_quotas
+
+
+def _capped_quotas(
+    n: int, graders: list[str], weights: Mapping[str, float] | None, cap: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """Hamilton quotas, with whatever a capped grader can't take shared out among the others the same way."""
+    counts = _hamilton_quotas(n, graders, weights, rng)
+    while (counts > cap).any():
+        excess = int((counts - cap).clip(min=0).sum())
+        counts = np.minimum(counts, cap)
+        room = np.flatnonzero(counts < cap)
+        counts[room] += _hamilton_quotas(excess, [graders[j] for j in room], weights, rng)
+    return counts
+
+
+def _cost_matrix(
+    ids: list[str],
+    groups: np.ndarray | None,
+    graders: list[str],
+    forbidden: Iterable[tuple[str, str]] | None,
+    tutors: Mapping[str, Iterable[str]] | None,
+    preferences: Mapping[tuple[str, str], float] | None,
+) -> np.ndarray:
+    """Students x graders: 0, plus any preference cost, or inf where the pair is forbidden."""
+    row = {sid: i for i, sid in enumerate(ids)}
+    col = {g: j for j, g in enumerate(graders)}
+    cost = np.zeros((len(ids), len(graders)))
+
+    def cell(sid, grader, what):
+        i, j = row.get(_norm_id(sid)), col.get(grader)
+        if j is None:
+            raise KeyError(f"{what} names grader {grader!r}, who isn't in graders")
+        return i, j  # students not in df are ignored
+
+    for (sid, grader), c in (preferences or {}).items():
+        i, j = cell(sid, grader, "preferences")
+        if i is not None:
+            cost[i, j] += float(c)
+    for sid, grader in forbidden or ():
+        i, j = cell(sid, grader, "forbidden")
+        if i is not None:
+            cost[i, j] = np.inf
+    for grader, own in (tutors or {}).items():
+        _, j = cell(None, grader, "tutors")
+        cost[np.isin(groups, list(own)), j] = np.inf
+    return cost
+
+
+class _FlowSolver:
+    """
+    Min-cost flow from student classes to graders, each grader with two sink
+    arcs: `quota` units at cost 0, then up to `cap` at cost `penalty`.
+
+    Students with the same cost row are one class (supply = how many), so an
+    instance with few constraints has few nodes. Classes are added one at a
+    time by successive shortest paths. A path is class -> grader, then any
+    number of "move a student of class c from grader i to grader j" hops, then
+    the sink; `M[i, j]` is the cheapest such hop out of i and `via[i, j]` its
+    class. Only the rows of graders whose students changed are recomputed after
+    an augmentation, and paths are found by Bellman-Ford over the k graders
+    (hops can cost less than nothing), vectorised over the k x k matrix.
+    """
+
+    def __init__(self, cost: np.ndarray, quota: np.ndarray, cap: np.ndarray, penalty: float):
+        self.cost = cost
+        self.quota = quota
+        self.cap = cap
+        self.penalty = penalty
+        n_classes, k = cost.shape
+        self.flow = np.zeros((n_classes, k), dtype=np.int64)
+        self.load = np.zeros(k, dtype=np.int64)
+        self.M = np.full((k, k), np.inf)
+        self.via = np.zeros((k, k), dtype=np.int64)
+
+    def _refresh(self, j: int) -> None:
+        rows = np.flatnonzero(self.flow[:, j])
+        if len(rows) == 0:
+            self.M[j] = np.inf
+            return
+        hop = self.cost[rows] - self.cost[rows, j][:, None]
+        best = hop.argmin(axis=0)
+        self.M[j] = hop[best, np.arange(hop.shape[1])]
+        self.via[j] = rows[best]
+        self.M[j, j] = np.inf
+
+    def _sink_cost(self) -> np.ndarray:
+        return np.where(
+            self.load < self.quota, 0.0, np.where(self.load < self.cap, self.penalty, np.inf)
+        )
+
+    def add(self, c: int, supply: int) -> int:
+        """Route up to `supply` students of class `c`; returns how many couldn't be placed."""
+        k = len(self.load)
+        cols = np.arange(k)
+        while supply:
+            dist = self.cost[c].copy()
+            parent = np.full(k, -1)
+            for _ in range(k):
+                through = dist[:, None] + self.M
+                best = through.argmin(axis=0)
+                better = through[best, cols] < dist - 1e-9
+                if not better.any():
+                    break
+                dist[better] = through[best, cols][better]
+                parent[better] = best[better]
+
+            total = dist + self._sink_cost()
+            end = int(total.argmin())
+            if not np.isfinite(total[end]):
+                return supply
+
+            hops, j = [], end
+            while parent[j] != -1:
+                i = parent[j]
+                hops.append((int(self.via[i, j]), i, j))
+                j = i
+            start = j
+
+            room = self.quota[end] - self.load[end]
+            if room <= 0:
+                room = self.cap[end] - self.load[end]
+            amount = min(supply, int(room), *(int(self.flow[h, i]) for h, i, _ in hops))
+
+            self.flow[c, start] += amount
+            touched = {start}
+            for h, i, j in hops:
+                self.flow[h, i] -= amount
+                self.flow[h, j] += amount
+                touched.update((i, j))
+            self.load[end] += amount
+            supply -= amount
+            for j in touched:
+                self._refresh(j)
+        return 0
+
+
+def assign_graders_constrained(
+    df: pd.DataFrame | StudentRegistry,
+    graders: Sequence[str],
+    *,
+    weights: Mapping[str, float] | None = None,
+    capacity: Mapping[str, int] | None = None,
+    forbidden: Iterable[tuple[str, str]] | None = None,
+    tutors: Mapping[str, Iterable[str]] | None = None,
+    preferences: Mapping[tuple[str, str], float] | None = None,
+    id_column: str = "Student ID",
+    group_column: str = "Group",
+    column: str = "grader",
+    overwrite: bool = False,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Assign graders to students subject to capacities, forbidden pairs and preferences.
+
+    Each grader's target is their share under `weights` (Hamilton's
+    largest-remainder quotas, exactly as `assign_graders_individual`), clipped
+    to their `capacity` with the surplus shared among the others. The
+    assignment is a min-cost flow: no student goes to a forbidden grader, no
+    grader goes over capacity, every grader gets their target if the forbidden
+    pairs allow it (and as close as possible otherwise), and among those
+    assignments the total preference cost is lowest. Ties are broken at random,
+    reproducibly with `seed`. 3,000 students and 40 graders take well under a
+    second.
+
+    Args:
+        df: DataFrame of students (one row per student), or a StudentRegistry.
+        graders: list of grader names (must be unique).
+        weights: optional mapping {grader_name: weight >= 0}. Missing or all-zero -> uniform.
+        capacity: optional mapping {grader_name: most students they can take}, e.g. their
+            marking hours divided by the hours per script. Graders not in it are uncapped.
+        forbidden: (student ID, grader) pairs that must not happen, e.g. last year's grader.
+        tutors: optional mapping {grader_name: groups they tutor}; students whose
+            `group_column` is one of them aren't given to that grader.
+        preferences: optional mapping {(student ID, grader): cost}. Negative costs are
+            preferred pairs, positive ones avoided if possible.
+        id_column: Student ID column, used to match `forbidden` and `preferences`
+            ("student_id" is tried if it's missing).
+        group_column: column matched against `tutors`.
+        column: name of the output column to write (default "grader").
+        overwrite: if False and column exists, return a copy unchanged.
+        seed: optional RNG seed for reproducibility.
+
+    Returns:
+        A new DataFrame with `column` filled.
+
+    Raises:
+        ValueError: If the capacities can't hold every student, or some students can't
+            be given to any grader.
+        KeyError: If a needed column is missing or a constraint names an unknown grader.
+
+    Example:
+        assign_graders_constrained(
+            classlist, ["Ann", "Bob", "Cat"],
+            capacity={"Cat": 40},
+            tutors={"Ann": ["T1"], "Bob": ["T2"]},
+            forbidden=[("24123456", "Bob")],
+            preferences={("24123457", "Ann"): -1},
+            seed=1,
+        )
+    """
+    df = StudentRegistry.as_frame(df)
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be a pandas DataFrame")
+
+    if column in df.columns and not overwrite:
+        return df.copy()
+
+    graders = list(graders)
+    if len(graders) == 0:
+        raise ValueError("graders must be a non-empty sequence")
+    if len(set(graders)) != len(graders):
+        raise ValueError("grader names must be unique")
+
+    n, k = len(df), len(graders)
+    out = df.copy()
+    if n == 0:
+        out[column] = pd.Series([], dtype="object")
+        return out
+
+    if id_column not in df.columns and "student_id" in df.columns:
+        id_column = "student_id"
+    if (forbidden or preferences) and id_column not in df.columns:
+        raise KeyError(f"Column {id_column} does not exist in df")
+    if tutors and group_column not in df.columns:
+        raise KeyError(f"Column {group_column} does not exist in df")
+
+    cap = np.full(k, n, dtype=np.int64)
+    for g, c in (capacity or {}).items():
+        if g not in graders:
+            raise KeyError(f"capacity names grader {g!r}, who isn't in graders")
+        cap[graders.index(g)] = max(0, min(n, int(c)))
+    if cap.sum() < n:
+        raise ValueError(f"The graders' capacities add up to {cap.sum()}, fewer than the {n} students")
+
+    rng = np.random.default_rng(seed)
+    quota = _capped_quotas(n, graders, weights, cap, rng)
+
+    ids = [_norm_id(x) for x in df[id_column]] if id_column in df.columns else [str(i) for i in range(n)]
+    groups = df[group_column].astype(str).to_numpy() if tutors else None
+    cost = _cost_matrix(ids, groups, graders, forbidden, tutors, preferences)
+
+    # Graders in a random order, so equal-cost choices don't always favour the first
+    order = rng.permutation(k)
+    cost, quota, cap = cost[:, order], quota[order], cap[order]
+
+    classes, inverse, supply = np.unique(cost, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    blocked = ~np.isfinite(classes).any(axis=1)
+    if blocked.any():
+        stuck = [ids[i] for i in np.flatnonzero(blocked[inverse])]
+        raise ValueError(f"{len(stuck)} student(s) can't be given to any grader: {', '.join(stuck[:10])}")
+
+    # Going over a target must cost more than any preference saving it could buy
+    finite = classes[np.isfinite(classes)]
+    penalty = 1.0 + (k + 1) * float(finite.max() - finite.min())
+
+    solver = _FlowSolver(classes, quota, cap, penalty)
+    unplaced = sum(solver.add(c, int(supply[c])) for c in rng.permutation(len(classes)))
+    if unplaced:
+        raise ValueError(
+            f"{unplaced} student(s) can't be placed: every grader they're allowed has reached capacity"
+        )
+
+    # Hand each class's grader counts out to its students at random
+    assigned = np.empty(n, dtype=object)
+    names = np.array(graders, dtype=object)[order]
+    members = np.argsort(inverse, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(supply)))
+    for c in range(len(classes)):
+        rows = members[bounds[c]:bounds[c + 1]]
+        pool = np.repeat(names, solver.flow[c])
+        rng.shuffle(pool)
+        assigned[rows] = pool
+
+    out[column] = assigned
+    return out
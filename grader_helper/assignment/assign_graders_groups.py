@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 
 
+from typing import Mapping
 from ..dependencies import pd, np
+from ..ingesting.student_registry import StudentRegistry
 
 
 def main():
@@ -32,28 +34,99 @@ def main():
     print(updated_df)
 
 
+def _grader_weights(graders: list, weights: Mapping[str, float] | None) -> np.ndarray:
+    """Nonnegative weights aligned to graders; missing -> 0, none or all zero -> uniform."""
+    if weights is None:
+        return np.ones(len(graders))
+    w = np.array([max(0.0, float(weights.get(g, 0.0))) for g in graders], dtype=float)
+    if not np.isfinite(w).all():
+        raise ValueError("weights must be finite numbers")
+    return w if w.sum() > 0 else np.ones(len(graders))
+
+
+def _balanced(sizes: np.ndarray, w: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Longest-processing-time packing: biggest group first, each to the grader who'd
+    finish soonest relative to their weight. Graders are tried in a random order so
+    ties don't always go the same way. Returns a grader index for each group.
+    """
+    k = len(w)
+    order = rng.permutation(k)
+    speed = w[order]
+    load = np.where(speed > 0, 0.0, np.inf)
+    speed = np.where(speed > 0, speed, 1.0)
+    # shuffle first so equal-sized groups are taken in a random order
+    groups = rng.permutation(len(sizes))
+    groups = groups[np.argsort(-sizes[groups], kind="stable")]
+    out = np.empty(len(sizes), dtype=np.int64)
+    for g in groups:
+        j = int(((load + sizes[g]) / speed).argmin())
+        load[j] += sizes[g]
+        out[g] = order[j]
+    return out
+
+
+def _load_report(graders: list, w: np.ndarray, chosen: np.ndarray, sizes: np.ndarray) -> pd.DataFrame:
+    k = len(graders)
+    students = np.bincount(chosen, weights=sizes, minlength=k).astype(int)
+    target = sizes.sum() * w / w.sum()
+    return pd.DataFrame({
+        "groups": np.bincount(chosen, minlength=k),
+        "students": students,
+        "target": target.round(2),
+        "imbalance": (students - target).round(2),
+    }, index=pd.Index(graders, name="grader"))
+
+
 def assign_graders_groups(
-    d: pd.DataFrame, l: list, assigned_grader_col: str = "grader"
+    d: pd.DataFrame | StudentRegistry,
+    l: list,
+    assigned_grader_col: str = "grader",
+    *,
+    balance: bool = False,
+    weights: Mapping[str, float] | None = None,
+    seed: int | None = None,
 ) -> pd.DataFrame:
     """
     Assigns a single grader to each group in a MultiIndex DataFrame.
 
+    By default each group gets a grader at random, so one grader can end up
+    with far more groups (or students) than another. With `balance=True`
+    each group's workload is its number of students (rows), and groups are
+    packed onto graders largest first, each to the grader whose load would
+    then be lowest relative to their weight (the longest-processing-time
+    heuristic: one pass over the sorted groups, so thousands of groups take
+    milliseconds, and loads typically within one group size of each other).
+
     Parameters
     ----------
     d : pandas DataFrame
         A MultiIndex DataFrame containing a column named 'Group', where the first level of the MultiIndex corresponds to the group IDs.
+        A StudentRegistry with groups is indexed by ("Group", "Student ID") first.
+        Students with no group (NaN) are each graded as a group of one.
     l : list
         A list of grader IDs.
     assigned_grader_col : str, optional
         The name of the column where the assigned grader IDs will be stored (default is 'grader').
+    balance : bool, optional
+        Spread the students (not just the groups) evenly across graders (default is False).
+    weights : dict, optional
+        {grader: weight >= 0}; a grader with twice the weight gets about twice the students
+        (with `balance`) or is twice as likely to be picked (without). Missing graders get 0;
+        if none have a positive weight, all are equal.
+    seed : int, optional
+        Seed for reproducible assignments.
 
     Returns
     -------
     pandas DataFrame
         The input DataFrame with an additional column containing the assigned grader IDs.
+        `attrs["grader_load"]` has, per grader, the number of groups and students, their
+        target number of students and the imbalance (students - target).
     """
     try:
         # Input validation
+        d = StudentRegistry.as_frame(d, index=["Group", "Student ID"])
         if not isinstance(d, pd.DataFrame):
             raise ValueError("Argument 'd' must be a pandas DataFrame.")
         if not isinstance(l, list) or len(l) == 0:
@@ -63,18 +136,25 @@ def assign_graders_groups(
                 f"Column '{assigned_grader_col}' already exists in the DataFrame."
             )
 
-        # Create a dictionary mapping each group to a random grader
-        group_grader_map = dict(
-            zip(
-                d.index.get_level_values(0).unique(),
-                np.random.choice(
-                    l, len(d.index.get_level_values(0).unique()), replace=True
-                ),
-            )
-        )
-
-        # Assign the randomly chosen grader to each group
-        d[assigned_grader_col] = d.index.get_level_values(0).map(group_grader_map)
+        codes, groups = pd.factorize(d.index.get_level_values(0))
+        # students with no group (NaN) are each a group of their own
+        alone = codes < 0
+        codes[alone] = len(groups) + np.arange(int(alone.sum()))
+        n_groups = len(groups) + int(alone.sum())
+        sizes = np.bincount(codes, minlength=n_groups).astype(float)
+        w = _grader_weights(l, weights)
+
+        if balance:
+            chosen = _balanced(sizes, w, np.random.default_rng(seed))
+        else:
+            # A random grader for each group
+            rng = np.random.default_rng(seed) if seed is not None else np.random
+            p = None if weights is None else w / w.sum()
+            chosen = rng.choice(len(l), n_groups, replace=True, p=p)
+
+        # Assign the chosen grader to each group
+        d[assigned_grader_col] = np.asarray(l, dtype=object)[chosen][codes]
+        d.attrs["grader_load"] = _load_report(l, w, chosen, sizes)
 
         return d
 
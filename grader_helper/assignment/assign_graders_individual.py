@@ -4,6 +4,7 @@
 import pandas as pd
 import numpy as np
 from typing import Mapping, Sequence
+from ..ingesting.student_registry import StudentRegistry
 
 
 def main():
@@ -18,8 +19,47 @@ def main():
 
 
 
+def _hamilton_quotas(
+    n: int, graders: Sequence[str], weights: Mapping[str, float] | None, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    How many of `n` students each grader gets: ⌊n/k⌋ or ⌈n/k⌉ (which graders get the +1
+    is random), or Hamilton's largest-remainder quotas of `weights` (random tie-breaks).
+    """
+    k = len(graders)
+    if weights is None:
+        # Uniform quotas via divmod (exactly even)
+        q, r = divmod(n, k)
+        # Randomize which graders get the +1 using a permutation
+        order = rng.permutation(k)
+        counts = np.full(k, q, dtype=int)
+        counts[order[:r]] += 1
+        return counts
+
+    # Build nonnegative weights aligned to graders
+    w = np.array([max(0.0, float(weights.get(g, 0.0))) for g in graders], dtype=float)
+    if not np.isfinite(w).all():
+        raise ValueError("weights must be finite numbers")
+    if w.sum() <= 0:
+        # fall back to uniform if all zero/missing
+        w = np.ones(k, dtype=float)
+
+    p = w / w.sum()
+    exp = p * n
+    base = np.floor(exp).astype(int)
+    remainder = exp - base
+    r = int(n - base.sum())
+    # Break ties on remainder randomly to keep it fair
+    tiebreak = rng.random(k)
+    order = np.lexsort((-tiebreak, -remainder))  # sort by remainder desc, then random desc
+    counts = base.copy()
+    if r > 0:
+        counts[order[:r]] += 1
+    return counts
+
+
 def assign_graders_individual(
-    df: pd.DataFrame,
+    df: pd.DataFrame | StudentRegistry,
     graders: Sequence[str],
     *,
     weights: Mapping[str, float] | None = None,
@@ -35,7 +75,7 @@ def assign_graders_individual(
     - Reproducible with `seed`. No interactive prompts.
 
     Args:
-        df: DataFrame of students (one row per student).
+        df: DataFrame of students (one row per student), or a StudentRegistry.
         graders: list/sequence of grader names (must be unique).
         weights: optional mapping {grader_name: weight >= 0}. Missing or all-zero -> uniform.
         column: name of the output column to write (default "grader").
@@ -45,6 +85,7 @@ def assign_graders_individual(
     Returns:
         A new DataFrame with `column` filled.
     """
+    df = StudentRegistry.as_frame(df)
     if not isinstance(df, pd.DataFrame):
         raise TypeError("df must be a pandas DataFrame")
 
@@ -69,36 +110,7 @@ def assign_graders_individual(
     rng = np.random.default_rng(seed)
 
     # --- determine quotas (counts per grader) ---
-    k = len(graders)
-    print(graders)
-
-    if weights is None:
-        # Uniform quotas via divmod (exactly even)
-        q, r = divmod(n, k)
-        # Randomize which graders get the +1 using a permutation
-        order = rng.permutation(k)
-        counts = np.full(k, q, dtype=int)
-        counts[order[:r]] += 1
-    else:
-        # Build nonnegative weights aligned to graders
-        w = np.array([max(0.0, float(weights.get(g, 0.0))) for g in graders], dtype=float)
-        if not np.isfinite(w).all():
-            raise ValueError("weights must be finite numbers")
-        if w.sum() <= 0:
-            # fall back to uniform if all zero/missing
-            w = np.ones(k, dtype=float)
-
-        p = w / w.sum()
-        exp = p * n
-        base = np.floor(exp).astype(int)
-        remainder = exp - base
-        r = int(n - base.sum())
-        # Break ties on remainder randomly to keep it fair
-        tiebreak = rng.random(k)
-        order = np.lexsort((-tiebreak, -remainder))  # sort by remainder desc, then random desc
-        counts = base.copy()
-        if r > 0:
-            counts[order[:r]] += 1
+    counts = _hamilton_quotas(n, graders, weights, rng)
 
     assert counts.sum() == n, "internal error: quotas must sum to N"
 
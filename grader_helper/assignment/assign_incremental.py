@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+from typing import Mapping, Sequence
+from ..dependencies import pd, np
+from ..ingesting.student_registry import StudentRegistry, _norm_id
+from .assign_graders_individual import _hamilton_quotas
+
+
+def assign_incremental(
+    existing: pd.DataFrame | Mapping[str, int],
+    new_students: pd.DataFrame | StudentRegistry,
+    graders: Sequence[str],
+    weights: Mapping[str, float] | None = None,
+    *,
+    column: str = "grader",
+    id_column: str = "Student ID",
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Give late submitters graders without touching anyone already assigned.
+
+    The Hamilton quotas (as in `assign_graders_individual`) are worked out for
+    the whole cohort, existing and new together. The new students fill the
+    graders who are short of their quota: each grader's shortfall is their
+    share of the new students, apportioned the same largest-remainder way if
+    some graders are already over quota. Every grader then has their quota
+    (or as close as the fixed pairings allow). Only the new rows are shuffled
+    and written, so the cost is O(new students). With `existing` as a
+    {grader: count} mapping nothing is proportional to the cohort at all.
+
+    Args:
+        existing: The assignment so far (a DataFrame with `column`), or {grader: how
+            many students they already have}.
+        new_students: DataFrame of the students to place (one row per student), or a
+            StudentRegistry.
+        graders: list of grader names (must be unique); may include graders who
+            have nobody yet.
+        weights: optional mapping {grader_name: weight >= 0}. Missing or all-zero -> uniform.
+        column: name of the grader column (default "grader").
+        id_column: Student ID column; new students already in `existing` are skipped.
+        seed: optional RNG seed for reproducibility.
+
+    Returns:
+        A copy of `new_students` (minus any already assigned) with `column` filled.
+
+    Example:
+        assigned = assign_graders_individual(classlist, graders, seed=1)
+        late = assign_incremental(assigned, late_students, graders, seed=2)
+        assigned = pd.concat([assigned, late], ignore_index=True)
+    """
+    new_students = StudentRegistry.as_frame(new_students)
+    if not isinstance(new_students, pd.DataFrame):
+        raise TypeError("new_students must be a pandas DataFrame")
+
+    graders = list(graders)
+    if len(graders) == 0:
+        raise ValueError("graders must be a non-empty sequence")
+    if len(set(graders)) != len(graders):
+        raise ValueError("grader names must be unique")
+
+    if isinstance(existing, pd.DataFrame):
+        if column not in existing.columns:
+            raise KeyError(f"Column {column} does not exist in existing")
+        if id_column in existing.columns and id_column in new_students.columns:
+            assigned = {_norm_id(x) for x in existing[id_column]}
+            seen = np.array([_norm_id(x) in assigned for x in new_students[id_column]], dtype=bool)
+            if seen.any():
+                logging.warning(f"Skipping {int(seen.sum())} student(s) who already have a grader")
+                new_students = new_students[~seen]
+        counts = existing[column].value_counts()
+    else:
+        counts = pd.Series(existing, dtype="int64")
+    load = np.array([int(counts.get(g, 0)) for g in graders], dtype=int)
+
+    out = new_students.copy()
+    m = len(out)
+    if m == 0:
+        out[column] = pd.Series([], dtype="object")
+        return out
+
+    rng = np.random.default_rng(seed)
+
+    # --- quotas for the whole cohort, and what each grader is short ---
+    quota = _hamilton_quotas(int(load.sum()) + m, graders, weights, rng)
+    short = np.maximum(quota - load, 0)
+    if short.sum() == m:
+        counts = short
+    else:
+        # some graders are over quota already: share the new students by shortfall
+        counts = _hamilton_quotas(m, graders, dict(zip(graders, short.tolist())), rng)
+
+    assert counts.sum() == m, "internal error: counts must sum to the new students"
+
+    pool = np.repeat(np.array(graders, dtype=object), counts)
+    rng.shuffle(pool)
+    out[column] = pool
+    return out
@@ -2,13 +2,17 @@
 # -*- coding: utf-8 -*-
 
 from ..dependencies import pd, pl
+from ..file_operations.submission_index import SubmissionIndex
+from ..ingesting.student_registry import StudentRegistry, _norm_id
 from datetime import datetime
 
-def find_unsubmitted(df:pd.DataFrame, subs_dir:pl.Path, save=False) -> pd.DataFrame:
-    """
-        placeholder docs
-    """
+STATUSES = ["missing", "duplicate", "unmatched folder", "submitted"]
+
+_NAME_COLUMNS = ("Last Name", "First Name", "last_name", "first_name")
 
+
+def _classlist_ids(df: pd.DataFrame) -> list[str]:
+    """The classlist's Student IDs as plain strings ('#24123456' and 24123456.0 -> '24123456')."""
     if not isinstance(df, pd.DataFrame):
         raise TypeError(
             "df must be a pandas dataframe"
@@ -19,52 +23,135 @@ def find_unsubmitted(df:pd.DataFrame, subs_dir:pl.Path, save=False) -> pd.DataFr
             "It can produced by passing the Brightpace grades file to "
             "gh.import_brightspace_classlist(), or by reimporting the completed graderfiles."
             )
+    return [_norm_id(x) for x in df['Student ID']]
 
-    if not subs_dir.is_dir():
-        raise TypeError(
+
+def _submissions_index(subs_dir: pl.Path, index: SubmissionIndex | None) -> SubmissionIndex:
+    subs_dir = pl.Path(subs_dir)
+    if not subs_dir.exists():
+        raise ValueError(
+            f"Could not find the folder at {subs_dir.absolute()}"
             "This function operates on the unzipped folder of student submissions, "
             "please make sure you've downloaded the student submissions from Brightspace "
             "and extracted the archive to a folder."
             )
-    if not subs_dir.exists():
-        raise ValueError(
-            f"Could not find the folder at {subs_dir.absolute()}"
+    if not subs_dir.is_dir():
+        raise TypeError(
             "This function operates on the unzipped folder of student submissions, "
             "please make sure you've downloaded the student submissions from Brightspace "
             "and extracted the archive to a folder."
             )
 
-    # capture the sub_directory names
-    dirs = [dir.name for dir in subs_dir.iterdir() if dir.is_dir()]
-    if len(dirs) == 0:
+    # every folder's name is parsed on its own, so raw Brightspace
+    # ("... - 24123456 Name - date") and renamed ("LAST, FIRST(24123456)")
+    # folders can be mixed in one download
+    index = SubmissionIndex.for_folder(subs_dir, index)
+    if len(index) == 0:
         raise ValueError(
-                "It seems there are no student submission folders in {subs_dir.name}"
-        )
-    first = str(dirs[0])
-    # check the format of the folder names
-    # if they haven't been renamed yet 
-    match first:
-        case first if ' - ' in first:
-            ids = [i.split(' - ')[1].split(' ')[0] for i in dirs]
-        case first if '(' in first:
-            ids = [i.split('(')[1].strip(')').strip() for i in dirs]
-        case _: 
-            raise ValueError(
-                "This subs_dir must be a folder of student submissions downloaded from Brightspace."
-                "You can check for missing submissions either before or after renaming the folders, "
-                "Please make sure you are calling this function on the submissions folder."
+                f"It seems there are no student submission folders in {subs_dir.name}"
         )
+    return index
+
 
+def submission_status(
+    df: pd.DataFrame | StudentRegistry, subs_dir: pl.Path, index: SubmissionIndex | None = None
+) -> pd.DataFrame:
+    """
+    Who has submitted, who hasn't, and which folders don't belong to anyone on the classlist.
+
+    One pass over the submission folders (through `SubmissionIndex`, which
+    classifies each folder's name on its own) and set lookups on Student ID,
+    so 5k+ folders take a few tens of milliseconds.
+
+    Args:
+    df (pd.DataFrame|StudentRegistry): The classlist, with a "Student ID" column.
+    subs_dir (Path): The unzipped submissions folder.
+    index (SubmissionIndex|None): An existing index of subs_dir, to reuse its scan.
+
+    Returns:
+    pd.DataFrame: One row per student on the classlist, then one per folder that matches
+        nobody on it, with "Student ID", the classlist's name columns, "status" (ordered:
+        missing < duplicate < unmatched folder < submitted), "folders" (how many) and
+        "folder" (their names, "; "-joined). Statuses:
+            submitted: exactly one folder has their ID.
+            missing: no folder has their ID.
+            duplicate: more than one folder has their ID.
+            unmatched folder: a folder with no ID in its name (e.g. a group's "Team 3")
+                or an ID that isn't on the classlist.
+
+    Raises:
+    TypeError: If df isn't a DataFrame or subs_dir isn't a folder.
+    ValueError: If df has no Student ID column or subs_dir has no folders.
+
+    Example:
+        status = submission_status(classlist, subs)
+        status[status["status"] != "submitted"]
+    """
+    df = StudentRegistry.as_frame(df)
+    ids = _classlist_ids(df)
+    index = _submissions_index(subs_dir, index)
+
+    found: dict[str, list[str]] = {}
+    stray: list[tuple[str | None, str]] = []
+    on_list = set(ids)
+    for f in index.folders:
+        if f.student_id is not None and f.student_id in on_list:
+            found.setdefault(f.student_id, []).append(f.name)
+        else:
+            stray.append((f.student_id, f.name))
+
+    names = [c for c in _NAME_COLUMNS if c in df.columns]
+    students = pd.DataFrame({"Student ID": ids, **{c: df[c].to_numpy() for c in names}})
+    matched = [found.get(i, []) for i in ids]
+    students["folders"] = [len(m) for m in matched]
+    students["folder"] = ["; ".join(m) for m in matched]
+    students["status"] = pd.cut(
+        students["folders"], [-1, 0, 1, float("inf")], labels=["missing", "submitted", "duplicate"]
+    ).astype(str)
 
-    df['Student ID'] = df['Student ID'].astype(str)
+    folders = pd.DataFrame({
+        "Student ID": [sid for sid, _ in stray],
+        "folders": 1,
+        "folder": [name for _, name in stray],
+        "status": "unmatched folder",
+    })
+    out = pd.concat([students, folders], ignore_index=True)
+    out["status"] = pd.Categorical(out["status"], categories=STATUSES, ordered=True)
+    return out[["Student ID", *names, "status", "folders", "folder"]]
+
+
+def find_unsubmitted(df:pd.DataFrame|StudentRegistry, subs_dir:pl.Path, save=False, index:SubmissionIndex|None=None) -> pd.DataFrame:
+    """
+        The classlist rows of students with no submission folder in subs_dir.
+
+        df: the classlist, or a StudentRegistry of several. It isn't modified.
+        subs_dir: the unzipped submissions folder; raw Brightspace and renamed
+            folders can be mixed.
+        save: also write the result to unsubmitted_<date>.csv next to subs_dir.
+        index: an existing SubmissionIndex of subs_dir, to reuse its scan.
+
+        The full `submission_status` table (submitted, missing, duplicate and
+        unmatched folders) is in the result's attrs["submission_status"].
+    """
+    df = StudentRegistry.as_frame(df)
+    index = _submissions_index(subs_dir, index)
+    if not index.student_ids():
+        raise ValueError(
+            "This subs_dir must be a folder of student submissions downloaded from Brightspace."
+            "You can check for missing submissions either before or after renaming the folders, "
+            "Please make sure you are calling this function on the submissions folder."
+        )
 
-    out = df[~df['Student ID'].isin(ids)]
+    status = submission_status(df, subs_dir, index)
+    missing = (status["status"] == "missing").to_numpy()[:len(df)]
+    out = df[missing].copy()
+    out.attrs["submission_status"] = status
 
     if save:
         try:
             now = datetime.today()
-            out.to_csv(subs_dir.parent/f'unsubmitted_{now.strftime("%Y-%m-%d")}.csv')
+            out.to_csv(pl.Path(subs_dir).parent/f'unsubmitted_{now.strftime("%Y-%m-%d")}.csv')
         except Exception as e:
             print(f"{e}")
 
-    return df[~df['Student ID'].isin(ids)]
+    return out
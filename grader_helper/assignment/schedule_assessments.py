@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from typing import Mapping, Sequence
+from ..dependencies import pd, np
+from ..ingesting.student_registry import StudentRegistry
+from .assign_graders_individual import _hamilton_quotas
+
+
+def _weights(graders: list[str], weights: Mapping[str, float] | None) -> np.ndarray:
+    """Each grader's weight; a grader missing from `weights` has 0, and no `weights` is all 1."""
+    return np.array([max(0.0, float((weights or {}).get(g, 0.0 if weights else 1.0))) for g in graders])
+
+
+def _counts(
+    n: int, graders: list[str], need: np.ndarray, weights: Mapping[str, float] | None,
+    available: np.ndarray, rng: np.random.Generator,
+) -> np.ndarray:
+    """Split `n` scripts among the available graders in proportion to what they're short."""
+    need = np.where(available, need, 0.0)
+    if need.sum() <= 0:
+        # everyone available is at or over target: fall back to their weights
+        need = np.where(available, _weights(graders, weights), 0.0)
+        if need.sum() <= 0:
+            need = available.astype(float)
+    return _hamilton_quotas(n, graders, dict(zip(graders, need.tolist())), rng)
+
+
+def _rotate(hist: np.ndarray, rank: np.ndarray, pool: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    A grader (column of `hist`) for each student, using exactly the graders in `pool`
+    and as few repeat pairings (`hist[student, grader] > 0`) as possible.
+
+    The pool is laid along the students' fixed order and rotated; every rotation that's
+    a multiple of n/(4k) is scored at once and the one with the fewest repeats kept.
+    Students still repeating then swap graders with whichever student gains most from
+    the swap, which keeps every grader's count the same.
+    """
+    n, k = hist.shape
+    rows = np.arange(n)
+    offsets = np.unique(np.arange(4 * k) * n // (4 * k))
+    choices = pool[(rank[None, :] + offsets[:, None]) % n]
+    repeats = hist[rows[None, :], choices].sum(axis=1)
+    g = choices[int(repeats.argmin())].copy()
+
+    for i in rng.permutation(np.flatnonzero(hist[rows, g] > 0)):
+        gi = g[i]
+        if hist[i, gi] == 0:  # fixed by an earlier swap
+            continue
+        gain = hist[i, gi] + hist[rows, g] - hist[i, g] - hist[rows, gi]
+        p = int(gain.argmax())
+        if gain[p] > 0:
+            g[i], g[p] = g[p], gi
+    return g
+
+
+def schedule_assessments(
+    df: pd.DataFrame | StudentRegistry,
+    assessments: Sequence[str] | Mapping[str, float],
+    graders: Sequence[str],
+    *,
+    weights: Mapping[str, float] | None = None,
+    availability: Mapping[str, Sequence[str]] | None = None,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Assign graders for every assessment in a term at once.
+
+    Built on the quotas of `assign_graders_individual`, but across assessments:
+    the workload (scripts x effort per script) each grader has had so far is
+    carried from one assessment to the next, and each assessment's scripts go
+    to graders in proportion to how far they are below their share (`weights`)
+    of the workload to date. So a grader who was unavailable for one assessment,
+    or took the long scripts, gets fewer of the next. Within each assessment
+    students are rotated between graders, so nobody has the same grader twice
+    while there are graders they haven't had, and otherwise as few times as
+    possible.
+
+    Args:
+        df: DataFrame of students (one row per student), or a StudentRegistry.
+        assessments: Assessment names in the order they're marked, or {name: effort per
+            script} (e.g. minutes, > 0) if some take longer to mark. Default effort is 1.
+        graders: list of grader names (must be unique).
+        weights: optional mapping {grader_name: weight >= 0}, their share of the term's
+            workload. Missing or all-zero -> uniform.
+        availability: optional {assessment: graders marking it}; assessments not in it
+            use all graders.
+        seed: optional RNG seed for reproducibility.
+
+    Returns:
+        A copy of `df` with one column per assessment holding its grader.
+        `attrs["grader_load"]` has per grader the scripts for each assessment, their
+        "workload", "target" and "imbalance" (workload - target); `attrs["repeats"]` the
+        number of times a student got a grader they'd already had.
+
+    Raises:
+        ValueError: If an assessment name is already a column of `df`, an effort isn't
+            > 0, or graders are invalid.
+        KeyError: If `availability` names an unknown assessment or grader.
+
+    Example:
+        table = schedule_assessments(
+            classlist, {"Lab 1": 10, "Lab 2": 10, "Report": 30}, graders,
+            availability={"Lab 2": ["Ann", "Bob"]}, seed=1,
+        )
+        table.attrs["grader_load"]
+    """
+    df = StudentRegistry.as_frame(df)
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be a pandas DataFrame")
+
+    effort = dict(assessments) if isinstance(assessments, Mapping) else {a: 1.0 for a in assessments}
+    names = list(effort)
+    if not names:
+        raise ValueError("assessments must be a non-empty sequence")
+    bad = [a for a in names if not 0 < float(effort[a]) < np.inf]
+    if bad:
+        raise ValueError(f"effort per script must be > 0 (check {', '.join(map(str, bad))})")
+    clash = [a for a in names if a in df.columns]
+    if clash:
+        raise ValueError(f"df already has column(s) {', '.join(map(str, clash))}")
+
+    graders = list(graders)
+    if len(graders) == 0:
+        raise ValueError("graders must be a non-empty sequence")
+    if len(set(graders)) != len(graders):
+        raise ValueError("grader names must be unique")
+
+    n, k = len(df), len(graders)
+    available = {a: np.ones(k, dtype=bool) for a in names}
+    for a, who in (availability or {}).items():
+        if a not in effort:
+            raise KeyError(f"availability names assessment {a!r}, which isn't in assessments")
+        unknown = set(who) - set(graders)
+        if unknown:
+            raise KeyError(f"availability for {a!r} names unknown grader(s) {', '.join(sorted(unknown))}")
+        available[a] = np.isin(graders, list(who))
+        if not available[a].any():
+            raise ValueError(f"Nobody is available to mark {a!r}")
+
+    rng = np.random.default_rng(seed)
+    share = _weights(graders, weights)
+    share = share / share.sum() if share.sum() > 0 else np.full(k, 1 / k)
+
+    out = df.copy()
+    scripts = pd.DataFrame(0, index=pd.Index(graders, name="grader"), columns=names)
+    workload = np.zeros(k)
+    hist = np.zeros((n, k), dtype=np.int32)
+    rank = rng.permutation(n)  # each student's fixed place in the rotation
+    order = rng.permutation(k)  # graders' fixed place in the rotation
+    total = 0.0
+    labels = np.array(graders, dtype=object)
+
+    for a in names:
+        e = float(effort[a])
+        if n == 0:
+            out[a] = pd.Series([], dtype="object")
+            continue
+        total += n * e
+        need = (share * total - workload) / e
+        counts = _counts(n, graders, np.maximum(need, 0), weights, available[a], rng)
+        pool = np.repeat(order, counts[order])
+        g = _rotate(hist, rank, pool, rng)
+
+        hist[np.arange(n), g] += 1
+        workload += counts * e
+        scripts[a] = counts
+        out[a] = labels[g]
+
+    target = share * total
+    report = scripts.copy()
+    report["workload"] = workload
+    report["target"] = target.round(2)
+    report["imbalance"] = (workload - target).round(2)
+    out.attrs["grader_load"] = report
+    out.attrs["repeats"] = int(np.maximum(hist - 1, 0).sum())
+    return out
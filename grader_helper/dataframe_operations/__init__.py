@@ -3,22 +3,34 @@
 
 """ This is the init file for the calculations module."""
 
-from matplotlib.pylab import f
+from .coursework_schema import CourseworkSchema, CourseworkColumn
 from .make_letter_grade import make_letter_grade
+from .make_letter_grades import make_letter_grades
 from .calculate_weighted_score import calculate_weighted_score
+from .apply_weights import apply_weights
 from .calculate_total_module_score import calculate_total_module_score
 from .sort_order_columns import sort_order_columns
 from .check_for_weighted_columns import check_for_weighted_columns
 from .prepare_data_for_departmental_template import (
     prepare_data_for_departmental_template,
 )
+from .prepare_departmental_batch import (
+    prepare_departmental_batch,
+    DepartmentalBatch,
+)
 
 
 __all__ = [
+    "CourseworkSchema",
+    "CourseworkColumn",
     "make_letter_grade",
+    "make_letter_grades",
     "calculate_weighted_score",
+    "apply_weights",
     "calculate_total_module_score",
     "sort_order_columns",
     "check_for_weighted_columns",
     "prepare_data_for_departmental_template",
+    "prepare_departmental_batch",
+    "DepartmentalBatch",
 ]
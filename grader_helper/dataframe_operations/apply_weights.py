@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+from typing import Mapping
+from ..dependencies import pd, np
+from .coursework_schema import CourseworkSchema, parse_coursework_column
+
+ROUNDING = ("half_even", "half_up", None)
+VALIDATION = ("strict", "basic", "off")
+
+_WEIGHT_SUFFIX_RE = re.compile(r"^(?P<base>.*?)\s*\((?P<weight>\d+(?:\.\d+)?)\)$")
+
+
+def weighted_column_name(col_name: str, weight: float) -> str:
+    """
+    "Coursework 1 (100)" with weight 0.4 -> "Coursework 1 (40)". The weight is
+    written as a percentage without trailing zeros ("Coursework 2 (33.3)").
+    """
+    pct = f"{round(weight * 100, 6):g}"
+    coursework = parse_coursework_column(col_name)
+    if coursework is not None:
+        return f"Coursework {coursework.number} ({pct})"
+    m = _WEIGHT_SUFFIX_RE.match(col_name)
+    base = m["base"] if m else col_name
+    return f"{base} ({pct})"
+
+
+def _validate(df: pd.DataFrame, weights: dict[str, float], validate: str) -> None:
+    for col, w in weights.items():
+        if not isinstance(w, (int, float, np.number)) or isinstance(w, (bool, np.bool_)):
+            raise ValueError(f"Weight {w!r} for {col} is not a number")
+        if not 0 <= w <= 1:
+            raise ValueError(f"Weight {w} for {col} is not between 0 and 1")
+        if col not in df.columns:
+            raise ValueError(f"Column {col} does not exist in the DataFrame")
+        if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            raise ValueError(
+                f"Column {col} is not numeric. Try `pd.to_numeric(errors='coerce')`, "
+                "but make sure you understand the data before doing this!"
+            )
+
+    if validate != "strict":
+        return
+
+    schema = CourseworkSchema.from_columns(df.columns)
+    already = [col for col in weights if col in schema and schema.get(col).weighted]
+    if already:
+        raise ValueError(
+            f"{', '.join(already)} already hold weighted scores; weight the raw-score '(100)' columns"
+        )
+
+    total = sum(weights.values())
+    if not np.isclose(total, 1.0):
+        raise ValueError(f"Weights add up to {total:g}, not 1")
+    names = [weighted_column_name(col, w) for col, w in weights.items()]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Weighted column names collide: {names}")
+
+
+def apply_weights(
+    df: pd.DataFrame,
+    weights: Mapping[str, float],
+    *,
+    rounding: str | None = "half_even",
+    decimals: int = 0,
+    validate: str = "strict",
+    total_column: str | None = "Total % Grade",
+) -> pd.DataFrame:
+    """
+    Weight every coursework column and total them in one pass.
+
+    The raw-score columns are taken as one float matrix, multiplied by the
+    weight vector and rounded in place, and the weighted columns plus the total
+    are written back to `df` together. This replaces calling
+    `calculate_weighted_score` once per column followed by
+    `calculate_total_module_score`.
+
+    Args:
+    df (pd.DataFrame): DataFrame holding the raw-score columns. Modified in place.
+    weights (dict[str, float]): {raw column: weight between 0 and 1}, e.g.
+        {"Coursework 1 (100)": 0.4, "Coursework 2 (100)": 0.6}.
+    rounding (str|None): How weighted scores are rounded to `decimals` places:
+        "half_even" (the default; what `calculate_weighted_score` does via
+        pandas' round), "half_up" (.5 always rounds up), or None to keep full precision.
+    decimals (int): Decimal places to round weighted scores to. Default is 0.
+    validate (str): "strict" (default) also checks that the weights add up to 1,
+        that no column is already a weighted score and that raw scores are between 0 and 100; "basic" only checks that the
+        columns exist and are numeric and the weights are between 0 and 1;
+        "off" skips all checks.
+    total_column (str|None): Column for the sum of the weighted scores; None to skip it.
+
+    Returns:
+    pd.DataFrame: `df`, with a weighted column per raw column named after its weight
+        ("Coursework 1 (40)") and the total. Missing raw scores give missing weighted
+        scores and count as 0 in the total. A weight of 1 adds no column, as the
+        raw column already is the weighted score.
+
+    Raises:
+    ValueError: If validation fails or `rounding`/`validate` is not recognised.
+
+    Example:
+        apply_weights(df, {"Coursework 1 (100)": 0.4, "Coursework 2 (100)": 0.6})
+        # adds "Coursework 1 (40)", "Coursework 2 (60)" and "Total % Grade"
+    """
+    if rounding not in ROUNDING:
+        raise ValueError(f"rounding must be one of {ROUNDING}, got {rounding!r}")
+    if validate not in VALIDATION:
+        raise ValueError(f"validate must be one of {VALIDATION}, got {validate!r}")
+    weights = dict(weights)
+    if not weights:
+        raise ValueError("weights must name at least one column")
+    if validate != "off":
+        _validate(df, weights, validate)
+
+    cols = list(weights)
+    w = np.fromiter(weights.values(), dtype="float64", count=len(cols))
+
+    # One column-major block (pandas' own layout for float columns) holds the
+    # weighted scores and the total, so filling it from the frame and writing
+    # it back are plain copies; all the arithmetic happens in place.
+    block = np.empty((len(df), len(cols) + 1), order="F")
+    weighted = block[:, :-1]
+    for j, col in enumerate(cols):
+        weighted[:, j] = df[col].to_numpy(dtype="float64", na_value=np.nan)
+
+    if validate == "strict":
+        bad = (weighted < 0) | (weighted > 100)
+        if bad.any():
+            col = cols[int(np.argwhere(bad)[0][1])]
+            raise ValueError(f"{int(bad.sum())} raw scores are outside 0-100 (first in {col})")
+
+    np.multiply(weighted, w, out=weighted)
+    if rounding == "half_even":
+        np.round(weighted, decimals, out=weighted)
+    elif rounding == "half_up":
+        scale = 10.0 ** decimals
+        np.multiply(weighted, scale, out=weighted)
+        np.add(weighted, 0.5, out=weighted)
+        np.floor(weighted, out=weighted)
+        np.divide(weighted, scale, out=weighted)
+    np.nansum(weighted, axis=1, out=block[:, -1])
+
+    names = [weighted_column_name(col, wt) for col, wt in zip(cols, weights.values())]
+    keep = [i for i, (name, col) in enumerate(zip(names, cols)) if name != col]
+    out_names = [names[i] for i in keep]
+    if total_column is not None:
+        keep.append(len(cols))
+        out_names.append(total_column)
+    if out_names:
+        df[out_names] = block if len(keep) == block.shape[1] else block[:, keep]
+
+    return df
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from ..dependencies import pd
+from .coursework_schema import CourseworkSchema
 
 
 def calculate_total_module_score(df: pd.DataFrame) -> None | str:
@@ -25,10 +26,9 @@ def calculate_total_module_score(df: pd.DataFrame) -> None | str:
     if missing_columns:
         return f"DataFrame is missing columns: {', '.join(missing_columns)}"
 
-    # Check for at least one coursework column with '(100)' in its name
-    coursework_columns = [
-        col for col in df.columns if "Coursework" in col and "(100)" in col
-    ]
+    # Check for at least one raw-score coursework column ('Coursework n (100)')
+    schema = CourseworkSchema.from_columns(df.columns)
+    coursework_columns = schema.raw
     if not coursework_columns:
         return "DataFrame is missing a coursework column"
 
@@ -36,16 +36,13 @@ def calculate_total_module_score(df: pd.DataFrame) -> None | str:
     if len(coursework_columns) == 1:
         df["Total % Grade"] = df[coursework_columns[0]]
     else:
-        try:
-            weighted_cols = [
-                col for col in df.columns if "Coursework" in col and "100" not in col
-            ]
-            df["Total % Grade"] = df[weighted_cols].sum(axis=1)
-        except KeyError:
+        weighted_cols = schema.weighted
+        if not weighted_cols:
             return (
                 "It looks like there is something wrong with the column names in the DataFrame. "
                 "This may be because the column names are not in the required format, or because you have not yet used the "
                 "calculate_weighted_score function to calculate the weighted scores of the coursework columns (which is required "
                 "to calculate the total module score). Check your dataframe by running something like `df.head()` or `print(df.columns)`."
             )
+        df["Total % Grade"] = df[weighted_cols].sum(axis=1)
     return None
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from ..dependencies import pd
+from .coursework_schema import parse_coursework_column
 
 
 def calculate_weighted_score(
@@ -34,7 +35,7 @@ def calculate_weighted_score(
         return f"Column name {col_name} is not a string"
 
     # Check if the col_name is in the required format
-    if "Coursework" not in col_name and "(" not in col_name:
+    if parse_coursework_column(col_name) is None:
         return f"""Column name {col_name} is not in the required format.
         It should be in the format 'Coursework n (weight) where n is the 
         number of the coursework and weight is the weight of the coursework as a whole number
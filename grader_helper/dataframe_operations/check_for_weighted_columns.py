@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from collections import Counter
+from .coursework_schema import CourseworkSchema
 
 
 def check_for_weighted_columns(col_list: list[str]) -> bool:
@@ -13,16 +13,11 @@ def check_for_weighted_columns(col_list: list[str]) -> bool:
     Parameters:
     col_list (list of str): List of column names to check.
 
+    Only pieces of coursework that have a raw-score column ("Coursework 1 (100)") are checked.
+
     Returns:
     tuple: A boolean indicating if all weighted columns are present, and a list of missing weighted columns.
     """
-    coursework_numbers = [
-        int(col.split(" (")[0].split(" ")[-1])
-        for col in col_list
-        if col.split(" (")[0].split(" ")[-1].isdigit()
-    ]
-    counts = Counter(coursework_numbers)
-    missing_weighted_columns = [
-        f"Coursework {num}" for num, count in counts.items() if count < 2
-    ]
+    schema = CourseworkSchema.from_columns(col_list)
+    missing_weighted_columns = [f"Coursework {num}" for num in schema.missing_weighted()]
     return not missing_weighted_columns, missing_weighted_columns
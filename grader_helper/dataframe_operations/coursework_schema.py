@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
+
+# "Coursework 1 (100)" (raw score), "Coursework 1 (40)" (apply_weights) and
+# "Coursework 1  (40.0%)" (calculate_weighted_score) all parse.
+_COURSEWORK_RE = re.compile(
+    r"^Coursework\s+(?P<number>\d+)\s*\((?P<weight>\d+(?:\.\d+)?)(?P<pct>%?)\)$"
+)
+
+
+@dataclass(frozen=True)
+class CourseworkColumn:
+    """
+    What a coursework column name says.
+
+    Attributes:
+        name: the column name.
+        number: the coursework number ("Coursework 2 (60)" -> 2).
+        weight: the number in brackets, as a percentage (60.0).
+        weighted: False for the raw score out of 100, True for a weighted score.
+        position: index of the column in the frame.
+    """
+
+    name: str
+    number: int
+    weight: float
+    weighted: bool
+    position: int
+
+
+def parse_coursework_column(name, position: int = -1) -> CourseworkColumn | None:
+    """The parsed column, or None if `name` isn't a coursework column."""
+    if not isinstance(name, str):
+        return None
+    m = _COURSEWORK_RE.match(name.strip())
+    if m is None:
+        return None
+    weight = float(m["weight"])
+    # "(100)" is the raw score; "(100.0%)" is a piece weighted at 100%
+    weighted = bool(m["pct"]) or weight != 100
+    return CourseworkColumn(name, int(m["number"]), weight, weighted, position)
+
+
+class CourseworkSchema:
+    """
+    The coursework columns of a DataFrame, parsed once.
+
+    Every dataframe operation needs to know which columns are raw scores, which
+    are weighted scores and which piece of coursework each belongs to. Build the
+    schema with `CourseworkSchema.from_columns(df.columns)`: it is memoized on
+    the tuple of column names, so repeated calls on the same frame (or frames
+    with the same columns) cost a dict lookup rather than another pass of
+    string parsing.
+
+    Usage:
+        schema = CourseworkSchema.from_columns(df.columns)
+        schema.raw                 # ['Coursework 1 (100)', 'Coursework 2 (100)']
+        schema.missing_weighted()  # [2] if "Coursework 2 (60)" is missing
+        df = df.reindex(columns=["Name", "Student ID", *schema.ordered()])
+    """
+
+    def __init__(self, columns: Iterable):
+        self.columns = tuple(columns)
+        parsed = (parse_coursework_column(c, i) for i, c in enumerate(self.columns))
+        self.coursework: tuple[CourseworkColumn, ...] = tuple(c for c in parsed if c is not None)
+        self._by_name = {c.name: c for c in self.coursework}
+        self._by_number: dict[int, list[CourseworkColumn]] = {}
+        for c in self.coursework:
+            self._by_number.setdefault(c.number, []).append(c)
+
+    @classmethod
+    def from_columns(cls, columns: Iterable) -> "CourseworkSchema":
+        """Cached schema for these column names (e.g. `df.columns`)."""
+        return _schema_for(tuple(columns))
+
+    def __repr__(self) -> str:
+        return f"CourseworkSchema({[c.name for c in self.coursework]!r})"
+
+    def __contains__(self, name) -> bool:
+        return name in self._by_name
+
+    def get(self, name) -> CourseworkColumn | None:
+        return self._by_name.get(name)
+
+    @property
+    def raw(self) -> list[str]:
+        """Raw-score ("(100)") columns, in frame order."""
+        return [c.name for c in self.coursework if not c.weighted]
+
+    @property
+    def weighted(self) -> list[str]:
+        """Weighted-score columns, in frame order."""
+        return [c.name for c in self.coursework if c.weighted]
+
+    @property
+    def numbers(self) -> list[int]:
+        """Coursework numbers present, ascending."""
+        return sorted(self._by_number)
+
+    def for_number(self, number: int) -> list[CourseworkColumn]:
+        return list(self._by_number.get(number, []))
+
+    def missing_weighted(self) -> list[int]:
+        """Coursework numbers that have a raw-score column but no weighted one."""
+        return [
+            n for n in self.numbers
+            if not any(c.weighted for c in self._by_number[n])
+            and any(not c.weighted for c in self._by_number[n])
+        ]
+
+    def ordered(self) -> list[str]:
+        """
+        Coursework columns by number, each raw score first and then its weighted
+        scores from highest weight down.
+        """
+        key = lambda c: (c.number, c.weighted, -c.weight, c.position)
+        return [c.name for c in sorted(self.coursework, key=key)]
+
+
+@lru_cache(maxsize=128)
+def _schema_for(columns: tuple) -> CourseworkSchema:
+    return CourseworkSchema(columns)
@@ -4,10 +4,11 @@
 from ..dependencies import pd
 from . import (
     calculate_total_module_score,
-    make_letter_grade,
+    make_letter_grades,
     check_for_weighted_columns,
     sort_order_columns,
 )
+from .coursework_schema import CourseworkSchema
 
 
 def prepare_data_for_departmental_template(
@@ -21,7 +22,8 @@ def prepare_data_for_departmental_template(
     df (pd.DataFrame): DataFrame containing the columns to prepare for the departmental template
 
     Returns:
-    pd.DataFrame: DataFrame with the columns prepared for the departmental template
+    pd.DataFrame: DataFrame with the columns prepared for the departmental template,
+        ending with "Total % Grade" and an ordered categorical "Grade" column (NG < F < D2 ... < A1)
 
     Note:
     This function does not save the DataFrame to a file, it only prepares the data for the departmental template.
@@ -53,9 +55,8 @@ def prepare_data_for_departmental_template(
         raise ValueError(f"DataFrame is missing columns: {', '.join(missing_columns)}")
 
     # Check that there is at least one column call 'Coursework 1 (100)'
-    coursework_100_columns = [
-        col for col in df.columns if "Coursework" in col and "(100)" in col
-    ]
+    schema = CourseworkSchema.from_columns(df.columns)
+    coursework_100_columns = schema.raw
     if not coursework_100_columns:
         raise ValueError("DataFrame is missing coursework columns")
     elif len(coursework_100_columns) == 1 and "Total % Grade" not in df.columns:
@@ -63,8 +64,9 @@ def prepare_data_for_departmental_template(
         calculate_total_module_score(df)
     elif len(coursework_100_columns) > 1:
         # if there is more than one coursework column, we need to check for the weighted columns
+        # (all of df.columns: the weighted columns are the ones without '(100)')
         weighted_columns_present, missing_weighted_columns = check_for_weighted_columns(
-            coursework_100_columns
+            df.columns
         )
         if weighted_columns_present == False:
             raise ValueError(
@@ -72,7 +74,7 @@ def prepare_data_for_departmental_template(
                              You need to have two columns for each piece of coursework, one for the raw score and one for the weighted score.
                              The raw score should be out of 100 and the weighted score should be out of the total marks for that piece of coursework.
                              For example, if you have a piece of coursework worth 40 marks, you should have two columns: 'Coursework 1 (100)' and 'Coursework 1 (40)' 
-                             You can use the `calculate_weighted_score` function to calculate the weighted score from the raw score, before calling this function."""
+                             You can use the `calculate_weighted_score` or `apply_weights` function to calculate the weighted score from the raw score, before calling this function."""
             )
 
     # check that all the coursework columns are numeric
@@ -87,7 +89,7 @@ def prepare_data_for_departmental_template(
 
     # sort the columns in the correct order
     try:
-        df = df.reindex(columns=sort_order_columns(df))
+        df = df.reindex(columns=sort_order_columns(df.columns))
     except Exception as e:
         raise ValueError(f"Error sorting columns: {e}")
 
@@ -95,6 +97,6 @@ def prepare_data_for_departmental_template(
     calculate_total_module_score(df)
 
     # calculate the letter grades
-    make_letter_grade(df, fail_threshold=fail_threshold)
+    df["Grade"] = make_letter_grades(df["Total % Grade"], fail_threshold=fail_threshold)
 
     return df
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+from ..dependencies import pd, pl
+from .apply_weights import apply_weights
+from .prepare_data_for_departmental_template import prepare_data_for_departmental_template
+
+REPORT_COLUMNS = ["module", "source", "rows", "read_seconds", "prepare_seconds", "error"]
+
+
+@dataclass
+class DepartmentalBatch:
+    """
+    What `prepare_departmental_batch` produced.
+
+    Attributes:
+        combined: every prepared module stacked into one frame, indexed by
+            ("Module", "Student ID"). Columns are the union over modules.
+        modules: {module: prepared DataFrame} for the modules that succeeded.
+        report: one row per module, in input order: where it came from, rows,
+            seconds spent reading and preparing, and the error if it failed.
+    """
+
+    combined: pd.DataFrame
+    modules: dict[str, pd.DataFrame] = field(default_factory=dict)
+    report: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=REPORT_COLUMNS))
+
+    @property
+    def errors(self) -> dict[str, str]:
+        """{module: error} for the modules that failed."""
+        failed = self.report[self.report["error"].notna()]
+        return dict(zip(failed["module"], failed["error"]))
+
+
+def _read_gradebook(path: pl.Path) -> pd.DataFrame:
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(path, dtype={"Student ID": str})
+    if suffix in (".xlsx", ".xlsm", ".xls"):
+        return pd.read_excel(path, dtype={"Student ID": str})
+    if suffix == ".parquet":
+        return pd.read_parquet(path)
+    raise ValueError(f"Don't know how to read {path.name}; use .csv, .xlsx, .xls or .parquet")
+
+
+def _empty_result(module: str, source: pl.Path | pd.DataFrame, error: str | None = None) -> dict:
+    return {
+        "module": module,
+        "source": "DataFrame" if isinstance(source, pd.DataFrame) else str(source),
+        "frame": None,
+        "rows": 0,
+        "read_seconds": 0.0,
+        "prepare_seconds": 0.0,
+        "error": error,
+    }
+
+
+def _prepare_module(
+    module: str,
+    source: pl.Path | pd.DataFrame,
+    weights: Mapping[str, float] | None,
+    fail_threshold: int,
+) -> dict:
+    """
+    Read and prepare one module. Never raises: failures end up in "error" so one
+    bad gradebook can't stop the batch. Lives at module level so process pools
+    can pickle it.
+    """
+    result = _empty_result(module, source)
+    t = time.perf_counter()
+    try:
+        df = source.copy() if isinstance(source, pd.DataFrame) else _read_gradebook(pl.Path(source))
+        result["read_seconds"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        if weights:
+            apply_weights(df, weights)
+        df = prepare_data_for_departmental_template(df, fail_threshold=fail_threshold)
+        result["prepare_seconds"] = time.perf_counter() - t
+    except Exception as e:
+        result["error"] = repr(e)
+        return result
+
+    result["frame"] = df
+    result["rows"] = len(df)
+    return result
+
+
+def _module_sources(
+    paths_or_frames: Mapping[str, pl.Path | pd.DataFrame] | Iterable[pl.Path | pd.DataFrame],
+) -> dict[str, pl.Path | pd.DataFrame]:
+    """{module name: source}; paths are named by their stem, unnamed frames "module_<n>"."""
+    if isinstance(paths_or_frames, Mapping):
+        return {str(k): v for k, v in paths_or_frames.items()}
+
+    sources = {}
+    for i, src in enumerate(paths_or_frames, 1):
+        if isinstance(src, pd.DataFrame):
+            name = f"module_{i}"
+        elif isinstance(src, (str, pl.Path)):
+            name = pl.Path(src).stem
+        else:
+            raise TypeError(f"Expected a path or DataFrame, got {type(src).__name__}")
+        if name in sources:
+            raise ValueError(
+                f"Two modules are both called {name!r}; pass a dict of {{module: path}} to name them"
+            )
+        sources[name] = src
+    return sources
+
+
+def prepare_departmental_batch(
+    paths_or_frames: Mapping[str, pl.Path | pd.DataFrame] | Iterable[pl.Path | pd.DataFrame],
+    workers: int | None = None,
+    *,
+    weights: Mapping[str, Mapping[str, float]] | None = None,
+    fail_threshold: int = 35,
+    output_dir: pl.Path | None = None,
+    progress: bool = True,
+) -> DepartmentalBatch:
+    """
+    Run `prepare_data_for_departmental_template` over many modules at once.
+
+    Each module's gradebook is read, weighted (if `weights` are given for it),
+    totalled and given letter grades, in a process pool when `workers` > 1.
+    A module that fails is recorded in the report with its error and the rest
+    of the batch carries on.
+
+    Args:
+    paths_or_frames: gradebooks as {module: path or DataFrame}, or a list of
+        paths (named after the file stem) and/or DataFrames (named "module_1", ...).
+        Paths can be .csv, .xlsx/.xls or .parquet, with a "Student ID" column.
+    workers (int|None): Number of worker processes; None or 1 runs serially.
+    weights (dict|None): {module: {raw column: weight}} for modules whose weighted
+        columns still need calculating with `apply_weights`. Modules not listed
+        must already have them (or only have one piece of coursework).
+    fail_threshold (int): Passed on to `prepare_data_for_departmental_template`.
+    output_dir (pl.Path|None): If given, each prepared module is written to
+        "<module>.csv" there, along with "all_modules.csv" (the combined frame)
+        and "batch_report.csv".
+    progress (bool): Show a tqdm progress bar.
+
+    Returns:
+    DepartmentalBatch: the combined frame indexed by ("Module", "Student ID"),
+        the per-module frames and a report with the rows, timings and error for
+        each module.
+
+    Raises:
+    TypeError: If an entry of `paths_or_frames` is neither a path nor a DataFrame.
+    ValueError: If two list entries would get the same module name.
+
+    Example:
+        batch = prepare_departmental_batch(pl.Path("boards").glob("*.xlsx"), workers=8)
+        batch.report.sort_values("prepare_seconds")
+        batch.errors  # {module: error} for anything that needs fixing
+    """
+    from ..dependencies import tqdm
+
+    sources = _module_sources(paths_or_frames)
+    weights = weights or {}
+    results = {}
+
+    bar = tqdm(total=len(sources), desc="Preparing modules", disable=not progress)
+    try:
+        if workers is None or workers <= 1:
+            for name, src in sources.items():
+                results[name] = _prepare_module(name, src, weights.get(name), fail_threshold)
+                bar.update()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(_prepare_module, name, src, weights.get(name), fail_threshold): name
+                    for name, src in sources.items()
+                }
+                for fut in as_completed(futures):
+                    name = futures[fut]
+                    try:
+                        results[name] = fut.result()
+                    except Exception as e:
+                        # Worker died or the frame couldn't be pickled; keep the module.
+                        results[name] = _empty_result(name, sources[name], repr(e))
+                    bar.update()
+    finally:
+        bar.close()
+
+    ordered = [results[name] for name in sources]
+    for r in ordered:
+        if r["error"] is None:
+            logging.info(
+                f"{r['module']}: {r['rows']} students, read {r['read_seconds']:.2f}s, "
+                f"prepared {r['prepare_seconds']:.2f}s"
+            )
+        else:
+            logging.warning(f"{r['module']} failed: {r['error']}")
+
+    modules = {r["module"]: r["frame"] for r in ordered if r["error"] is None}
+    report = pd.DataFrame([{k: r[k] for k in REPORT_COLUMNS} for r in ordered], columns=REPORT_COLUMNS)
+    if modules:
+        combined = pd.concat(
+            [df.assign(Module=name) for name, df in modules.items()], ignore_index=True
+        ).set_index(["Module", "Student ID"])
+    else:
+        combined = pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=["Module", "Student ID"]))
+
+    if output_dir is not None:
+        output_dir = pl.Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for name, df in modules.items():
+            df.to_csv(output_dir / f"{name}.csv", index=False)
+        combined.to_csv(output_dir / "all_modules.csv")
+        report.to_csv(output_dir / "batch_report.csv", index=False)
+
+    return DepartmentalBatch(combined, modules, report)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import re
+from .coursework_schema import CourseworkSchema
 
 
 def sort_order_columns(columns: list[str]) -> list[str]:
@@ -43,20 +43,8 @@ def sort_order_columns(columns: list[str]) -> list[str]:
     # Separate non-coursework columns
     non_coursework_cols = ["Name", "Student ID"]
 
-    # Extract coursework information and sort
-    coursework_info = []
-    for col in columns:
-        match = re.match(r"Coursework (\d+) \((\d+)\)", col)
-        if match:
-            coursework_number = int(match.group(1))
-            weight = int(match.group(2))
-            coursework_info.append((coursework_number, weight, col))
-
-    # Sort coursework columns by coursework number (ascending) and then by weight (descending)
-    sorted_coursework_cols = sorted(coursework_info, key=lambda x: (x[0], -x[1]))
-
-    # Flatten the sorted list to get sorted column names
-    sorted_coursework_col_names = [col[2] for col in sorted_coursework_cols]
+    # Coursework columns by number, raw score first, then weighted scores by weight (descending)
+    sorted_coursework_col_names = CourseworkSchema.from_columns(columns).ordered()
 
     # Combine non-coursework columns with sorted coursework columns
     final_columns_order = non_coursework_cols + sorted_coursework_col_names
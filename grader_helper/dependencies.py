@@ -6,14 +6,33 @@ It is not intended to be run as a script.
 
 """
 
+import importlib
 import logging as log
 import pandas as pd
 import numpy as np
 import pathlib as pl
-import xlwings as xw
 from shutil import copy2, copytree
 import re
-from tqdm import tqdm
 from concurrent.futures import ThreadPoolExecutor
-import pythoncom
 import os
+
+# Imported on first use rather than here: xlwings/pythoncom only exist where
+# Excel does (Windows), and tqdm isn't needed just to import the package.
+# `from ..dependencies import xw` still works; do it inside the function that
+# needs it so the import happens when that function runs.
+_LAZY = {
+    "xw": ("xlwings", None),
+    "pythoncom": ("pythoncom", None),
+    "tqdm": ("tqdm", "tqdm"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = importlib.import_module(module_name)
+    if attr is not None:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
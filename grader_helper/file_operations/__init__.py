@@ -7,8 +7,20 @@ from .alphabetise_folders import alphabetise_folders
 from .save_distributed_graders import save_distributed_graders
 from .save_grader_sheets import save_grader_sheets
 from .extract_studentid_grade import extract_studentid_grade
-from .catch_grades import catch_grades
+from .extract_cells import extract_cells
+from .read_xlsx_cell import read_xlsx_cell
+from .recalculate_cell import recalculate_cell, UnsupportedFormulaError
+from .catch_grades import catch_grades, iter_grades
+from .watch_grades import watch_grades
+from .grade_cache import GradeCache
+from .grade_checkpoint import GradeCheckpoint
+from .submission_index import SubmissionIndex, SubmissionFolder
 from .brightspace_name_folders import brightspace_name_folders
+from .moderation_sample import moderation_sample
+from .write_departmental_template import (
+    write_departmental_template,
+    write_departmental_batch,
+)
 
 
 __all__ = [
@@ -18,6 +30,19 @@ __all__ = [
     "save_distributed_graders",
     "save_grader_sheets",
     "extract_studentid_grade",
+    "extract_cells",
+    "read_xlsx_cell",
+    "recalculate_cell",
+    "UnsupportedFormulaError",
     "catch_grades",
+    "iter_grades",
+    "watch_grades",
+    "GradeCache",
+    "GradeCheckpoint",
+    "SubmissionIndex",
+    "SubmissionFolder",
     "brightspace_name_folders",
+    "moderation_sample",
+    "write_departmental_template",
+    "write_departmental_batch",
 ]
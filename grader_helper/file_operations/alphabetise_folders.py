@@ -3,14 +3,19 @@
 
 import pandas as pd
 import pathlib as pl
-import re
 from .scan_multiple_submissions import scan_multiple_subs
+from .submission_index import SubmissionIndex
 
 
 
 
 
-def alphabetise_folders(df: pd.DataFrame, subs_folder: pl.Path, verbose: bool = False):
+def alphabetise_folders(
+    df: pd.DataFrame,
+    subs_folder: pl.Path,
+    verbose: bool = False,
+    index: SubmissionIndex | None = None,
+):
     """
     Rename Brightspace download folders to UL's standard name format.
 
@@ -45,6 +50,9 @@ def alphabetise_folders(df: pd.DataFrame, subs_folder: pl.Path, verbose: bool =
         Path to the directory containing the Brightspace download folders.
     verbose:
         If True, print progress and a summary of outcomes to stdout.
+    index:
+        An existing `SubmissionIndex` of `subs_folder`; one is built if not
+        given. It is refreshed after the renames.
 
     Raises
     ------
@@ -53,7 +61,8 @@ def alphabetise_folders(df: pd.DataFrame, subs_folder: pl.Path, verbose: bool =
         - If no Brightspace-style folders are found to rename.
     """
     # 1. Pre-flight: fail fast if anyone has multiple submissions.
-    duplicates = scan_multiple_subs(subs_folder)
+    index = SubmissionIndex.for_folder(subs_folder, index)
+    duplicates = scan_multiple_subs(subs_folder, index=index)
     if duplicates:
         body = "\n".join(
             f" - {k}: {', '.join(map(str, v))}" for k, v in sorted(duplicates.items())
@@ -86,20 +95,14 @@ def alphabetise_folders(df: pd.DataFrame, subs_folder: pl.Path, verbose: bool =
 
     rename_attempts = []  # Track every attempt, not just successes.
 
-    # Matches the numeric student ID after " - " in Brightspace folder names
-    student_number_pattern = re.compile(r"(?<= - )\d+\b")
-
     # 4. Walk the submissions folder and attempt renames.
-    for folder in subs_folder.iterdir():
-        if not folder.is_dir():
-            continue
-
-        match = student_number_pattern.search(folder.stem)
-        if not match:
+    for entry in index.folders:
+        if entry.style != "brightspace" or entry.student_id is None:
             # Not a Brightspace-style folder; ignore but record nothing.
             continue
 
-        student_number = match.group(0)
+        folder = entry.path
+        student_number = entry.student_id
 
         try:
             (last, first) = name_id_map.get(student_number)
@@ -150,6 +153,8 @@ def alphabetise_folders(df: pd.DataFrame, subs_folder: pl.Path, verbose: bool =
                 }
             )
 
+    index.refresh()  # folder names have changed
+
     # 5. Sanity check: did we see any Brightspace-style folders at all?
     if not rename_attempts:
         if verbose:
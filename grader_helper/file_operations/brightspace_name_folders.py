@@ -3,9 +3,12 @@
 
 
 from ..dependencies import pd, pl
+from .submission_index import SubmissionIndex
 
 
-def brightspace_name_folders(df: pd.DataFrame, subs_folder: pl.Path):
+def brightspace_name_folders(
+    df: pd.DataFrame, subs_folder: pl.Path, index: SubmissionIndex | None = None
+):
     rename_attempts = []
     unfound_names = []
 
@@ -15,43 +18,46 @@ def brightspace_name_folders(df: pd.DataFrame, subs_folder: pl.Path):
 
     name_map = dict(zip(df["Suggested Name"], df["Original Name"]))
 
-    for folder in subs_folder.iterdir():
-        if folder.is_dir():
-            folder_name_upper = folder.name.upper()
-            if folder_name_upper in name_map:
-                new_folder_name = name_map[folder_name_upper]
-                try:
-                    folder.rename(subs_folder / new_folder_name)
-                    print(f"Folder {folder.name} renamed to {new_folder_name}")
-                    rename_attempts.append(
-                        {
-                            "Original Name": folder.name,
-                            "Suggested Name": new_folder_name,
-                            "Outcome": "Renamed",
-                        }
-                    )
-                except Exception as e:
-                    print(
-                        f"Failed to rename folder {
-                            folder.name} to {new_folder_name}: {e}"
-                    )
-                    rename_attempts.append(
-                        {
-                            "Original Name": folder.name,
-                            "Suggested Name": new_folder_name,
-                            "Outcome": f"Failed: {e}",
-                        }
-                    )
-            elif folder_name_upper in df["Original Name"].values:
+    index = SubmissionIndex.for_folder(subs_folder, index)
+    for entry in index.folders:
+        folder = entry.path
+        folder_name_upper = folder.name.upper()
+        if folder_name_upper in name_map:
+            new_folder_name = name_map[folder_name_upper]
+            try:
+                folder.rename(subs_folder / new_folder_name)
+                print(f"Folder {folder.name} renamed to {new_folder_name}")
                 rename_attempts.append(
                     {
                         "Original Name": folder.name,
-                        "Suggested Name": folder.name,
-                        "Outcome": "Already Correct",
+                        "Suggested Name": new_folder_name,
+                        "Outcome": "Renamed",
                     }
                 )
-            else:
-                unfound_names.append(folder.name)
+            except Exception as e:
+                print(
+                    f"Failed to rename folder {
+                        folder.name} to {new_folder_name}: {e}"
+                )
+                rename_attempts.append(
+                    {
+                        "Original Name": folder.name,
+                        "Suggested Name": new_folder_name,
+                        "Outcome": f"Failed: {e}",
+                    }
+                )
+        elif folder_name_upper in df["Original Name"].values:
+            rename_attempts.append(
+                {
+                    "Original Name": folder.name,
+                    "Suggested Name": folder.name,
+                    "Outcome": "Already Correct",
+                }
+            )
+        else:
+            unfound_names.append(folder.name)
+
+    index.refresh()  # folder names have changed
 
     # Log unfound names
     if unfound_names:
@@ -1,40 +1,414 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from ..dependencies import pd, pl, tqdm
-from .extract_studentid_grade import extract_studentid_grade
+from ..dependencies import pd, pl
+from .extract_studentid_grade import (
+    _check_engine,
+    _extract_studentid_grade,
+    _student_id_from_path,
+)
+from .extract_cells import _normalise_cells, extract_cells
+from .grade_cache import GradeCache
+from .grade_checkpoint import GradeCheckpoint
+from .submission_index import FEEDBACK_EXTS, SubmissionIndex
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from typing import Iterator, Mapping, Sequence
+import json
 import logging
 
-def catch_grades(directory: pl.Path, cell: str) -> pd.DataFrame:
-    """
-    Walk `directory`, find .xlsx/.xlsm/.xlsb feedback files, extract (student_id, grade)
-    serially, and return a DataFrame with columns ["Student ID", "grade"].
-    """
+RECORD_COLUMNS = ["Student ID", "grade", "file", "error"]
+
+
+def _check_args(
+    directory: pl.Path,
+    cell: str | None,
+    cells: Mapping[str, str] | Sequence[str] | None,
+    engine: str,
+) -> str | dict[str, str]:
+    """Validate the arguments and return what to read: a cell, or {label: reference}."""
     if not isinstance(directory, pl.Path):
         raise TypeError("directory must be a Path object")
-    if not isinstance(cell, str):
+    if (cell is None) == (cells is None):
+        raise TypeError("pass exactly one of cell or cells")
+    if cell is not None and not isinstance(cell, str):
         raise TypeError("cell must be a string")
     if not directory.exists():
         raise FileNotFoundError(f"Directory not found: {directory}")
+    _check_engine(engine)
+    return cell if cells is None else _normalise_cells(cells)
+
+
+def _find_feedback_sheets(directory: pl.Path, index: SubmissionIndex | None = None) -> list[pl.Path]:
+    """Case-insensitive match on stem; skips Excel's "~$" lock files."""
+    return SubmissionIndex.for_folder(directory, index).feedback_sheets()
+
+
+def _harvest(
+    path: pl.Path,
+    target: str | dict[str, str],
+    allow_xlwings_fallback: bool,
+    engine: str,
+) -> dict:
+    """
+    Read one feedback sheet into a record. Never raises: any failure ends up in
+    the "error" field so one bad workbook can't take down a whole harvest.
+    Lives at module level so process pools can pickle it.
+
+    `target` is a single cell (grade is the value) or {label: reference}
+    (grade is {label: value}, read in one open with `extract_cells`).
+    """
+    record = {
+        "Student ID": _student_id_from_path(path),
+        "grade": None,
+        "file": str(path),
+        "error": None,
+    }
+    try:
+        if isinstance(target, dict):
+            val = extract_cells(path, target, engine=engine)
+            if all(v is None for v in val.values()):
+                val = None
+        else:
+            _, val = _extract_studentid_grade(
+                path, target, allow_xlwings_fallback=allow_xlwings_fallback, engine=engine
+            )
+    except Exception as e:
+        record["error"] = repr(e)
+        return record
+
+    if val is None:
+        record["error"] = f"no value @ {target}"
+    else:
+        record["grade"] = val
+    return record
+
+
+def _iter_parallel(
+    file_paths: list[pl.Path],
+    target: str | dict[str, str],
+    bar,
+    *,
+    workers: int,
+    ordered: bool,
+    max_in_flight: int | None,
+    allow_xlwings_fallback: bool,
+    engine: str,
+) -> Iterator[dict]:
+    # In ordered mode the limit also covers finished results waiting on a slower
+    # earlier file, so memory stays bounded either way.
+    limit = max(1, max_in_flight or workers * 4)
+    pending = {}  # future -> position in file_paths
+    finished = {}  # position -> record, only used when ordered
+    next_submit = 0
+    next_yield = 0
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while next_submit < len(file_paths) or pending:
+            while next_submit < len(file_paths) and next_submit - next_yield < limit:
+                p = file_paths[next_submit]
+                logging.debug(f"Reading: {p}")
+                fut = pool.submit(_harvest, p, target, allow_xlwings_fallback, engine)
+                pending[fut] = next_submit
+                next_submit += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = pending.pop(fut)
+                try:
+                    record = fut.result()
+                except Exception as e:
+                    # Worker died or the task couldn't be pickled; keep the file.
+                    p = file_paths[i]
+                    record = {
+                        "Student ID": _student_id_from_path(p),
+                        "grade": None,
+                        "file": str(p),
+                        "error": repr(e),
+                    }
+                bar.update()
+                if ordered:
+                    finished[i] = record
+                else:
+                    next_yield += 1
+                    yield record
+
+            if ordered:
+                while next_yield in finished:
+                    yield finished.pop(next_yield)
+                    next_yield += 1
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_records(
+    file_paths: list[pl.Path],
+    target: str | dict[str, str],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    allow_xlwings_fallback: bool = True,
+    engine: str = "openpyxl",
+    progress: bool = True,
+) -> Iterator[dict]:
+    from ..dependencies import tqdm
+
+    # The bar lives in the parent process and ticks as results come back,
+    # so it behaves the same with or without a pool.
+    bar = tqdm(total=len(file_paths), desc="Reading feedback", disable=not progress)
+    try:
+        if workers is None or workers <= 1:
+            for p in file_paths:
+                logging.debug(f"Reading: {p}")
+                record = _harvest(p, target, allow_xlwings_fallback, engine)
+                bar.update()
+                yield record
+        else:
+            yield from _iter_parallel(
+                file_paths,
+                target,
+                bar,
+                workers=workers,
+                ordered=ordered,
+                max_in_flight=max_in_flight,
+                allow_xlwings_fallback=allow_xlwings_fallback,
+                engine=engine,
+            )
+    finally:
+        bar.close()
+
+
+def iter_grades(
+    directory: pl.Path,
+    cell: str | None = None,
+    *,
+    cells: Mapping[str, str] | Sequence[str] | None = None,
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    allow_xlwings_fallback: bool = True,
+    engine: str = "openpyxl",
+    progress: bool = True,
+    index: SubmissionIndex | None = None,
+) -> Iterator[dict]:
+    """
+    Lazily harvest grades from every feedback sheet under `directory`.
+
+    Yields one record per file: {"Student ID", "grade", "file", "error"}.
+    Failed files are yielded too, with `grade` None and the reason in `error`.
+    Wrap the iterator in `GradeCheckpoint.tee` to save records as they arrive;
+    `catch_grades(resume=True)` does this for you.
+
+    Args:
+        directory: submissions folder to search recursively.
+        cell: A1 reference of the grade cell, e.g. "B42".
+        cells: instead of `cell`, several cells/ranges/defined names to read in
+            one open (see `extract_cells`); `grade` is then a {label: value} dict.
+        workers: number of worker processes; None or 1 reads serially.
+        ordered: if True, yield in file order; if False, as soon as each file is done.
+        max_in_flight: cap on files submitted but not yet yielded (default 4 * workers).
+        allow_xlwings_fallback: passed through to `extract_studentid_grade` (single cell only).
+        engine: .xlsx/.xlsm reader, "openpyxl" or "stream" (see `extract_studentid_grade`).
+        progress: show a tqdm progress bar.
+        index: a `SubmissionIndex` of `directory` to reuse instead of walking it again.
+
+    Returns:
+        An iterator of record dicts.
+    """
+    target = _check_args(directory, cell, cells, engine)
+    return _iter_records(
+        _find_feedback_sheets(directory, index),
+        target,
+        workers=workers,
+        ordered=ordered,
+        max_in_flight=max_in_flight,
+        allow_xlwings_fallback=allow_xlwings_fallback,
+        engine=engine,
+        progress=progress,
+    )
 
-    # Case-insensitive match on stem; include common Excel formats
-    exts = {".xlsx", ".xlsm", ".xlsb", ".xls"}
-    file_paths = [
-        p for p in directory.rglob("*")
-        if p.suffix.lower() in exts and "feedback sheet" in p.stem.lower()
-    ]
+
+def _spec(target: str | dict[str, str], engine: str) -> str:
+    """What a harvest reads, for keying cached and checkpointed records."""
+    what = target if isinstance(target, str) else json.dumps(target, sort_keys=True)
+    return f"{engine}:{what}"
+
+
+def _iter_cached(
+    file_paths: list[pl.Path],
+    target: str | dict[str, str],
+    cache: GradeCache,
+    **kwargs,
+) -> Iterator[dict]:
+    """Yield cached records first, then read (and cache) only new or changed files."""
+    spec = _spec(target, kwargs.get("engine", "openpyxl"))
+    hits, misses = cache.lookup(file_paths, spec)
+    logging.info(f"Grade cache: {len(hits)} unchanged, {len(misses)} to read")
+
+    for p, (student_id, value) in hits.items():
+        yield {"Student ID": student_id, "grade": value, "file": str(p), "error": None}
+
+    stats = dict(misses)
+    for record in _iter_records([p for p, _ in misses], target, **kwargs):
+        p = pl.Path(record["file"])
+        if record["error"] is None and stats[p] is not None:
+            cache.store(p, stats[p], record["Student ID"], record["grade"], spec)
+        yield record
+
+    cache.commit()
+
+
+def _wide_frame(records, capture_errors: bool) -> pd.DataFrame:
+    """One row per sheet, one numeric column per label read with `cells`."""
+    rows = []
+    for rec in records:
+        if rec["error"] is None:
+            row = {"Student ID": rec["Student ID"], **rec["grade"]}
+        elif capture_errors:
+            row = {"Student ID": rec["Student ID"]}
+        else:
+            logging.warning(f"Skipped ({rec['error']}): {rec['file']}")
+            continue
+        if capture_errors:
+            row["file"], row["error"] = rec["file"], rec["error"]
+        rows.append(row)
+
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return pd.DataFrame(columns=["Student ID"] + (["file", "error"] if capture_errors else []))
+    if capture_errors:
+        # keep the provenance columns at the end
+        frame = frame[[c for c in frame.columns if c not in ("file", "error")] + ["file", "error"]]
+
+    value_cols = [c for c in frame.columns if c not in ("Student ID", "file", "error")]
+    numeric = frame[value_cols].apply(pd.to_numeric, errors="coerce")
+    coerced = int((numeric.isna() & frame[value_cols].notna()).sum().sum())
+    if coerced:
+        logging.warning(f"{coerced} non-numeric value(s) set to NaN")
+    frame[value_cols] = numeric.astype(float)
+    return frame
+
+
+def _grades_frame(records, wide: bool, capture_errors: bool) -> pd.DataFrame:
+    """The frame `catch_grades` returns, from harvest records."""
+    if wide:
+        return _wide_frame(records, capture_errors)
+
+    if capture_errors:
+        return pd.DataFrame(list(records), columns=RECORD_COLUMNS)
 
     data = []
-    for p in tqdm(file_paths, desc="Reading feedback"):
-        logging.debug(f"Reading: {p}")
-        res = extract_studentid_grade(p, cell, allow_xlwings_fallback=True)
-        if res is not None:
-            data.append(res)
+    for rec in records:
+        if rec["error"] is None:
+            data.append((rec["Student ID"], rec["grade"]))
         else:
-            logging.warning(f"Skipped (no value): {p}")
+            logging.warning(f"Skipped ({rec['error']}): {rec['file']}")
 
     return pd.DataFrame(data, columns=["Student ID", "grade"])
 
+
+def catch_grades(
+    directory: pl.Path,
+    cell: str | None = None,
+    *,
+    cells: Mapping[str, str] | Sequence[str] | None = None,
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    capture_errors: bool = False,
+    allow_xlwings_fallback: bool = True,
+    engine: str = "openpyxl",
+    cache: bool | pl.Path = False,
+    cache_hash: bool = False,
+    index: SubmissionIndex | None = None,
+    checkpoint: pl.Path | None = None,
+    resume: bool = False,
+    checkpoint_every: int = 50,
+) -> pd.DataFrame:
+    """
+    Walk `directory`, find .xlsx/.xlsm/.xlsb feedback files, extract (student_id, grade)
+    and return a DataFrame with columns ["Student ID", "grade"].
+
+    Pass `cells` instead of `cell` to read a whole rubric at once, e.g.
+    cells={"Total": "B42", "Criterion": "B10:B17"}: every sheet is opened once
+    and the result is wide, with "Student ID" followed by one float column per
+    label (ranges expand to "Criterion 1", "Criterion 2", ...). Values that
+    aren't numeric become NaN.
+
+    Files are read serially by default; pass `workers` to spread them over a
+    process pool (see `iter_grades` for the remaining options).
+
+    If `capture_errors` is True, files that couldn't be read are kept in the
+    output and the frame gets two extra columns, "file" and "error".
+    Otherwise they're logged and dropped.
+
+    With `cache=True` extracted grades are kept in a SQLite file in `directory`
+    (or at the given path) and later runs only reopen sheets that are new or
+    whose size/mtime changed; entries for deleted sheets are dropped. Set
+    `cache_hash=True` to also compare file contents, so a sheet that was only
+    touched isn't re-read. See `GradeCache`.
+
+    Pass an existing `SubmissionIndex` of `directory` as `index` to skip the
+    directory walk.
+
+    Long harvests can be made restartable: with `checkpoint` (a file path) or
+    `resume=True` every record is appended to a checkpoint file as it comes in,
+    `checkpoint_every` records at a time (default file:
+    `.grader_helper_checkpoint.jsonl` in `directory`). If the run dies, call
+    again with `resume=True` and sheets already read successfully are taken
+    from the checkpoint instead of being reopened; failed ones are retried.
+    The checkpoint is deleted once the harvest completes. See `GradeCheckpoint`.
+    """
+    target = _check_args(directory, cell, cells, engine)
+    file_paths = _find_feedback_sheets(directory, index)
+    options = dict(
+        workers=workers,
+        ordered=ordered,
+        max_in_flight=max_in_flight,
+        allow_xlwings_fallback=allow_xlwings_fallback,
+        engine=engine,
+    )
+
+    with ExitStack() as stack:
+        ckpt = None
+        if checkpoint is not None or resume:
+            if checkpoint is None:
+                checkpoint = directory / GradeCheckpoint.FILENAME
+            ckpt = stack.enter_context(
+                GradeCheckpoint(
+                    checkpoint, _spec(target, engine), batch_size=checkpoint_every, resume=resume
+                )
+            )
+        done = ckpt.done if ckpt is not None else {}
+        pending = [p for p in file_paths if str(p) not in done]
+        if done:
+            logging.info(f"Resuming from {ckpt.path}: {len(done)} sheets done, {len(pending)} to read")
+
+        grade_cache = None
+        if cache:
+            db_path = None if cache is True else pl.Path(cache)
+            grade_cache = stack.enter_context(
+                GradeCache(directory, db_path, hash_contents=cache_hash)
+            )
+            records = _iter_cached(pending, target, grade_cache, **options)
+        else:
+            records = _iter_records(pending, target, **options)
+
+        if ckpt is not None:
+            records = ckpt.tee(records)
+        if ckpt is not None or grade_cache is not None:
+            by_file = dict(done)
+            by_file.update((rec["file"], rec) for rec in records)
+            records = [by_file[str(p)] for p in file_paths]
+            if grade_cache is not None:
+                grade_cache.prune(file_paths)
+            if ckpt is not None:
+                ckpt.remove()
+
+    return _grades_frame(records, cells is not None, capture_errors)
+
 # def catch_grades(directory: pl.Path, cell: str) -> pd.DataFrame:
 #     """
 #     Walk `directory`, find .xlsx feedback files, extract (student_id, grade)
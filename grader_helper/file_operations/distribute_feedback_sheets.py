@@ -1,12 +1,35 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import re
 import pathlib as pl
-from shutil import copy2
+from shutil import copyfileobj, copystat
+from .submission_index import SubmissionIndex
 
 
-def distribute_feedback_sheets(subs_folder: pl.Path, rubric_name: pl.Path) -> None:
+def _copy_if_absent(rubric: pl.Path, target: pl.Path) -> bool:
+    """
+    Copy the rubric to `target` unless a file is already there; True if copied.
+
+    The target is created with an exclusive open, so a grader's sheet is never
+    replaced, even one created since the folder was indexed.
+    """
+    try:
+        dst = open(target, "xb")
+    except FileExistsError:
+        return False
+    try:
+        with dst, open(rubric, "rb") as src:
+            copyfileobj(src, dst)
+        copystat(rubric, target)
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def distribute_feedback_sheets(
+    subs_folder: pl.Path, rubric_name: pl.Path, index: SubmissionIndex | None = None
+) -> None:
     """
     Copies a copy of the rubric to the feedback folder of each student who submitted an distributement.
 
@@ -16,41 +39,45 @@ def distribute_feedback_sheets(subs_folder: pl.Path, rubric_name: pl.Path) -> No
         The folder where the student submissions are stored.
     rubric_name : pathlib.Path
         The name of the rubric file to be attached.
+    index : SubmissionIndex, optional
+        An existing index of `subs_folder`; one is built if not given.
 
     Returns
     -------
     None
     """
-    # Assuming 'subs' and 'root' are defined Path objects
-    pattern = re.compile(r"\((\d+)\)")
-
     if not rubric_name.exists():
         raise FileNotFoundError(f"{rubric_name} does not exist.")
 
-    for folder in subs_folder.iterdir():
-        if not folder.is_dir():
-            print(f"{folder} is not a directory.")
-        else:
-            # Extract student ID from folder name
-            match = pattern.search(folder.name)
-            if match:
-                student_id = match.group(1)
-                target_file = folder / f"Feedback sheet {student_id}.xlsx"
-
-                # Check if the file already exists to prevent overwriting
-                if not target_file.exists():
-                    copy2(rubric_name, target_file)
-                    print(f"Copied rubric to {target_file}")
-                else:
-                    print(
-                        f"The file {target_file} already exists. Skipping copy to prevent overwrite."
-                    )
+    index = SubmissionIndex.for_folder(subs_folder, index)
+    for path in index.stray_files:
+        print(f"{path} is not a directory.")
+
+    copied = False
+    for folder in index.folders:
+        # Student ID from the renamed "LAST, FIRST(1234567)" folder name
+        if folder.style == "ul":
+            target_file = folder.path / f"Feedback sheet {folder.student_id}.xlsx"
+
+            # Only ever creates the file, so an existing sheet is never overwritten
+            if _copy_if_absent(rubric_name, target_file):
+                copied = True
+                print(f"Copied rubric to {target_file}")
             else:
-                print(f"No student ID found in {folder.name}.")
+                print(
+                    f"The file {target_file} already exists. Skipping copy to prevent overwrite."
+                )
+        else:
+            print(f"No student ID found in {folder.name}.")
 
+    if copied:
+        index.refresh()
 
 
-def distribute_feedback_sheets_groups(subs_folder: pl.Path, rubric_name: pl.Path) -> None:
+
+def distribute_feedback_sheets_groups(
+    subs_folder: pl.Path, rubric_name: pl.Path, index: SubmissionIndex | None = None
+) -> None:
     """
     Copies a copy of the rubric to the feedback folder of each group.
 
@@ -60,37 +87,39 @@ def distribute_feedback_sheets_groups(subs_folder: pl.Path, rubric_name: pl.Path
         The folder where the student submissions are stored.
     rubric_name : pathlib.Path
         The name of the rubric file to be attached.
+    index : SubmissionIndex, optional
+        An existing index of `subs_folder`; one is built if not given.
 
     Returns
     -------
     None
     """
-    # Assuming 'subs' and 'root' are defined Path objects
-    pattern = re.compile(r"(?<= - )Team [1-9]\d*(?= - )")
-
     if not rubric_name.exists():
         raise FileNotFoundError(f"{rubric_name} does not exist.")
 
-    for folder in subs_folder.iterdir():
-        if not folder.is_dir():
-            print(f"{folder} is not a directory.")
-        else:
-            # Extract student ID from folder name
-            match = pattern.search(folder.name)
-            if match:
-                team_id = match.group(0)
-                target_file = folder / f"Feedback sheet {team_id}.xlsx"
-
-                # Check if the file already exists to prevent overwriting
-                if not target_file.exists():
-                    copy2(rubric_name, target_file)
-                    print(f"Copied rubric to {target_file}")
-                else:
-                    print(
-                        f"The file {target_file} already exists. Skipping copy to prevent overwrite."
-                    )
+    index = SubmissionIndex.for_folder(subs_folder, index)
+    for path in index.stray_files:
+        print(f"{path} is not a directory.")
+
+    copied = False
+    for folder in index.folders:
+        # Team from the Brightspace "... - Team 3 - ..." folder name
+        if folder.team is not None:
+            target_file = folder.path / f"Feedback sheet {folder.team}.xlsx"
+
+            # Only ever creates the file, so an existing sheet is never overwritten
+            if _copy_if_absent(rubric_name, target_file):
+                copied = True
+                print(f"Copied rubric to {target_file}")
             else:
-                print(f"No team ID found in {folder.name}.")
+                print(
+                    f"The file {target_file} already exists. Skipping copy to prevent overwrite."
+                )
+        else:
+            print(f"No team ID found in {folder.name}.")
+
+    if copied:
+        index.refresh()
 
 
 
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from ..dependencies import pd, pl
+from typing import Callable, Mapping, Sequence
+from .extract_studentid_grade import _check_engine
+from .read_xlsx_cell import _XlsxWorkbook, _parse_ref
+
+
+def _normalise_cells(cells: Mapping[str, str] | Sequence[str]) -> dict[str, str]:
+    """{label: reference}; a plain list uses each reference as its own label."""
+    if isinstance(cells, str):
+        raise TypeError("cells must be a mapping or a list of references, not a single string")
+    if isinstance(cells, Mapping):
+        refs = {str(label): str(ref) for label, ref in cells.items()}
+    else:
+        refs = {str(ref): str(ref) for ref in cells}
+    if not refs:
+        raise ValueError("cells must name at least one cell, range or defined name")
+    return refs
+
+
+def _resolve(refs: dict[str, str], names: Mapping[str, str]) -> dict:
+    """Turn every reference into (sheet, [(row, col), ...]), looking up defined names."""
+    by_lower = {name.lower(): text for name, text in names.items()}  # names aren't case-sensitive
+    resolved = {}
+    for label, ref in refs.items():
+        parsed = _parse_ref(ref)
+        if parsed is None:
+            target = by_lower.get(ref.strip().lower())
+            if target is None:
+                raise KeyError(
+                    f"'{ref}' is neither a cell/range reference nor a defined name in the workbook"
+                )
+            parsed = _parse_ref(target)
+            if parsed is None:
+                raise ValueError(
+                    f"defined name '{ref}' refers to '{target}', which isn't a single cell or range"
+                )
+        resolved[label] = parsed
+    return resolved
+
+
+def _collect(resolved: dict, first_sheet: str | None, read_sheet: Callable) -> dict:
+    """Read each sheet once for all its cells, then lay the values out by label."""
+    wanted: dict[str | None, set] = {}
+    for label, (sheet, coords) in resolved.items():
+        sheet = first_sheet if sheet is None else sheet
+        resolved[label] = (sheet, coords)
+        wanted.setdefault(sheet, set()).update(coords)
+
+    values = {sheet: read_sheet(sheet, coords) for sheet, coords in wanted.items()}
+
+    out = {}
+    for label, (sheet, coords) in resolved.items():
+        if len(coords) == 1:
+            out[label] = values[sheet][coords[0]]
+        else:
+            for i, rc in enumerate(coords, start=1):
+                out[f"{label} {i}"] = values[sheet][rc]
+    return out
+
+
+def _extract_cells_stream(path: pl.Path, refs: dict[str, str]) -> dict:
+    with _XlsxWorkbook(path) as wb:
+        return _collect(_resolve(refs, wb.defined_names), wb.first_sheet, wb.read)
+
+
+def _extract_cells_openpyxl(path: pl.Path, refs: dict[str, str]) -> dict:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filename=str(path), data_only=True, read_only=True)
+    try:
+        first = wb.worksheets[0]
+        names = {name: defn.attr_text for name, defn in wb.defined_names.items()}
+        names.update(
+            {name: defn.attr_text for name, defn in getattr(first, "defined_names", {}).items()}
+        )
+
+        def read_sheet(sheet: str, coords: set) -> dict:
+            # Read-only worksheets re-parse the XML on every ws[cell], so pull
+            # the bounding box of all the wanted cells in one iter_rows pass.
+            rows = [r for r, _ in coords]
+            cols = [c for _, c in coords]
+            grid = {}
+            block = wb[sheet].iter_rows(
+                min_row=min(rows), max_row=max(rows),
+                min_col=min(cols), max_col=max(cols),
+                values_only=True,
+            )
+            for r, row in enumerate(block, start=min(rows)):
+                for c, value in enumerate(row, start=min(cols)):
+                    grid[(r, c)] = value
+            return {rc: grid.get(rc) for rc in coords}
+
+        return _collect(_resolve(refs, names), first.title, read_sheet)
+    finally:
+        wb.close()
+
+
+def _extract_cells_calamine(path: pl.Path, refs: dict[str, str]) -> dict:
+    def read_sheet(sheet: str | None, coords: set) -> dict:
+        df = pd.read_excel(
+            str(path),
+            engine="calamine",
+            sheet_name=0 if sheet is None else sheet,
+            header=None,
+            nrows=max(r for r, _ in coords),
+        )
+        out = {}
+        for r, c in coords:
+            inside = r - 1 < df.shape[0] and c - 1 < df.shape[1]
+            value = df.iat[r - 1, c - 1] if inside else None
+            out[(r, c)] = None if value is None or pd.isna(value) else value
+        return out
+
+    # calamine doesn't expose defined names through pandas
+    return _collect(_resolve(refs, {}), None, read_sheet)
+
+
+def extract_cells(
+    file_path: pl.Path,
+    cells: Mapping[str, str] | Sequence[str],
+    *,
+    engine: str = "openpyxl",
+) -> dict[str, object]:
+    """
+    Read several cells from a feedback workbook in a single open.
+
+    Each reference can be a cell ("B42"), a range ("B10:B17"), either of those
+    on another sheet ("'Rubric'!B10"), or a defined name ("TotalScore").
+    Unqualified references point at the first worksheet. Every sheet involved
+    is parsed once, however many cells are read from it.
+
+    Args:
+        file_path: .xlsx/.xlsm (read with `engine`) or .xlsb/.xls (calamine;
+            defined names are not available there).
+        cells: {label: reference}, or a list of references used as their own labels.
+        engine: "openpyxl" or "stream", as for `extract_studentid_grade`.
+
+    Returns:
+        {label: cached value}. A range (or a name that refers to one) expands to
+        "label 1", "label 2", ... in row-major order. Empty cells are None.
+
+    Raises:
+        KeyError: if a reference is neither A1 notation nor a defined name in the
+            workbook, or names a sheet the workbook doesn't have.
+        ValueError: if a defined name refers to something other than one range.
+
+    Example:
+        extract_cells(p, {"Total": "B42", "Criteria": "B10:B17"})
+        # {"Total": 67.5, "Criteria 1": 8, ..., "Criteria 8": 9}
+    """
+    _check_engine(engine)
+    refs = _normalise_cells(cells)
+    file_path = pl.Path(file_path)
+
+    match file_path.suffix.lower():
+        case ".xlsb" | ".xls":
+            return _extract_cells_calamine(file_path, refs)
+        case _ if engine == "stream":
+            return _extract_cells_stream(file_path, refs)
+        case _:
+            return _extract_cells_openpyxl(file_path, refs)
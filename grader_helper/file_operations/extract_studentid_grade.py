@@ -3,15 +3,27 @@
 
 import logging
 import re
-from ..dependencies import xw, pythoncom, pd, pl
-from openpyxl import load_workbook
+import sys
+from ..dependencies import pd, pl
+from .read_xlsx_cell import read_xlsx_cell
+from .recalculate_cell import UnsupportedFormulaError, recalculate_cell
 
 
 _A1_RE = re.compile(r"^([A-Za-z]+)(\d+)$")
 
+# Readers for .xlsx/.xlsm; .xlsb/.xls always go through calamine.
+ENGINES = ("openpyxl", "stream")
+
+
+def _check_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+
 
 def _read_openpyxl_value(path: pl.Path, cell: str):
     """Return cached (last-saved) value of `cell` using openpyxl; None if absent."""
+    from openpyxl import load_workbook
+
     wb = None
     try:
         wb = load_workbook(filename=str(path), data_only=True, read_only=True)
@@ -49,6 +61,8 @@ def _read_calamine_value(path: pl.Path, cell: str):
 
 def _read_xlwings_value(path: pl.Path, cell: str):
     """Force recalc via Excel/COM and read live value."""
+    from ..dependencies import xw, pythoncom
+
     app = None
     com_inited = False
     try:
@@ -87,48 +101,116 @@ def _read_xlwings_value(path: pl.Path, cell: str):
                 pass
 
 
-def extract_studentid_grade(file_path: pl.Path, cell: str, *, allow_xlwings_fallback: bool = True):
-    """
-    Read a single cell from a feedback workbook and return (student_id, value).
+def _excel_available() -> bool:
+    """xlwings drives Excel through COM here, so a live recalc is only possible on Windows."""
+    return sys.platform == "win32"
 
-    Strategy:
-      1) If .xlsx/.xlsm -> openpyxl (cached value, fast)
-      2) If .xlsb/.xls   -> pandas+calamine (cached value)
-      3) If value is None or a formula-like string and fallback allowed -> xlwings (recalc)
+
+def _student_id_from_path(file_path: pl.Path) -> str:
+    """Infer the student id from a feedback filename: last space-separated token of stem."""
+    return pl.Path(file_path).stem.split(" ")[-1]
+
+
+def _extract_studentid_grade(
+    file_path: pl.Path,
+    cell: str,
+    *,
+    allow_xlwings_fallback: bool = True,
+    allow_formula_fallback: bool = True,
+    engine: str = "openpyxl",
+):
     """
-    try:
-        # Infer student id from filename: last space-separated token of stem
-        student_id = pl.Path(file_path).stem.split(" ")[-1]
+    Same strategy as `extract_studentid_grade`, but read errors propagate to the
+    caller and a missing value comes back as (student_id, None).
+    """
+    student_id = _student_id_from_path(file_path)
 
-        suffix = file_path.suffix.lower()
-        val = None
+    suffix = file_path.suffix.lower()
+    val = None
 
-        if suffix in {".xlsx", ".xlsm"}:
-            val = _read_openpyxl_value(file_path, cell)
-        elif suffix in {".xlsb", ".xls"}:
-            val = _read_calamine_value(file_path, cell)
+    if suffix in {".xlsx", ".xlsm"}:
+        if engine == "stream":
+            val = read_xlsx_cell(file_path, cell)
         else:
-            # Unknown format → try openpyxl anyway; if fails, xlwings below
             val = _read_openpyxl_value(file_path, cell)
+    elif suffix in {".xlsb", ".xls"}:
+        val = _read_calamine_value(file_path, cell)
+    else:
+        # Unknown format → try openpyxl anyway; if fails, xlwings below
+        val = _read_openpyxl_value(file_path, cell)
 
-        # If we got a usable value (not a formula string), return it
-        if val is not None and not (isinstance(val, str) and val.startswith("=")):
-            return student_id, val
+    # If we got a usable value (not a formula string), return it
+    if val is not None and not (isinstance(val, str) and val.startswith("=")):
+        return student_id, val
 
-        # Optional: fallback to live Excel recalc for stale/missing formula results
-        if allow_xlwings_fallback:
-            val2 = _read_xlwings_value(file_path, cell)
-            if val2 is not None:
-                return student_id, val2
+    # Stale/missing formula result: recalculate the cell's chain in Python
+    if allow_formula_fallback and suffix in {".xlsx", ".xlsm"}:
+        try:
+            val = recalculate_cell(file_path, cell)
+        except UnsupportedFormulaError as e:
+            logging.info(f"Can't recalculate {file_path} @ {cell} in Python: {e}")
+        else:
+            if val is not None:
+                return student_id, val
 
-        # If everything failed, log and signal skip
-        logging.warning(f"No value read from {file_path} @ {cell} (suffix={suffix})")
-        return None
+    # Last resort: live Excel recalc, where Excel can actually run
+    if allow_xlwings_fallback and _excel_available():
+        val2 = _read_xlwings_value(file_path, cell)
+        if val2 is not None:
+            return student_id, val2
+
+    return student_id, None
+
+
+def extract_studentid_grade(
+    file_path: pl.Path,
+    cell: str,
+    *,
+    allow_xlwings_fallback: bool = True,
+    allow_formula_fallback: bool = True,
+    engine: str = "openpyxl",
+):
+    """
+    Read a single cell from a feedback workbook and return (student_id, value).
+
+    Strategy:
+      1) If .xlsx/.xlsm -> `engine` (cached value):
+           "openpyxl" - load_workbook(read_only=True)
+           "stream"   - read_xlsx_cell, which parses only the worksheet XML up to
+                        `cell` (several times faster; date-formatted cells come
+                        back as Excel serial numbers)
+      2) If .xlsb/.xls   -> pandas+calamine (cached value)
+      3) If value is None or a formula-like string:
+           a) .xlsx/.xlsm and allow_formula_fallback -> recalculate_cell, which
+              evaluates the cell's formula chain in Python (common functions
+              only; see recalculate_cell)
+           b) still nothing, allow_xlwings_fallback and running on Windows ->
+              xlwings (recalc in Excel)
 
+    Returns None (and logs) if the file can't be read or holds no value.
+    """
+    _check_engine(engine)
+    try:
+        student_id, val = _extract_studentid_grade(
+            file_path,
+            cell,
+            allow_xlwings_fallback=allow_xlwings_fallback,
+            allow_formula_fallback=allow_formula_fallback,
+            engine=engine,
+        )
     except Exception as e:
         logging.error(f"Error processing file '{file_path}': {e}")
         return None
 
+    if val is None:
+        # If everything failed, log and signal skip
+        logging.warning(
+            f"No value read from {file_path} @ {cell} (suffix={file_path.suffix.lower()})"
+        )
+        return None
+
+    return student_id, val
+
 # def extract_studentid_grade(file_path: pl.Path, cell: str):
 #     """
 #     Open an .xlsx feedback file with Excel (xlwings/COM), read `cell`, and
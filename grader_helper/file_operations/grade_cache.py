@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import sqlite3
+from ..dependencies import pl
+from . import json_values
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS grades (
+    path       TEXT    NOT NULL,
+    spec       TEXT    NOT NULL,
+    size       INTEGER NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    sha1       TEXT,
+    student_id TEXT,
+    value      TEXT,
+    PRIMARY KEY (path, spec)
+)
+"""
+
+
+def _sha1(path: pl.Path) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha1").hexdigest()
+
+
+class GradeCache:
+    """
+    On-disk cache of grades already extracted from feedback sheets.
+
+    Entries live in a small SQLite file (by default `.grader_helper_cache.sqlite`
+    in the submissions root) and are keyed by the sheet's path relative to the
+    root plus a `spec` string describing what was read (engine and cell), so
+    harvesting a different cell never returns stale values. An entry is reused
+    while the file's size and mtime are unchanged. With `hash_contents=True`
+    a SHA-1 of the file is stored too, and a file whose mtime changed but whose
+    bytes didn't (OneDrive likes to touch files) is still a hit.
+
+    Values are stored as JSON with dates and times tagged (see `json_values`), so
+    they come back as the same type they were read as.
+
+    Usage:
+        with GradeCache(directory) as cache:
+            hits, misses = cache.lookup(paths, spec)
+            ...
+            cache.store(path, stat, student_id, value, spec)
+            cache.prune(paths)
+    """
+
+    FILENAME = ".grader_helper_cache.sqlite"
+
+    def __init__(self, root: pl.Path, db_path: pl.Path | None = None, *, hash_contents: bool = False):
+        self.root = pl.Path(root)
+        self.db_path = pl.Path(db_path) if db_path is not None else self.root / self.FILENAME
+        self.hash_contents = hash_contents
+        self._con = sqlite3.connect(self.db_path)
+        self._con.execute(_SCHEMA)
+        self._con.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if self._con is not None:
+            self._con.commit()
+            self._con.close()
+            self._con = None
+
+    def _key(self, path: pl.Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def lookup(self, paths: list[pl.Path], spec: str) -> tuple[dict, list]:
+        """
+        Split `paths` into cached and uncached files.
+
+        Returns:
+            hits: {path: (student_id, value)} for files whose entry is still valid.
+            misses: [(path, stat_result)] for new or changed files. Keep the stat:
+                it was taken before the file is read, so `store` records the
+                state the value was read from. The stat is None if the file
+                couldn't be stat'ed at all.
+        """
+        rows = {
+            key: (size, mtime_ns, sha1, student_id, value)
+            for key, size, mtime_ns, sha1, student_id, value in self._con.execute(
+                "SELECT path, size, mtime_ns, sha1, student_id, value FROM grades WHERE spec = ?",
+                (spec,),
+            )
+        }
+
+        hits, misses, touched = {}, [], []
+        for p in paths:
+            try:
+                st = os.stat(p)
+            except OSError:
+                # Vanished since the directory walk; let the reader report it.
+                misses.append((p, None))
+                continue
+            key = self._key(p)
+            row = rows.get(key)
+            if row is not None:
+                size, mtime_ns, sha1, student_id, value = row
+                if size == st.st_size and mtime_ns == st.st_mtime_ns:
+                    hits[p] = (student_id, json_values.loads(value))
+                    continue
+                if self.hash_contents and sha1 is not None and sha1 == _sha1(p):
+                    hits[p] = (student_id, json_values.loads(value))
+                    touched.append((st.st_size, st.st_mtime_ns, key, spec))
+                    continue
+            misses.append((p, st))
+
+        if touched:
+            self._con.executemany(
+                "UPDATE grades SET size = ?, mtime_ns = ? WHERE path = ? AND spec = ?", touched
+            )
+            self._con.commit()
+        return hits, misses
+
+    def store(self, path: pl.Path, stat: os.stat_result, student_id: str, value, spec: str) -> None:
+        """
+        Record a successfully extracted value; call `commit` (or `close`) to persist.
+
+        Values JSON can't hold even with dates and times tagged (see `json_values`)
+        aren't cached, so they're read from the file again next time rather than
+        coming back as a different type.
+        """
+        try:
+            encoded = json_values.dumps(value)
+        except TypeError:
+            return
+        sha1 = _sha1(path) if self.hash_contents else None
+        self._con.execute(
+            "INSERT OR REPLACE INTO grades VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._key(path),
+                spec,
+                stat.st_size,
+                stat.st_mtime_ns,
+                sha1,
+                student_id,
+                encoded,
+            ),
+        )
+
+    def commit(self) -> None:
+        self._con.commit()
+
+    def prune(self, paths: list[pl.Path]) -> int:
+        """Drop entries (for any spec) whose file is no longer among `paths`. Returns the count."""
+        current = {self._key(p) for p in paths}
+        stale = [
+            (key,)
+            for (key,) in self._con.execute("SELECT DISTINCT path FROM grades")
+            if key not in current
+        ]
+        self._con.executemany("DELETE FROM grades WHERE path = ?", stale)
+        self._con.commit()
+        return len(stale)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from typing import Iterable, Iterator
+from ..dependencies import pl
+from . import json_values
+
+
+class GradeCheckpoint:
+    """
+    Append-only record of a harvest in progress, so a long run can be resumed.
+
+    Records from `iter_grades` are written to a JSON Lines file in batches of
+    `batch_size` (each batch is flushed and fsync'ed), so a crash or network drop
+    loses at most one batch. The first line holds the `spec` (engine and cells)
+    the harvest was started with, and resuming with a different spec is refused.
+
+    With `resume=True` an existing file is read back first: `done` maps each
+    successfully harvested file to its record, and failed files are left out so
+    they get retried. A half-written last line from an interrupted run is cut
+    off before appending.
+
+    Usage:
+        with GradeCheckpoint(path, spec, resume=True) as ckpt:
+            todo = [p for p in paths if str(p) not in ckpt.done]
+            for record in ckpt.tee(records_for(todo)):
+                ...
+    """
+
+    FILENAME = ".grader_helper_checkpoint.jsonl"
+
+    def __init__(self, path: pl.Path, spec: str, *, batch_size: int = 50, resume: bool = False):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = pl.Path(path)
+        self.spec = spec
+        self.batch_size = batch_size
+        self.done: dict[str, dict] = {}
+        self._pending: list[dict] = []
+
+        if resume and self.path.exists() and self._load():
+            self._fh = open(self.path, "a", encoding="utf-8")
+        else:
+            self._fh = open(self.path, "w", encoding="utf-8")
+            self._fh.write(json.dumps({"spec": spec}) + "\n")
+            self._sync()
+
+    def _load(self) -> bool:
+        """Read an existing checkpoint; False if it's empty and should be started over."""
+        data = self.path.read_bytes()
+        complete = data[: data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            # torn final line from an interrupted write
+            with open(self.path, "r+b") as fh:
+                fh.truncate(len(complete))
+
+        lines = complete.decode("utf-8").splitlines()
+        if not lines:
+            return False
+        header = json.loads(lines[0])
+        if header.get("spec") != self.spec:
+            raise ValueError(
+                f"Checkpoint {self.path} was written for {header.get('spec')!r}, not {self.spec!r}; "
+                "delete it or start without resume"
+            )
+        for line in lines[1:]:
+            record = json_values.loads(line)
+            if record["error"] is None:
+                self.done[record["file"]] = record
+            else:
+                self.done.pop(record["file"], None)
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _sync(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def append(self, record: dict) -> None:
+        """Queue a record; a full batch is written straight away."""
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        lines = []
+        for rec in self._pending:
+            try:
+                lines.append(json_values.dumps(rec) + "\n")
+            except TypeError:
+                pass  # not written, so a resumed run reads the file again
+        self._fh.writelines(lines)
+        self._sync()
+        self._pending.clear()
+
+    def tee(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Yield `records` unchanged while appending each one to the checkpoint."""
+        try:
+            for record in records:
+                self.append(record)
+                yield record
+        finally:
+            self.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self.flush()
+            self._fh.close()
+            self._fh = None
+
+    def remove(self) -> None:
+        """Close and delete the file, once the harvest it protects has finished."""
+        self.close()
+        self.path.unlink(missing_ok=True)
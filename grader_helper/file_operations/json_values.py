@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON for harvested cell values, shared by `GradeCache` and `GradeCheckpoint`.
+
+Cells can hold dates and times as well as numbers and text. Those are written
+as a one-key tagged object ({"__datetime__": "2025-09-13T15:10:00"}) and turned
+back into the same type on reading, so a value read from the cache or a
+checkpoint is identical to one read from the workbook. Anything else JSON can't
+hold raises TypeError rather than being stored as its str().
+"""
+
+import datetime as dt
+import json
+from ..dependencies import np
+
+_TAGS = {
+    "__datetime__": dt.datetime.fromisoformat,
+    "__date__": dt.date.fromisoformat,
+    "__time__": dt.time.fromisoformat,
+    "__timedelta__": lambda s: dt.timedelta(seconds=s),
+}
+
+
+def _encode(value):
+    # datetime before date: a datetime is also a date
+    if isinstance(value, dt.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, dt.date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, dt.time):
+        return {"__time__": value.isoformat()}
+    if isinstance(value, dt.timedelta):
+        return {"__timedelta__": value.total_seconds()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Can't store a {type(value).__name__} value as JSON")
+
+
+def _decode(obj: dict):
+    if len(obj) == 1:
+        (tag, raw), = obj.items()
+        if tag in _TAGS:
+            return _TAGS[tag](raw)
+    return obj
+
+
+def dumps(value) -> str:
+    """`value` as JSON, with dates and times tagged; TypeError for anything else JSON can't hold."""
+    return json.dumps(value, default=_encode)
+
+
+def loads(text: str):
+    """The value `dumps` wrote, with dates and times back as their own types."""
+    return json.loads(text, object_hook=_decode)
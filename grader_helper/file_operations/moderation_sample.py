@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Mapping
+from ..dependencies import pd, pl, np, copy2, copytree
+from ..dataframe_operations.make_letter_grades import make_letter_grades
+from ..ingesting.student_registry import _norm_id
+from .submission_index import SubmissionIndex
+
+MANIFEST_NAME = "moderation_manifest.csv"
+
+_SCORE_CANDIDATES = ("Total % Grade", "Total", "Score", "score", "Grade")
+_ID_CANDIDATES = ("Student ID", "student_id")
+
+
+def _pick(df: pd.DataFrame, column: str | None, candidates, what: str) -> str:
+    if column is not None:
+        if column not in df.columns:
+            raise KeyError(f"Column {column} does not exist in grades_df")
+        return column
+    for c in candidates:
+        if c in df.columns:
+            return c
+    raise KeyError(f"No {what} column in grades_df (looked for {', '.join(candidates)})")
+
+
+def _stratified(
+    df: pd.DataFrame, band: str, grader: str | None, per_band: Mapping[str, int], rng: np.random.Generator
+) -> pd.DataFrame:
+    """
+    Up to per_band[b] rows of each band, spread over graders: shuffle, number each
+    grader's students within the band (0, 1, ...), and take the band's rows in that
+    order, so every grader with students in the band gives one before anyone gives two.
+    """
+    df = df.iloc[rng.permutation(len(df))]
+    if grader is not None:
+        turn = df.groupby([band, grader], observed=True, sort=False).cumcount()
+        df = df.iloc[np.argsort(turn.to_numpy(), kind="stable")]
+    take = df[band].astype(str).map(dict(per_band)).fillna(0).to_numpy()
+    keep = df.groupby(band, observed=True, sort=False).cumcount().to_numpy() < take
+    return df[keep].sort_values([band, *([grader] if grader else [])], kind="stable")
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """Hard-link `src` to `dst`, or copy it where links aren't possible (other drive, FAT, SMB)."""
+    if os.path.exists(dst):
+        return dst
+    try:
+        os.link(src, dst)
+    except OSError:
+        copy2(src, dst)
+    return dst
+
+
+def _copy_new(src: str, dst: str) -> str:
+    """copy2, leaving files already in the moderation folder (and any edits to them) alone."""
+    return dst if os.path.exists(dst) else copy2(src, dst)
+
+
+def _copy_folder(src: pl.Path, dst: pl.Path, link: bool) -> str:
+    """Copy one submission folder; never raises, so one bad folder doesn't stop the pool."""
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        copytree(src, dst, copy_function=_link_or_copy if link else _copy_new, dirs_exist_ok=True)
+        return "copied"
+    except shutil.Error as e:  # per-file failures, collected by copytree
+        failed = e.args[0]
+        return f"error: {len(failed)} file(s) not copied, e.g. {failed[0][0]}: {failed[0][2]}"
+    except OSError as e:
+        return f"error: {e}"
+
+
+def moderation_sample(
+    grades_df: pd.DataFrame,
+    subs_folder: pl.Path,
+    out_folder: pl.Path,
+    per_band: int | Mapping[str, int] = 2,
+    *,
+    seed: int | None = None,
+    score_column: str | None = None,
+    id_column: str | None = None,
+    grader_column: str | None = "grader",
+    fail_threshold: int | float = 35,
+    bands: Mapping[str, float] | None = None,
+    link: bool = True,
+    workers: int | None = None,
+    index: SubmissionIndex | None = None,
+    progress: bool = True,
+) -> pd.DataFrame:
+    """
+    Pick students from each grade band for moderation and copy their submissions out.
+
+    Scores are banded in one vectorised pass with `make_letter_grades` (NG, F,
+    D2 ... A1, or your `bands`). Each band's sample is spread over the graders
+    who marked students in it: every grader gives one student before any gives
+    two, in a random order that `seed` makes reproducible. Each sampled
+    student's submission folder(s) are copied to `out_folder/<band>/` by a
+    thread pool, hard-linking the files where the filesystem allows (same
+    drive, NTFS/ext4/APFS) and copying them otherwise. Files already in
+    `out_folder` are left as they are. A manifest of the sample is written to
+    `out_folder/moderation_manifest.csv`.
+
+    Hard-linked files are the same file as the original: a moderator's edit
+    saved in place changes the student's copy too. Pass `link=False` if the
+    moderation copies will be edited.
+
+    Args:
+    grades_df (pd.DataFrame): One row per student with their score, e.g. the completed grades.
+    subs_folder (Path): The submissions folder (raw Brightspace or renamed folders).
+    out_folder (Path): Where the moderation folders go; created if needed.
+    per_band (int|dict): Students to sample from each band, or {band: number} (bands not
+        in it aren't sampled). Default is 2.
+    seed (int|None): Seed for a reproducible sample.
+    score_column (str|None): Score column; by default the first of "Total % Grade", "Total",
+        "Score", "score", "Grade".
+    id_column (str|None): Student ID column; by default "Student ID" or "student_id".
+    grader_column (str|None): Column to stratify by within bands; None (or a column that
+        isn't there) samples each band as a whole.
+    fail_threshold (int|float): Passed to `make_letter_grades`. Default is 35.
+    bands (dict|None): {label: lower bound}, passed to `make_letter_grades`.
+    link (bool): Hard-link files where possible instead of copying. Default is True.
+    workers (int|None): Copying threads; None uses up to 8, 1 copies serially.
+    index (SubmissionIndex|None): An existing index of `subs_folder`, to reuse its scan.
+    progress (bool): Show a tqdm progress bar.
+
+    Returns:
+    pd.DataFrame: The manifest: one row per sampled student and submission folder, with
+        "Student ID", the grader, "score", "band", "source", "destination" and "status"
+        ("copied", "no submission" or "error: ...").
+
+    Raises:
+    KeyError: If a needed column is missing.
+    NotADirectoryError: If `subs_folder` isn't a folder.
+
+    Example:
+        manifest = moderation_sample(grades, subs, pl.Path("Moderation"), per_band=3, seed=1)
+        manifest[manifest["status"] != "copied"]
+    """
+    from ..dependencies import tqdm
+
+    score = _pick(grades_df, score_column, _SCORE_CANDIDATES, "score")
+    sid = _pick(grades_df, id_column, _ID_CANDIDATES, "Student ID")
+    grader = grader_column if grader_column in grades_df.columns else None
+
+    df = pd.DataFrame({
+        "Student ID": [_norm_id(x) for x in grades_df[sid]],
+        "score": pd.to_numeric(grades_df[score], errors="coerce").to_numpy(),
+    })
+    if grader is not None:
+        df[grader] = grades_df[grader].to_numpy()
+    df["band"] = make_letter_grades(df["score"], fail_threshold, bands)
+    df = df[df["band"].notna()]
+
+    labels = df["band"].cat.categories
+    counts = per_band if isinstance(per_band, Mapping) else {b: int(per_band) for b in labels}
+    sample = _stratified(df, "band", grader, counts, np.random.default_rng(seed))
+
+    index = SubmissionIndex.for_folder(subs_folder, index)
+    folders = index.by_student_id()
+    out_folder = pl.Path(out_folder)
+
+    rows, jobs = [], []
+    for rec in sample.to_dict("records"):
+        found = folders.get(rec["Student ID"], [])
+        if not found:
+            rows.append({**rec, "source": None, "destination": None, "status": "no submission"})
+        for f in found:
+            dst = out_folder / str(rec["band"]) / f.name
+            rows.append({**rec, "source": str(f.path), "destination": str(dst), "status": None})
+            jobs.append((len(rows) - 1, f.path, dst))
+
+    bar = tqdm(total=len(jobs), desc="Copying for moderation", disable=not progress)
+    try:
+        if workers == 1 or len(jobs) <= 1:
+            for i, src, dst in jobs:
+                rows[i]["status"] = _copy_folder(src, dst, link)
+                bar.update()
+        else:
+            with ThreadPoolExecutor(max_workers=workers or min(8, len(jobs))) as pool:
+                futures = {pool.submit(_copy_folder, src, dst, link): i for i, src, dst in jobs}
+                for future, i in futures.items():
+                    rows[i]["status"] = future.result()
+                    bar.update()
+    finally:
+        bar.close()
+
+    columns = ["Student ID", *([grader] if grader else []), "score", "band", "source", "destination", "status"]
+    manifest = pd.DataFrame(rows, columns=columns)
+    out_folder.mkdir(parents=True, exist_ok=True)
+    manifest.to_csv(out_folder / MANIFEST_NAME, index=False)
+    return manifest
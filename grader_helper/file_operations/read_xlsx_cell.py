@@ -0,0 +1,451 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming reader for cached cell values in .xlsx/.xlsm workbooks.
+
+openpyxl (even in read-only mode) parses the styles, the workbook manifest and
+the whole shared-string table before it hands back a single cell. Feedback
+sheets only ever need one or two cells near the top of the first worksheet, so
+this reader opens the zip directly, stream-parses the worksheet XML until it
+has passed the target cells, and only touches the shared-string table if a
+target cell actually holds a shared string.
+"""
+
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from ..dependencies import pl
+
+
+_A1_RE = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+_REF_RE = re.compile(
+    r"^(?:(?P<sheet>'(?:[^']|'')+'|[^'!:]+)!)?"
+    r"(?P<start>\$?[A-Za-z]{1,3}\$?\d+)(?::(?P<end>\$?[A-Za-z]{1,3}\$?\d+))?$"
+)
+_OFFICE_DOCUMENT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def _local(tag: str) -> str:
+    """Strip the namespace from an ElementTree tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _col_index(letters: str) -> int:
+    """'A' -> 1, 'Z' -> 26, 'AA' -> 27."""
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+def _col_letters(col: int) -> str:
+    """1 -> 'A', 27 -> 'AA'."""
+    letters = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _split_a1(cell: str) -> tuple[int, int]:
+    """'B42' -> (42, 2). Raises ValueError for anything that isn't a single cell."""
+    m = _A1_RE.match(cell.strip())
+    if not m:
+        raise ValueError(f"'{cell}' is not an A1 cell reference")
+    col_letters, row_str = m.groups()
+    return int(row_str), _col_index(col_letters)
+
+
+def _parse_ref(ref: str) -> tuple[str | None, list[tuple[int, int]]] | None:
+    """
+    Parse "B42", "$B$10:$B$17" or "'Feedback sheet'!B42" into (sheet, [(row, col), ...]).
+
+    Ranges expand row by row. Returns None if `ref` isn't a cell or range
+    reference (it may be a defined name instead).
+    """
+    m = _REF_RE.match(ref.strip().lstrip("="))
+    if not m:
+        return None
+    sheet = m.group("sheet")
+    if sheet is not None and sheet.startswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    r1, c1 = _split_a1(m.group("start"))
+    r2, c2 = _split_a1(m.group("end")) if m.group("end") else (r1, c1)
+    coords = [
+        (r, c)
+        for r in range(min(r1, r2), max(r1, r2) + 1)
+        for c in range(min(c1, c2), max(c1, c2) + 1)
+    ]
+    return sheet, coords
+
+
+def _rels(zf: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    """Map relationship Id -> (Type, absolute target) for a package part."""
+    folder, name = posixpath.split(part)
+    rels_path = posixpath.join(folder, "_rels", f"{name}.rels")
+    out = {}
+    for rel in ET.fromstring(zf.read(rels_path)):
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        out[rel.get("Id")] = (rel.get("Type", ""), target)
+    return out
+
+
+def _workbook_part(zf: zipfile.ZipFile) -> str:
+    for rel_type, target in _rels(zf, "").values():
+        if rel_type == _OFFICE_DOCUMENT:
+            return target
+    return "xl/workbook.xml"
+
+
+def _text_content(el) -> str:
+    """Plain text of an <si>/<is> element: <t> plus rich-text runs, no phonetics."""
+    parts = []
+    for child in el:
+        tag = _local(child.tag)
+        if tag == "t":
+            parts.append(child.text or "")
+        elif tag == "r":
+            for t in child:
+                if _local(t.tag) == "t":
+                    parts.append(t.text or "")
+    return "".join(parts)
+
+
+class _SharedStrings:
+    """Shared-string table that is only parsed as far as the largest index asked for."""
+
+    def __init__(self, zf: zipfile.ZipFile, part: str | None):
+        self._zf = zf
+        self._part = part
+        self._strings: list[str] = []
+        self._fh = None
+        self._events = None
+
+    def __getitem__(self, idx: int) -> str:
+        if self._part is None:
+            raise KeyError("workbook has no shared-string table")
+        if self._events is None and idx >= len(self._strings):
+            self._fh = self._zf.open(self._part)
+            self._events = ET.iterparse(self._fh, events=("end",))
+        while idx >= len(self._strings):
+            try:
+                _, el = next(self._events)
+            except StopIteration:
+                raise IndexError(f"shared string {idx} out of range") from None
+            if _local(el.tag) == "si":
+                self._strings.append(_text_content(el).replace("x005F_", ""))
+                el.clear()
+        return self._strings[idx]
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+
+
+def _cast_number(value: str) -> int | float:
+    # Same rule openpyxl uses, so both engines agree on int vs float.
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _cell_value(el, shared: _SharedStrings):
+    """Cached value of a <c> element, converted the way openpyxl does with data_only=True."""
+    data_type = el.get("t", "n")
+    if data_type == "inlineStr":
+        for child in el:
+            if _local(child.tag) == "is":
+                return _text_content(child)
+        return None
+
+    raw = None
+    for child in el:
+        if _local(child.tag) == "v":
+            raw = child.text or None
+            break
+    if raw is None:
+        return None
+
+    match data_type:
+        case "n":
+            return _cast_number(raw)
+        case "s":
+            return shared[int(raw)]
+        case "b":
+            return bool(int(raw))
+        case "d":
+            return datetime.fromisoformat(raw)
+        case _:
+            # "str" (formula result) and "e" (error such as "#DIV/0!")
+            return raw
+
+
+def _iter_events(fh, chunk_size: int = 4096):
+    """
+    Like ET.iterparse(fh, ("start", "end")) but fed in small chunks.
+
+    iterparse reads 16 KiB at a time and parses the whole chunk before the
+    first event comes out, which is most of a typical feedback sheet. Smaller
+    chunks let the caller stop close to where the target cells are.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    while data := fh.read(chunk_size):
+        parser.feed(data)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _scan_sheet(fh, targets: set[tuple[int, int]]) -> dict:
+    """
+    Stream a worksheet and collect the <c> elements at `targets` ((row, col) pairs).
+
+    Stops as soon as every target has been seen or the parser moves past the
+    last target row. Returns {(row, col): element}; cells that are absent
+    from the sheet are simply missing from the result.
+    """
+    found = {}
+    if not targets:
+        return found
+    target_rows = {r for r, _ in targets}
+    max_row = max(target_rows)
+    row_no = 0
+    col_no = 0
+    row_tag = cell_tag = None
+
+    for event, el in _iter_events(fh):
+        if row_tag is None:
+            # First event is the <worksheet> root; take the namespace from it so
+            # the loop below compares tags directly instead of stripping them.
+            ns = el.tag[: -len(_local(el.tag))]
+            row_tag, cell_tag, data_tag = ns + "row", ns + "c", ns + "sheetData"
+            continue
+
+        tag = el.tag
+        if event == "start":
+            if tag == row_tag:
+                r = el.get("r")
+                row_no = int(r) if r else row_no + 1
+                col_no = 0
+                if row_no > max_row:
+                    break
+            continue
+
+        if tag == cell_tag:
+            if row_no in target_rows:
+                ref = el.get("r")
+                if ref:
+                    row_no, col_no = _split_a1(ref)
+                else:
+                    col_no += 1
+                if (row_no, col_no) in targets:
+                    found[(row_no, col_no)] = el
+                    if len(found) == len(targets):
+                        break
+        elif tag == row_tag:
+            if row_no >= max_row:
+                break
+            el.clear()
+        elif tag == data_tag:
+            break
+
+    return found
+
+
+def _scan_formulas(fh, targets: set[tuple[int, int]] | None) -> tuple[dict, dict]:
+    """
+    Like `_scan_sheet`, but for recalculation: `targets=None` reads every cell,
+    and every shared-formula master passed on the way is remembered as
+    {si: (formula text, "B2")} so follower cells (which carry no text) can be
+    translated from it. Masters always precede their followers in the sheet.
+    """
+    found, masters = {}, {}
+    max_row = max((r for r, _ in targets), default=0) if targets is not None else None
+    row_no = 0
+    col_no = 0
+    row_tag = None
+
+    for event, el in _iter_events(fh):
+        if row_tag is None:
+            ns = el.tag[: -len(_local(el.tag))]
+            row_tag, cell_tag, data_tag, f_tag = ns + "row", ns + "c", ns + "sheetData", ns + "f"
+            continue
+
+        tag = el.tag
+        if event == "start":
+            if tag == row_tag:
+                r = el.get("r")
+                row_no = int(r) if r else row_no + 1
+                col_no = 0
+                if max_row is not None and row_no > max_row:
+                    break
+            continue
+
+        if tag == cell_tag:
+            ref = el.get("r")
+            if ref:
+                row_no, col_no = _split_a1(ref)
+            else:
+                col_no += 1
+            f = el.find(f_tag)
+            if f is not None and f.get("t") == "shared" and f.text:
+                masters[f.get("si")] = (f.text, _col_letters(col_no) + str(row_no))
+            if targets is None or (row_no, col_no) in targets:
+                found[(row_no, col_no)] = el
+        elif tag == row_tag:
+            el.clear()
+        elif tag == data_tag:
+            break
+
+    return found, masters
+
+
+class _XlsxWorkbook:
+    """
+    One open .xlsx/.xlsm package.
+
+    Parses only the workbook part up front (sheet names and defined names);
+    worksheets are streamed on request and shared strings are resolved lazily.
+    """
+
+    def __init__(self, path: pl.Path):
+        self._zf = zipfile.ZipFile(path)
+        try:
+            wb_part = _workbook_part(self._zf)
+            # CRC of the workbook part (sheet and defined names) from the zip
+            # directory: the same for every sheet copied from one template
+            self.template_crc: int = self._zf.getinfo(wb_part).CRC
+            rels = _rels(self._zf, wb_part)
+            self.sheets: dict[str, str] = {}  # sheet name -> part, in workbook order
+            self.defined_names: dict[str, str] = {}  # global names
+            local_names: list[tuple[int, str, str]] = []
+            for el in ET.fromstring(self._zf.read(wb_part)).iter():
+                tag = _local(el.tag)
+                if tag == "sheet":
+                    self.sheets[el.get("name")] = rels[el.get(_REL_ID)][1]
+                elif tag == "definedName":
+                    name, text = el.get("name"), el.text or ""
+                    if el.get("localSheetId") is None:
+                        self.defined_names[name] = text
+                    else:
+                        local_names.append((int(el.get("localSheetId")), name, text))
+            if not self.sheets:
+                raise ValueError("workbook has no worksheets")
+            # Names scoped to the first sheet win over global ones, as they
+            # would for a formula on that sheet.
+            for sheet_idx, name, text in local_names:
+                if sheet_idx == 0 or name not in self.defined_names:
+                    self.defined_names[name] = text
+
+            strings_part = next(
+                (t for rel_type, t in rels.values() if rel_type.endswith("/sharedStrings")),
+                None,
+            )
+            self._shared = _SharedStrings(self._zf, strings_part)
+        except Exception:
+            self._zf.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._shared.close()
+        self._zf.close()
+
+    @property
+    def first_sheet(self) -> str:
+        return next(iter(self.sheets))
+
+    def read(self, sheet: str | None, coords: set[tuple[int, int]]) -> dict:
+        """Cached values at `coords` on `sheet` (None: first sheet). Missing cells map to None."""
+        sheet = self.first_sheet if sheet is None else sheet
+        if sheet not in self.sheets:
+            raise KeyError(f"workbook has no sheet named '{sheet}'")
+        with self._zf.open(self.sheets[sheet]) as fh:
+            found = _scan_sheet(fh, set(coords))
+        return {
+            rc: _cell_value(found[rc], self._shared) if rc in found else None
+            for rc in coords
+        }
+
+    def read_formulas(self, sheet: str | None, coords: set[tuple[int, int]] | None = None) -> dict:
+        """
+        {(row, col): (formula or None, cached value)} for `coords` on `sheet`,
+        or for every non-empty cell when `coords` is None. Formulas come back
+        as "=SUM(B2:B9)", with shared formulas translated to their own cell.
+        """
+        sheet = self.first_sheet if sheet is None else sheet
+        if sheet not in self.sheets:
+            raise KeyError(f"workbook has no sheet named '{sheet}'")
+        with self._zf.open(self.sheets[sheet]) as fh:
+            found, masters = _scan_formulas(fh, None if coords is None else set(coords))
+
+        out = {}
+        for (r, c), el in found.items():
+            formula = None
+            for child in el:
+                if _local(child.tag) != "f":
+                    continue
+                if child.text:
+                    formula = "=" + child.text
+                elif child.get("t") == "shared" and child.get("si") in masters:
+                    from openpyxl.formula.translate import Translator
+
+                    text, origin = masters[child.get("si")]
+                    formula = Translator("=" + text, origin=origin).translate_formula(
+                        _col_letters(c) + str(r)
+                    )
+                break
+            out[(r, c)] = (formula, _cell_value(el, self._shared))
+        if coords is not None:
+            for rc in coords:
+                out.setdefault(rc, (None, None))
+        return out
+
+
+def _read_xlsx_values(path: pl.Path, cells: list[str]) -> dict[str, object]:
+    """
+    Read several cells from the first worksheet in one pass.
+
+    Returns {cell: cached value}; cells that don't exist map to None.
+    """
+    coords = {cell: _split_a1(cell) for cell in cells}
+    with _XlsxWorkbook(path) as wb:
+        values = wb.read(None, set(coords.values()))
+    return {cell: values[rc] for cell, rc in coords.items()}
+
+
+def read_xlsx_cell(path: pl.Path, cell: str):
+    """
+    Return the cached (last-saved) value of `cell` on the first worksheet.
+
+    Gives the same value openpyxl returns with `data_only=True`, with one
+    exception: numbers formatted as dates come back as Excel serial numbers,
+    because the styles part is never read.
+
+    Args:
+        path: .xlsx or .xlsm workbook.
+        cell: A1 reference, e.g. "B42" (absolute references like "$B$42" are fine).
+
+    Returns:
+        The cell's value, or None if the cell is empty or missing.
+
+    Raises:
+        ValueError: if `cell` isn't an A1 reference or the workbook has no sheets.
+        zipfile.BadZipFile: if `path` isn't an .xlsx/.xlsm file.
+    """
+    return _read_xlsx_values(pl.Path(path), [cell])[cell]
@@ -0,0 +1,512 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+In-process recalculation of one cell of a feedback sheet.
+
+This is the fallback for workbooks that have no cached value in the grade
+cell (saved by a tool that doesn't calculate, or with calculation switched
+off), so that Excel never has to be started. It covers the small part of the
+formula language feedback templates use: numbers, strings, booleans, cell and
+range references (optionally on another sheet), defined names, the operators
++ - * / ^ & % = <> < > <= >=, and SUM, AVERAGE, MIN, MAX, COUNT, IF, IFERROR,
+AND, OR, NOT, ABS, ROUND, ROUNDUP and ROUNDDOWN. Anything else raises
+UnsupportedFormulaError.
+
+Only the requested cell's dependency chain is evaluated. Parsed formulas are
+cached by their text, and for every target cell of a template the set of cells
+its chain touched is remembered, so the next sheet made from the same template
+is read in one streamed pass over just those cells instead of whole worksheets.
+Templates are told apart by the CRC of their workbook part (sheet and defined
+names), and only the most recent few are kept. If a sheet turns out to need a
+cell outside its plan, its worksheet is read in full, so the answer is right
+even when two templates share a CRC.
+"""
+
+import re
+from collections import OrderedDict
+from decimal import ROUND_DOWN, ROUND_HALF_UP, ROUND_UP, Decimal
+from functools import lru_cache
+from ..dependencies import pl
+from .read_xlsx_cell import _XlsxWorkbook, _parse_ref
+
+
+class UnsupportedFormulaError(ValueError):
+    """A formula in the dependency chain can't be evaluated in Python."""
+
+
+class _XlError(str):
+    """An Excel error value such as "#DIV/0!". Propagates through calculations."""
+
+
+_DIV0 = _XlError("#DIV/0!")
+_VALUE = _XlError("#VALUE!")
+_NAME = _XlError("#NAME?")
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<string>"(?:[^"]|"")*")
+    |(?P<error>\#(?:DIV/0!|N/A|NAME\?|NULL!|NUM!|REF!|VALUE!))
+    |(?P<ref>(?:(?:'(?:[^']|'')+'|[A-Za-z_][\w.]*)!)?
+        \$?[A-Za-z]{1,3}\$?\d+(?::\$?[A-Za-z]{1,3}\$?\d+)?)(?![\w.(])
+    |(?P<func>[A-Za-z_][\w.]*)(?=\s*\()
+    |(?P<name>[A-Za-z_][\w.]*)
+    |(?P<op><=|>=|<>|[-+*/^&=<>%(),])
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARISONS = {"=", "<>", "<", ">", "<=", ">="}
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    text = text.strip()
+    tokens, pos = [], 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise UnsupportedFormulaError(f"can't parse formula near {text[pos:pos + 12]!r}")
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser producing tuple ASTs. Precedence follows Excel,
+    lowest first: comparisons, &, + -, * /, ^, %, unary minus.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take_op(self, *ops: str) -> str | None:
+        tok = self.peek()
+        if tok is not None and tok[0] == "op" and tok[1] in ops:
+            self.pos += 1
+            return tok[1]
+        return None
+
+    def expect(self, op: str) -> None:
+        if self.take_op(op) is None:
+            raise UnsupportedFormulaError(f"expected '{op}'")
+
+    def parse(self):
+        node = self.comparison()
+        if self.peek() is not None:
+            raise UnsupportedFormulaError(f"unexpected {self.peek()[1]!r}")
+        return node
+
+    def binary(self, ops: tuple[str, ...], operand):
+        node = operand()
+        while (op := self.take_op(*ops)) is not None:
+            node = ("bin", op, node, operand())
+        return node
+
+    def comparison(self):
+        return self.binary(tuple(_COMPARISONS), self.concat)
+
+    def concat(self):
+        return self.binary(("&",), self.additive)
+
+    def additive(self):
+        return self.binary(("+", "-"), self.multiplicative)
+
+    def multiplicative(self):
+        return self.binary(("*", "/"), self.power)
+
+    def power(self):
+        return self.binary(("^",), self.percent)
+
+    def percent(self):
+        node = self.unary()
+        while self.take_op("%") is not None:
+            node = ("pct", node)
+        return node
+
+    def unary(self):
+        op = self.take_op("-", "+")
+        if op is not None:
+            return ("neg", self.unary()) if op == "-" else self.unary()
+        return self.primary()
+
+    def primary(self):
+        tok = self.peek()
+        if tok is None:
+            raise UnsupportedFormulaError("formula ends unexpectedly")
+        kind, text = tok
+        self.pos += 1
+        match kind:
+            case "number":
+                return ("const", float(text) if any(ch in text for ch in ".eE") else int(text))
+            case "string":
+                return ("const", text[1:-1].replace('""', '"'))
+            case "error":
+                return ("const", _XlError(text))
+            case "ref":
+                sheet, coords = _parse_ref(text)
+                if len(coords) == 1:
+                    return ("ref", sheet, coords[0])
+                return ("range", sheet, tuple(coords))
+            case "name":
+                if text.upper() in ("TRUE", "FALSE"):
+                    return ("const", text.upper() == "TRUE")
+                return ("name", text)
+            case "func":
+                self.expect("(")
+                args = []
+                if self.take_op(")") is None:
+                    while True:
+                        nxt = self.peek()
+                        if nxt is not None and nxt[0] == "op" and nxt[1] in (",", ")"):
+                            args.append(("const", None))  # omitted argument
+                        else:
+                            args.append(self.comparison())
+                        if self.take_op(")") is not None:
+                            break
+                        self.expect(",")
+                name = text.upper()
+                for prefix in ("_XLFN.", "_XLWS."):
+                    name = name.removeprefix(prefix)
+                return ("call", name, tuple(args))
+            case "op" if text == "(":
+                node = self.comparison()
+                self.expect(")")
+                return node
+        raise UnsupportedFormulaError(f"unexpected {text!r}")
+
+
+@lru_cache(maxsize=4096)
+def _parse_formula(formula: str):
+    """Parse "=..." once per distinct formula text; every copy of a template shares it."""
+    return _Parser(formula.lstrip("=")).parse()
+
+
+def _num(v):
+    """Coerce a scalar for arithmetic the way Excel does."""
+    if isinstance(v, _XlError):
+        return v
+    if v is None:
+        return 0
+    if isinstance(v, bool):
+        return int(v)
+    if isinstance(v, (int, float)):
+        return v
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return _VALUE
+
+
+def _text(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return "TRUE" if v else "FALSE"
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _truthy(v):
+    if isinstance(v, _XlError):
+        return v
+    if isinstance(v, str):
+        if v.upper() in ("TRUE", "FALSE"):
+            return v.upper() == "TRUE"
+        return _VALUE
+    return bool(v)
+
+
+def _numbers(values) -> list | _XlError:
+    """
+    Numbers for SUM/AVERAGE/MIN/MAX/COUNT. Inside ranges, text, booleans and
+    blanks are skipped; arguments given directly are coerced.
+    """
+    out = []
+    for v in values:
+        if isinstance(v, list):
+            for item in v:
+                if isinstance(item, _XlError):
+                    return item
+                if isinstance(item, (int, float)) and not isinstance(item, bool):
+                    out.append(item)
+        else:
+            n = _num(v)
+            if isinstance(n, _XlError):
+                return n
+            out.append(n)
+    return out
+
+
+def _round(x, digits, rounding):
+    x, digits = _num(x), _num(digits)
+    for v in (x, digits):
+        if isinstance(v, _XlError):
+            return v
+    quantum = Decimal(1).scaleb(-int(digits))
+    result = float(Decimal(repr(x)).quantize(quantum, rounding=rounding))
+    return int(result) if int(digits) <= 0 else result
+
+
+def _compare(op: str, a, b):
+    for v in (a, b):
+        if isinstance(v, _XlError):
+            return v
+    # Blanks compare as 0 against numbers and "" against text.
+    if a is None:
+        a = "" if isinstance(b, str) else 0
+    if b is None:
+        b = "" if isinstance(a, str) else 0
+    # Excel orders numbers < text < booleans and compares text case-insensitively.
+    def key(v):
+        if isinstance(v, bool):
+            return (2, v)
+        if isinstance(v, str):
+            return (1, v.lower())
+        return (0, v)
+
+    ka, kb = key(a), key(b)
+    match op:
+        case "=":
+            return ka == kb
+        case "<>":
+            return ka != kb
+        case "<":
+            return ka < kb
+        case ">":
+            return ka > kb
+        case "<=":
+            return ka <= kb
+        case _:
+            return ka >= kb
+
+
+def _arith(op: str, a, b):
+    a, b = _num(a), _num(b)
+    for v in (a, b):
+        if isinstance(v, _XlError):
+            return v
+    match op:
+        case "+":
+            return a + b
+        case "-":
+            return a - b
+        case "*":
+            return a * b
+        case "/":
+            return _DIV0 if b == 0 else a / b
+        case _:
+            try:
+                result = float(a) ** b
+            except (OverflowError, ZeroDivisionError):
+                return _XlError("#NUM!")
+            # a negative number to a fractional power has no real result
+            return _XlError("#NUM!") if isinstance(result, complex) else result
+
+
+class _CellSource:
+    """
+    Formulas and values of one workbook. Cells in `plan` are read up front in
+    one pass per sheet; any other cell makes its whole worksheet load once.
+    """
+
+    def __init__(self, wb: _XlsxWorkbook, plan: dict[str, set] | None):
+        self.wb = wb
+        self.cells: dict[str, dict] = {}
+        self.full: set[str] = set()
+        self.touched: dict[str, set] = {}
+        for sheet, coords in (plan or {}).items():
+            if sheet in wb.sheets:
+                self.cells[sheet] = wb.read_formulas(sheet, coords)
+
+    def get(self, sheet: str, rc: tuple[int, int]) -> tuple[str | None, object]:
+        if sheet not in self.wb.sheets:
+            raise UnsupportedFormulaError(f"reference to missing sheet '{sheet}'")
+        self.touched.setdefault(sheet, set()).add(rc)
+        known = self.cells.get(sheet, {})
+        if rc in known:
+            return known[rc]
+        if sheet not in self.full:
+            self.cells[sheet] = known = self.wb.read_formulas(sheet)
+            self.full.add(sheet)
+        return known.get(rc, (None, None))
+
+
+class _Evaluator:
+    def __init__(self, source: _CellSource):
+        self.source = source
+        self.values: dict = {}
+        self.active: set = set()
+
+    def cell(self, sheet: str, rc: tuple[int, int]):
+        key = (sheet, rc)
+        if key in self.values:
+            return self.values[key]
+        formula, value = self.source.get(sheet, rc)
+        if formula is not None:
+            if key in self.active:
+                raise UnsupportedFormulaError("circular reference")
+            self.active.add(key)
+            try:
+                value = self.scalar(self.eval(_parse_formula(formula), sheet))
+            finally:
+                self.active.discard(key)
+        self.values[key] = value
+        return value
+
+    def scalar(self, v):
+        """A range used where one value is expected: only 1x1 ranges make sense here."""
+        if isinstance(v, list):
+            return v[0] if len(v) == 1 else _VALUE
+        return v
+
+    def eval(self, node, sheet: str):
+        match node[0]:
+            case "const":
+                return node[1]
+            case "ref":
+                return self.cell(node[1] or sheet, node[2])
+            case "range":
+                return [self.cell(node[1] or sheet, rc) for rc in node[2]]
+            case "name":
+                target = self.source.wb.defined_names.get(node[1])
+                if target is None:
+                    lowered = {k.lower(): v for k, v in self.source.wb.defined_names.items()}
+                    target = lowered.get(node[1].lower())
+                if target is None:
+                    return _NAME
+                return self.eval(_parse_formula(target), self.source.wb.first_sheet)
+            case "neg":
+                v = _num(self.scalar(self.eval(node[1], sheet)))
+                return v if isinstance(v, _XlError) else -v
+            case "pct":
+                v = _num(self.scalar(self.eval(node[1], sheet)))
+                return v if isinstance(v, _XlError) else v / 100
+            case "bin":
+                _, op, left, right = node
+                a = self.scalar(self.eval(left, sheet))
+                b = self.scalar(self.eval(right, sheet))
+                if op in _COMPARISONS:
+                    return _compare(op, a, b)
+                if op == "&":
+                    for v in (a, b):
+                        if isinstance(v, _XlError):
+                            return v
+                    return _text(a) + _text(b)
+                return _arith(op, a, b)
+            case "call":
+                return self.call(node[1], node[2], sheet)
+        raise UnsupportedFormulaError(f"can't evaluate {node[0]}")
+
+    def call(self, name: str, args: tuple, sheet: str):
+        # IF, IFERROR, AND and OR only evaluate the arguments they need, so a
+        # branch that isn't taken never pulls its cells into the chain.
+        if name == "IF":
+            if not 1 <= len(args) <= 3:
+                return _VALUE
+            cond = _truthy(self.scalar(self.eval(args[0], sheet)))
+            if isinstance(cond, _XlError):
+                return cond
+            if cond:
+                return self.eval(args[1], sheet) if len(args) > 1 else True
+            return self.eval(args[2], sheet) if len(args) > 2 else False
+        if name == "IFERROR":
+            if len(args) != 2:
+                return _VALUE
+            v = self.scalar(self.eval(args[0], sheet))
+            return self.eval(args[1], sheet) if isinstance(v, _XlError) else v
+        if name in ("AND", "OR"):
+            result = name == "AND"
+            for arg in args:
+                v = self.eval(arg, sheet)
+                items = [x for x in v if isinstance(x, (bool, int, float))] if isinstance(v, list) else [v]
+                for item in items:
+                    t = _truthy(item)
+                    if isinstance(t, _XlError):
+                        return t
+                    if name == "AND" and not t:
+                        return False
+                    if name == "OR" and t:
+                        return True
+            return result
+
+        values = [self.eval(arg, sheet) for arg in args]
+        match name, len(values):
+            case ("SUM" | "AVERAGE" | "MIN" | "MAX" | "COUNT"), _:
+                if name == "COUNT":
+                    return sum(
+                        1
+                        for v in values
+                        for item in (v if isinstance(v, list) else [v])
+                        if isinstance(item, (int, float)) and not isinstance(item, bool)
+                    )
+                nums = _numbers(values)
+                if isinstance(nums, _XlError):
+                    return nums
+                if name == "SUM":
+                    return sum(nums)
+                if name == "AVERAGE":
+                    return sum(nums) / len(nums) if nums else _DIV0
+                if not nums:
+                    return 0
+                return min(nums) if name == "MIN" else max(nums)
+            case "NOT", 1:
+                t = _truthy(self.scalar(values[0]))
+                return t if isinstance(t, _XlError) else not t
+            case "ABS", 1:
+                v = _num(self.scalar(values[0]))
+                return v if isinstance(v, _XlError) else abs(v)
+            case ("ROUND" | "ROUNDUP" | "ROUNDDOWN"), 2:
+                rounding = {"ROUND": ROUND_HALF_UP, "ROUNDUP": ROUND_UP, "ROUNDDOWN": ROUND_DOWN}[name]
+                return _round(self.scalar(values[0]), self.scalar(values[1]), rounding)
+        raise UnsupportedFormulaError(f"function {name} with {len(values)} argument(s) isn't supported")
+
+
+# (target cell, template CRC) -> {sheet: cells its dependency chain touched},
+# least recently used first
+_PLANS: OrderedDict[tuple[str, int], dict[str, set]] = OrderedDict()
+_MAX_PLANS = 64
+
+
+def recalculate_cell(path: pl.Path, cell: str):
+    """
+    Recalculate `cell` of an .xlsx/.xlsm workbook in Python, ignoring cached results.
+
+    Args:
+        path: the workbook.
+        cell: A1 reference on the first worksheet ("B42"), or on a named sheet
+            ("'Rubric'!B42").
+
+    Returns:
+        The computed value: a number, string, bool or None for an empty cell.
+        Excel error results come back as strings such as "#DIV/0!", the same
+        as a cached error value would.
+
+    Raises:
+        UnsupportedFormulaError: if any formula in the chain uses something
+            outside the supported subset (see the module docstring).
+    """
+    parsed = _parse_ref(cell)
+    if parsed is None or len(parsed[1]) != 1:
+        raise ValueError(f"'{cell}' is not a single-cell reference")
+    sheet, (rc,) = parsed
+
+    with _XlsxWorkbook(pl.Path(path)) as wb:
+        key = (cell.strip().upper(), wb.template_crc)
+        source = _CellSource(wb, _PLANS.get(key))
+        value = _Evaluator(source).cell(sheet or wb.first_sheet, rc)
+
+    plan = _PLANS.setdefault(key, {})
+    _PLANS.move_to_end(key)
+    if len(_PLANS) > _MAX_PLANS:
+        _PLANS.popitem(last=False)
+    for sheet_name, coords in source.touched.items():
+        plan.setdefault(sheet_name, set()).update(coords)
+
+    return str(value) if isinstance(value, _XlError) else value
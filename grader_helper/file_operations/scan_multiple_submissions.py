@@ -2,6 +2,7 @@
 
 import pathlib as pl
 import datetime as dt
+from .submission_index import SubmissionIndex, make_sub_date
 
 def main():
     folder = pl.Path(
@@ -9,42 +10,30 @@ def main():
         )
     scan_multiple_subs(folder=folder)
 
-def make_sub_date(s: str, fmt="%d %B %Y %I:%M %p") -> dt.datetime:
-    # Brightspace: "13 September 2025 310 PM" or "13 September 2025 3:10 PM"
-    day, month, year, time, ap = s.strip().split()
 
-    if ":" not in time:              # e.g., "310" -> "3:10"
-        time = time[:-2] + ":" + time[-2:]
-
-    return dt.datetime.strptime(f"{day} {month} {year} {time} {ap}", fmt)
-
-    
-
-
-def scan_multiple_subs(folder: pl.Path) -> dict[str,dt.datetime]:
+def scan_multiple_subs(folder: pl.Path, index: SubmissionIndex | None = None) -> dict[str, list[dt.datetime]]:
 
     """scan folder for multiple submissions by the same person
+
+    Folders are grouped by the middle part of their Brightspace name
+    ("24123456 Firstname Lastname"); returns {that part: [submission times]}
+    for everyone with more than one. Pass a `SubmissionIndex` of `folder` to
+    reuse an existing scan.
     """
-    if not folder.is_dir():
+    if index is None and not folder.is_dir():
         raise RuntimeError(
                 f"{folder.name} is not a directory/folder, please make sure you are calling "
                 "this function on the unzipped folder you downloaded from Brightspace "
                 "which contains the student submissions"
         )
-
-    f_names = [
-        (f.name.strip().split(' - ')[1], make_sub_date(f.name.strip().split(' - ')[-1])) for f in folder.iterdir() if f.is_dir()
-            ]
+    index = SubmissionIndex.for_folder(folder, index)
 
     temp_dict = {}
 
+    for f in index.folders:
+        if f.style == "brightspace":
+            temp_dict.setdefault(f.label, []).append(f.submitted)
 
-    for (id, date) in f_names:
-        if id in temp_dict.keys():
-            temp_dict[id].append(date)
-        else:
-            temp_dict[id] = [date]
-    
     duplicates = {k:v for (k,v) in temp_dict.items() if len(v) > 1}
 
 
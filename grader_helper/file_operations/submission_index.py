@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime as dt
+import os
+import re
+from dataclasses import dataclass
+from ..dependencies import pl
+
+
+FEEDBACK_EXTS = {".xlsx", ".xlsm", ".xlsb", ".xls"}
+
+# Raw Brightspace download: "<submission id> - <who> - 13 September 2025 310 PM",
+# where <who> is "24123456 Firstname Lastname" or "Team 3". The date is optional
+# so hand-made "Lastname, Firstname - 24123456" folders still parse.
+_BRIGHTSPACE_RE = re.compile(
+    r"^.*? - (?P<who>.+?)(?: - (?P<date>\d{1,2} [A-Za-z]+ \d{4} \d{1,2}:?\d{2} [AP]M))?$"
+)
+_LEADING_ID_RE = re.compile(r"^(\d+)\b")
+_TEAM_RE = re.compile(r"^Team [1-9]\d*$")
+# After alphabetise_folders: "LASTNAME, FIRSTNAME(24123456)"
+_UL_RE = re.compile(r"\((\d+)\)")
+
+
+def _is_feedback_sheet(name: str) -> bool:
+    """Excel file with "feedback sheet" in its stem (any case); not a "~$" lock file."""
+    stem, ext = os.path.splitext(name)
+    return (
+        ext.lower() in FEEDBACK_EXTS
+        and "feedback sheet" in stem.lower()
+        and not name.startswith("~$")
+    )
+
+
+def make_sub_date(s: str, fmt="%d %B %Y %I:%M %p") -> dt.datetime:
+    # Brightspace: "13 September 2025 310 PM" or "13 September 2025 3:10 PM"
+    day, month, year, time, ap = s.strip().split()
+
+    if ":" not in time:              # e.g., "310" -> "3:10"
+        time = time[:-2] + ":" + time[-2:]
+
+    return dt.datetime.strptime(f"{day} {month} {year} {time} {ap}", fmt)
+
+
+@dataclass(frozen=True)
+class SubmissionFolder:
+    """
+    One top-level folder of a submissions download and what its name says.
+
+    Attributes:
+        path: the folder.
+        style: "brightspace" (raw download name), "ul" ("LAST, FIRST(id)") or
+            None if the name matches neither.
+        student_id: the ID in the name, if any.
+        team: "Team N" for group submissions.
+        label: the middle " - " segment of a Brightspace name ("24123456 Name").
+        submitted: submission time from a Brightspace name.
+    """
+
+    path: pl.Path
+    style: str | None = None
+    student_id: str | None = None
+    team: str | None = None
+    label: str | None = None
+    submitted: dt.datetime | None = None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+def _parse_folder_name(path: pl.Path) -> SubmissionFolder:
+    name = path.name.strip()
+
+    m = _BRIGHTSPACE_RE.match(name)
+    if m:
+        who = m["who"]
+        sid = _LEADING_ID_RE.match(who)
+        submitted = None
+        if m["date"]:
+            try:
+                submitted = make_sub_date(m["date"])
+            except ValueError:
+                pass
+        return SubmissionFolder(
+            path,
+            style="brightspace",
+            student_id=sid[1] if sid else None,
+            team=who if _TEAM_RE.match(who) else None,
+            label=who,
+            submitted=submitted,
+        )
+
+    m = _UL_RE.search(name)
+    if m:
+        return SubmissionFolder(path, style="ul", student_id=m[1])
+
+    return SubmissionFolder(path)
+
+
+class SubmissionIndex:
+    """
+    A single walk of a submissions folder, shared by the functions that use it.
+
+    The top level is listed with one `os.scandir` when the index is created;
+    the files below it are walked (again with scandir, reusing the directory
+    entry types rather than stat'ing every path) the first time they're asked
+    for. On OneDrive/SMB shares, where every stat is a network round-trip, this
+    is much cheaper than each function doing its own `iterdir()`/`is_dir()`/
+    `rglob()`. Folder names are parsed once into `SubmissionFolder`s.
+
+    Pass the same index to `catch_grades`, `distribute_feedback_sheets`,
+    `find_unsubmitted`, `scan_multiple_subs`, `alphabetise_folders` or
+    `brightspace_name_folders` through their `index` argument. Functions that
+    rename folders or add files call `refresh()` themselves; call it yourself if
+    the folder changes some other way.
+
+    Usage:
+        index = SubmissionIndex(subs_folder)
+        find_unsubmitted(classlist, subs_folder, index=index)
+        distribute_feedback_sheets(subs_folder, rubric, index=index)
+    """
+
+    def __init__(self, root: pl.Path):
+        self.root = pl.Path(root)
+        if not self.root.is_dir():
+            raise NotADirectoryError(f"{self.root} is not a directory")
+        self.refresh()
+
+    @classmethod
+    def for_folder(cls, folder: pl.Path, index: "SubmissionIndex | None" = None) -> "SubmissionIndex":
+        """Return `index` if it was built for `folder`, or a new index of `folder`."""
+        if index is None:
+            return cls(folder)
+        if index.root.absolute() != pl.Path(folder).absolute():
+            raise ValueError(f"index was built for {index.root}, not {folder}")
+        return index
+
+    def refresh(self) -> None:
+        """Forget what was seen; the next lookup rescans the folder."""
+        self._folders: list[SubmissionFolder] | None = None
+        self._stray: list[pl.Path] | None = None
+        self._files: dict[pl.Path, list[pl.Path]] | None = None
+        self._by_id: dict[str, list[SubmissionFolder]] | None = None
+
+    def _scan_top(self) -> None:
+        folders, stray = [], []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.is_dir():
+                    folders.append(_parse_folder_name(pl.Path(entry.path)))
+                else:
+                    stray.append(pl.Path(entry.path))
+        folders.sort(key=lambda f: f.name)
+        stray.sort()
+        self._folders, self._stray = folders, stray
+
+    def _walk(self) -> None:
+        """Every file below the root, grouped by top-level folder; skips "~$" lock files."""
+        files = {self.root: [p for p in self.stray_files if not p.name.startswith("~$")]}
+        for folder in self.folders:
+            found, stack = [], [folder.path]
+            while stack:
+                try:
+                    it = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                with it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(pl.Path(entry.path))
+                        elif not entry.name.startswith("~$"):
+                            found.append(pl.Path(entry.path))
+            files[folder.path] = sorted(found)
+        self._files = files
+
+    @property
+    def folders(self) -> list[SubmissionFolder]:
+        """Top-level folders, sorted by name."""
+        if self._folders is None:
+            self._scan_top()
+        return self._folders
+
+    @property
+    def stray_files(self) -> list[pl.Path]:
+        """Files sitting directly in the root rather than in a submission folder."""
+        if self._stray is None:
+            self._scan_top()
+        return self._stray
+
+    def __iter__(self):
+        return iter(self.folders)
+
+    def __len__(self) -> int:
+        return len(self.folders)
+
+    def files(self, folder: pl.Path | None = None) -> list[pl.Path]:
+        """
+        Files at any depth, sorted.
+
+        Args:
+            folder: a top-level folder to restrict to (or the root for stray
+                files only); None for the whole tree.
+        """
+        if self._files is None:
+            self._walk()
+        if folder is not None:
+            return self._files.get(pl.Path(folder), [])
+        return sorted(p for group in self._files.values() for p in group)
+
+    def feedback_sheets(self) -> list[pl.Path]:
+        """Excel files with "feedback sheet" in the name (any case), sorted."""
+        return [p for p in self.files() if _is_feedback_sheet(p.name)]
+
+    def student_ids(self) -> set[str]:
+        return {f.student_id for f in self.folders if f.student_id is not None}
+
+    def _student_map(self) -> dict[str, list[SubmissionFolder]]:
+        if self._by_id is None:
+            out: dict[str, list[SubmissionFolder]] = {}
+            for f in self.folders:
+                if f.student_id is not None:
+                    out.setdefault(f.student_id, []).append(f)
+            self._by_id = out
+        return self._by_id
+
+    def by_student_id(self) -> dict[str, list[SubmissionFolder]]:
+        return {sid: list(folders) for sid, folders in self._student_map().items()}
+
+    def get(self, student_id: str) -> list[SubmissionFolder]:
+        """Folders for one student (more than one means multiple submissions)."""
+        return list(self._student_map().get(str(student_id), ()))
+
+    def teams(self) -> dict[str, list[SubmissionFolder]]:
+        out: dict[str, list[SubmissionFolder]] = {}
+        for f in self.folders:
+            if f.team is not None:
+                out.setdefault(f.team, []).append(f)
+        return out
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+import time
+from typing import Mapping, Sequence
+from ..dependencies import pd, pl
+from .catch_grades import _check_args, _grades_frame, _iter_records
+from .submission_index import _is_feedback_sheet
+
+BACKENDS = ("auto", "poll", "inotify")
+
+# (size, mtime_ns): enough to tell that a sheet was saved again
+Signature = tuple[int, int]
+
+
+def _signature(path: pl.Path) -> Signature | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _scan(root: pl.Path) -> dict[pl.Path, Signature]:
+    """
+    Signatures of every feedback sheet under `root`. Only directory listings
+    and the feedback sheets themselves are touched; on Windows the scandir
+    entries already carry size and mtime, so there's no per-file stat at all.
+    """
+    found, stack = {}, [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif _is_feedback_sheet(entry.name):
+                        st = entry.stat()
+                        found[pl.Path(entry.path)] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue  # vanished mid-scan; the next cycle sorts it out
+    return found
+
+
+class _PollWatcher:
+    """Rescans the tree each cycle and diffs signatures against what was seen."""
+
+    def __init__(self, root: pl.Path):
+        self.root = root
+
+    def changes(self, seen: Mapping[pl.Path, Signature]) -> tuple[set, set]:
+        current = _scan(self.root)
+        changed = {p for p, sig in current.items() if seen.get(p) != sig}
+        removed = set(seen) - set(current)
+        return changed, removed
+
+    def close(self) -> None:
+        pass
+
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then `len` bytes of name
+
+
+class _InotifyWatcher:
+    """
+    Linux inotify through ctypes: each cycle only reads the queued events, so
+    its cost depends on what changed, not on how many sheets there are. One
+    watch per directory; directories created later are picked up as they
+    appear. inotify only sees changes made through the local kernel, so it
+    won't notice files synced onto a network share by another machine.
+    """
+
+    def __init__(self, root: pl.Path):
+        path = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(path, use_errno=True)
+        self.root = root
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs: dict[int, pl.Path] = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top: pl.Path) -> set[pl.Path]:
+        """Watch `top` and every directory below it; return the feedback sheets found."""
+        sheets, stack = set(), [pl.Path(top)]
+        while stack:
+            d = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(d), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                # ENOSPC means fs.inotify.max_user_watches is too low for this tree
+                raise OSError(err, f"inotify_add_watch({d}): {os.strerror(err)}")
+            self._dirs[wd] = d
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(pl.Path(entry.path))
+                        elif _is_feedback_sheet(entry.name):
+                            sheets.add(pl.Path(entry.path))
+            except OSError:
+                continue
+        return sheets
+
+    def _events(self):
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                start = offset + _EVENT.size
+                name = os.fsdecode(data[start:start + length].rstrip(b"\0"))
+                offset = start + length
+                yield wd, mask, name
+
+    def changes(self, seen: Mapping[pl.Path, Signature]) -> tuple[set, set]:
+        changed, removed = set(), set()
+        for wd, mask, name in self._events():
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped: fall back to one full comparison.
+                return _PollWatcher(self.root).changes(seen)
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not name:
+                continue
+            path = parent / name
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changed |= self._watch_tree(path)
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    removed |= {p for p in seen if path in p.parents}
+            elif _is_feedback_sheet(name):
+                if mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    removed.add(path)
+                    changed.discard(path)
+                else:
+                    changed.add(path)
+                    removed.discard(path)
+        return changed, removed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _make_watcher(root: pl.Path, backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if backend == "poll" or (backend == "auto" and not sys.platform.startswith("linux")):
+        return _PollWatcher(root)
+    try:
+        return _InotifyWatcher(root)
+    except (OSError, AttributeError) as e:  # AttributeError: libc without inotify
+        if backend == "inotify":
+            raise
+        logging.warning(f"inotify unavailable ({e}); polling instead")
+        return _PollWatcher(root)
+
+
+def _write_atomic(df: pd.DataFrame, output: pl.Path) -> None:
+    """Write next to `output` and swap it in, so readers never see half a file."""
+    tmp = output.with_name(f".{output.name}.tmp")
+    if output.suffix.lower() == ".parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, output)
+
+
+def watch_grades(
+    directory: pl.Path,
+    cell: str | None = None,
+    output: pl.Path | None = None,
+    *,
+    cells: Mapping[str, str] | Sequence[str] | None = None,
+    interval: float = 5.0,
+    debounce: float = 2.0,
+    backend: str = "auto",
+    workers: int | None = None,
+    capture_errors: bool = False,
+    allow_xlwings_fallback: bool = False,
+    engine: str = "openpyxl",
+    max_cycles: int | None = None,
+) -> pd.DataFrame:
+    """
+    Keep a gradebook file up to date while graders fill in feedback sheets.
+
+    Harvests every feedback sheet under `directory` once, writes the result to
+    `output`, and then keeps watching: every `interval` seconds only the sheets
+    that were added, saved again or deleted since the last cycle are re-read,
+    and `output` is rewritten (atomically) if anything changed. Stop it with
+    Ctrl+C.
+
+    A sheet is only read once it has stopped changing: its size and mtime must
+    have been the same for `debounce` seconds, so a file that is still being
+    written or synced isn't read half-way through.
+
+    Args:
+        directory: submissions folder to watch recursively.
+        cell / cells: what to read, as for `catch_grades`.
+        output: .csv or .parquet file to keep updated (Parquet needs pyarrow);
+            same columns as `catch_grades` returns.
+        interval: seconds between cycles.
+        debounce: seconds a sheet must be unchanged before it's read.
+        backend: "poll" rescans directory listings each cycle; "inotify" (Linux)
+            reads kernel change events instead, so a cycle costs nothing when
+            nothing changed; "auto" uses inotify where available. Use "poll"
+            for network shares changed from other machines.
+        workers: process pool size for the first full harvest.
+        capture_errors: keep unreadable sheets in the output with "file" and
+            "error" columns, as for `catch_grades`.
+        allow_xlwings_fallback: off by default here; starting Excel on every
+            save defeats the point of watching.
+        engine: .xlsx/.xlsm reader, as for `catch_grades`.
+        max_cycles: stop after this many cycles (None runs until interrupted).
+
+    Returns:
+        The last grades frame written.
+    """
+    target = _check_args(directory, cell, cells, engine)
+    if output is None:
+        raise TypeError("watch_grades needs an output path (.csv or .parquet)")
+    output = pl.Path(output)
+
+    seen: dict[pl.Path, Signature] = {}       # last signature observed
+    pending: dict[pl.Path, tuple[Signature, float]] = {}  # sig, when it was first seen
+    records: dict[pl.Path, dict] = {}
+    frame = _grades_frame([], cells is not None, capture_errors)
+    dirty = True
+
+    watcher = _make_watcher(directory, backend)
+    logging.info(f"Watching {directory} with {type(watcher).__name__}; writing {output}")
+    cycle = 0
+    try:
+        while max_cycles is None or cycle < max_cycles:
+            cycle += 1
+            if cycle == 1:
+                # Full scan to start from; the watcher is already running, so
+                # nothing saved in the meantime is missed.
+                changed, removed = _PollWatcher(directory).changes(seen)
+            else:
+                changed, removed = watcher.changes(seen)
+
+            for p in removed:
+                seen.pop(p, None)
+                pending.pop(p, None)
+                if records.pop(p, None) is not None:
+                    dirty = True
+
+            # Debounce: (re)start the clock for anything that changed, and
+            # recheck sheets still waiting. Only these few files are stat'ed.
+            now = time.monotonic()
+            ready = []
+            for p in changed | set(pending):
+                sig = _signature(p)
+                if sig is None:
+                    seen.pop(p, None)
+                    pending.pop(p, None)
+                    dirty |= records.pop(p, None) is not None
+                    continue
+                if p not in pending and p in records and seen.get(p) == sig:
+                    continue  # event without a new save (or one already read)
+                seen[p] = sig
+                if p not in pending or pending[p][0] != sig:
+                    pending[p] = (sig, now)
+                quiet_for = max(now - pending[p][1], time.time() - sig[1] / 1e9)
+                if quiet_for >= debounce:
+                    ready.append(p)
+                    del pending[p]
+
+            if ready:
+                ready.sort()
+                for rec in _iter_records(
+                    ready,
+                    target,
+                    workers=workers if len(ready) > 1 else None,
+                    allow_xlwings_fallback=allow_xlwings_fallback,
+                    engine=engine,
+                    progress=False,
+                ):
+                    if rec["error"] is not None:
+                        logging.warning(f"Skipped ({rec['error']}): {rec['file']}")
+                    records[pl.Path(rec["file"])] = rec
+                logging.info(f"Cycle {cycle}: re-read {len(ready)} sheet(s), {len(pending)} settling")
+                dirty = True
+
+            if dirty:
+                kept = [
+                    records[p] for p in sorted(records)
+                    if capture_errors or records[p]["error"] is None
+                ]
+                frame = _grades_frame(kept, cells is not None, capture_errors)
+                try:
+                    _write_atomic(frame, output)
+                    dirty = False
+                except OSError as e:
+                    # e.g. the CSV is open in Excel on Windows; retry next cycle
+                    logging.warning(f"Couldn't write {output}: {e}")
+
+            if max_cycles is None or cycle < max_cycles:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        logging.info("Stopped watching")
+    finally:
+        watcher.close()
+
+    return frame
@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fill the departmental Excel template without Excel.
+
+The template's .xlsx package is copied member by member into the output; only
+the target worksheet is rewritten. Everything above the first data row (the
+header, with its styles, merged cells, column widths and so on) is kept
+byte-for-byte, and the data rows are generated straight into the new zip in
+chunks, so memory stays flat however many students there are. Strings are
+written inline, so the shared-string table and styles are never touched.
+"""
+
+import datetime as dt
+import logging
+import math
+import os
+import posixpath
+import re
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Mapping
+from xml.sax.saxutils import escape
+from ..dependencies import pd, pl, np
+from .read_xlsx_cell import (
+    _REL_ID,
+    _col_index,
+    _col_letters,
+    _local,
+    _rels,
+    _split_a1,
+    _workbook_part,
+)
+
+_NS = r"(?:[\w.-]+:)?"
+_SHEET_DATA_RE = re.compile(rf"<(?P<prefix>[\w.-]+:)?sheetData\b[^>]*?(?P<empty>/)?>")
+_ROW_RE = re.compile(rf"<{_NS}row\b[^>]*?(?:/>|>.*?</{_NS}row>)", re.S)
+_ROW_OPEN_RE = re.compile(rf"<{_NS}row\b([^>]*?)/?>")
+_CELL_OPEN_RE = re.compile(rf"<{_NS}c\b([^>]*?)/?>")
+_ATTR_RE = re.compile(r'([\w:.-]+)="([^"]*)"')
+_DIMENSION_RE = re.compile(rf'(<{_NS}dimension\b[^>]*?\bref=")([^"]*)(")')
+_TABLE_REF_RE = re.compile(rf'(<{_NS}(?:table|autoFilter)\b[^>]*?\bref=")([^"]*)(")')
+_CALC_PR_RE = re.compile(rf"<{_NS}calcPr\b[^>]*?/?>")
+_AFTER_CALC_PR_RE = re.compile(
+    rf"<{_NS}(?:oleSize|customWorkbookViews|pivotCaches|smartTagPr|smartTagTypes|"
+    rf"webPublishing|fileRecoveryPr|webPublishObjects|extLst)\b|</{_NS}workbook>"
+)
+_ILLEGAL_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_COLUMN_RE = re.compile(r"^[A-Za-z]{1,3}$")
+
+_EXCEL_EPOCH = dt.datetime(1899, 12, 30)
+_ROWS_PER_WRITE = 1000
+
+
+def _check_mapping(df: pd.DataFrame, mapping: Mapping[str, str] | None) -> dict[str, int]:
+    """{df column: template column number}; None maps df's columns onto A, B, C, ..."""
+    if mapping is None:
+        return {col: i for i, col in enumerate(df.columns, 1)}
+    out = {}
+    for col, letters in mapping.items():
+        if col not in df.columns:
+            raise KeyError(f"Column {col} does not exist in the DataFrame")
+        if not isinstance(letters, str) or not _COLUMN_RE.match(letters):
+            raise ValueError(f"Template column for {col} should be a column letter like 'C', not {letters!r}")
+        out[col] = _col_index(letters)
+    if len(set(out.values())) != len(out):
+        raise ValueError("Two DataFrame columns are mapped to the same template column")
+    return out
+
+
+def _sheet_part(zf: zipfile.ZipFile, wb_part: str, sheet: str | None) -> str:
+    rels = _rels(zf, wb_part)
+    sheets = {
+        el.get("name"): rels[el.get(_REL_ID)][1]
+        for el in ET.fromstring(zf.read(wb_part)).iter()
+        if _local(el.tag) == "sheet"
+    }
+    if not sheets:
+        raise ValueError("template has no worksheets")
+    if sheet is None:
+        return next(iter(sheets.values()))
+    if sheet not in sheets:
+        raise KeyError(f"Sheet '{sheet}' not in template (sheets: {', '.join(sheets)})")
+    return sheets[sheet]
+
+
+def _split_sheet(xml: str, start_row: int):
+    """
+    Cut a worksheet into the XML before the data rows, the rows kept above
+    `start_row`, and the XML after them. The row at `start_row`, if the
+    template has one, is the style prototype for the data rows: its row
+    attributes and the style of each of its cells.
+    """
+    m = _SHEET_DATA_RE.search(xml)
+    if m is None:
+        raise ValueError("template worksheet has no <sheetData>")
+    prefix = m["prefix"] or ""
+    if m["empty"]:
+        head = xml[:m.start()] + f"<{prefix}sheetData>"
+        body = ""
+        tail = f"</{prefix}sheetData>" + xml[m.end():]
+    else:
+        end = xml.index(f"</{prefix}sheetData>", m.end())
+        head, body, tail = xml[:m.end()], xml[m.end():end], xml[end:]
+
+    kept, last_kept = [], 0
+    row_attrs, styles = {}, {}
+    r = 0
+    for row in _ROW_RE.finditer(body):
+        attrs = dict(_ATTR_RE.findall(_ROW_OPEN_RE.match(row[0])[1]))
+        r = int(attrs["r"]) if "r" in attrs else r + 1
+        if r < start_row:
+            kept.append(row[0])
+            last_kept = r
+        elif r == start_row:
+            row_attrs = {k: v for k, v in attrs.items() if k not in ("r", "spans")}
+            for cell in _CELL_OPEN_RE.finditer(row[0]):
+                cattrs = dict(_ATTR_RE.findall(cell[1]))
+                if "r" in cattrs and "s" in cattrs:
+                    styles[_split_a1(cattrs["r"])[1]] = cattrs["s"]
+    return head, "".join(kept), tail, prefix, last_kept, row_attrs, styles
+
+
+def _cell_xml(ref: str, value, style: str | None, p: str) -> str:
+    """One <c> element, or "" for a missing value."""
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    s = f' s="{style}"' if style is not None else ""
+    if isinstance(value, (bool, np.bool_)):
+        return f'<{p}c r="{ref}"{s} t="b"><{p}v>{int(value)}</{p}v></{p}c>'
+    if isinstance(value, (int, np.integer)):
+        return f'<{p}c r="{ref}"{s}><{p}v>{int(value)}</{p}v></{p}c>'
+    if isinstance(value, (float, np.floating)):
+        if not math.isfinite(value):
+            return ""
+        return f'<{p}c r="{ref}"{s}><{p}v>{float(value)!r}</{p}v></{p}c>'
+    if isinstance(value, (dt.datetime, dt.date)):
+        if not isinstance(value, dt.datetime):
+            value = dt.datetime(value.year, value.month, value.day)
+        serial = (value.replace(tzinfo=None) - _EXCEL_EPOCH) / dt.timedelta(days=1)
+        return f'<{p}c r="{ref}"{s}><{p}v>{serial!r}</{p}v></{p}c>'
+    text = _ILLEGAL_XML_RE.sub("", str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<{p}c r="{ref}"{s} t="inlineStr"><{p}is><{p}t{space}>{escape(text)}</{p}t></{p}is></{p}c>'
+
+
+def _iter_rows(df: pd.DataFrame, columns: dict[str, int], start_row: int, row_attrs: dict, styles: dict, p: str):
+    order = sorted(columns.items(), key=lambda kv: kv[1])
+    letters = [_col_letters(c) for _, c in order]
+    cell_styles = [styles.get(c) for _, c in order]
+    values = [df[col].tolist() for col, _ in order]
+    extra = "".join(f' {k}="{v}"' for k, v in row_attrs.items())
+    for i, row in enumerate(zip(*values)):
+        r = start_row + i
+        cells = "".join(
+            _cell_xml(f"{col}{r}", v, st, p) for col, v, st in zip(letters, row, cell_styles)
+        )
+        yield f'<{p}row r="{r}"{extra}>{cells}</{p}row>'
+
+
+def _patch_dimension(xml: str, last_row: int, last_col: int) -> str:
+    def repl(m):
+        end = m[2].split(":")[-1]
+        try:
+            row, col = _split_a1(end)
+        except ValueError:
+            row, col = 1, 1
+        start = m[2].split(":")[0]
+        return f"{m[1]}{start}:{_col_letters(max(col, last_col))}{max(row, last_row)}{m[3]}"
+
+    return _DIMENSION_RE.sub(repl, xml, count=1)
+
+
+def _patch_table(xml: str, start_row: int, last_row: int) -> str:
+    """Stretch a table (and its filter) that starts above the data to end on the last row."""
+    def repl(m):
+        if ":" not in m[2]:
+            return m[0]
+        first, end = m[2].split(":")
+        top, _ = _split_a1(first)
+        bottom, col = _split_a1(end)
+        if not top < start_row <= bottom + 1:
+            return m[0]
+        return f"{m[1]}{first}:{_col_letters(col)}{max(last_row, top + 1)}{m[3]}"
+
+    return _TABLE_REF_RE.sub(repl, xml)
+
+
+def _patch_workbook(xml: str) -> str:
+    """Ask Excel to recalculate on open, so formulas over the new rows are up to date."""
+    m = _CALC_PR_RE.search(xml)
+    if m:
+        tag = re.sub(r'\sfullCalcOnLoad="[^"]*"', "", m[0])
+        tag = re.sub(r"\s*(/?>)$", r' fullCalcOnLoad="1"\1', tag)
+        return xml[:m.start()] + tag + xml[m.end():]
+    root = re.search(r"<([\w.-]+:)?workbook\b", xml)
+    prefix = (root[1] or "") if root else ""
+    m = _AFTER_CALC_PR_RE.search(xml)
+    return xml[:m.start()] + f'<{prefix}calcPr fullCalcOnLoad="1"/>' + xml[m.start():]
+
+
+def write_departmental_template(
+    df: pd.DataFrame,
+    template_path: pl.Path,
+    out_path: pl.Path,
+    mapping: Mapping[str, str] | None = None,
+    *,
+    sheet: str | None = None,
+    start_row: int = 2,
+) -> pl.Path:
+    """
+    Write a prepared module DataFrame into a copy of the departmental template.
+
+    The template is never modified and Excel is never started. Rows above
+    `start_row` (the header) are kept exactly as they are in the template; the
+    DataFrame goes in from `start_row` down, replacing whatever the template had
+    there. If the template has a formatted row at `start_row` (number formats,
+    borders, fonts), every data row is given that row's styles. A table over the
+    data area is stretched to the last row, and the workbook is set to
+    recalculate when it's opened so totals and counts in the template update.
+
+    Args:
+    df (pd.DataFrame): Data to write, e.g. from `prepare_data_for_departmental_template`.
+    template_path (pl.Path): The departmental .xlsx/.xlsm template.
+    out_path (pl.Path): Where to save the filled-in copy.
+    mapping (dict[str, str]|None): {df column: template column letter}, e.g.
+        {"Student ID": "A", "Name": "B", "Total % Grade": "E", "Grade": "F"}.
+        None writes all of df's columns from column A.
+    sheet (str|None): Worksheet to fill; the first sheet by default.
+    start_row (int): First row to write data to. Default is 2.
+
+    Returns:
+    pl.Path: `out_path`.
+
+    Raises:
+    FileNotFoundError: If the template doesn't exist.
+    KeyError: If a mapped column isn't in `df`, or `sheet` isn't in the template.
+    ValueError: If the mapping, `start_row` or the template is invalid.
+
+    Example:
+        df = prepare_data_for_departmental_template(df)
+        write_departmental_template(
+            df, pl.Path("Dept template.xlsx"), pl.Path("MA4001 grades.xlsx"),
+            {"Student ID": "A", "Name": "B", "Total % Grade": "C", "Grade": "D"},
+        )
+    """
+    template_path, out_path = pl.Path(template_path), pl.Path(out_path)
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template not found: {template_path}")
+    if out_path.absolute() == template_path.absolute():
+        raise ValueError("out_path must be different from template_path")
+    if not isinstance(start_row, int) or start_row < 1:
+        raise ValueError("start_row must be a positive integer")
+    columns = _check_mapping(df, mapping)
+
+    tmp = out_path.with_name(f".{out_path.name}.tmp")
+    with zipfile.ZipFile(template_path) as zin:
+        wb_part = _workbook_part(zin)
+        sheet_part = _sheet_part(zin, wb_part, sheet)
+        wb_rels = _rels(zin, wb_part)
+        calc_chain = next(
+            (t for rel_type, t in wb_rels.values() if rel_type.endswith("/calcChain")), None
+        )
+        try:
+            tables = [t for rel_type, t in _rels(zin, sheet_part).values() if rel_type.endswith("/table")]
+        except KeyError:  # the sheet has no relationships
+            tables = []
+
+        head, kept, tail, p, last_kept, row_attrs, styles = _split_sheet(
+            zin.read(sheet_part).decode("utf-8"), start_row
+        )
+        last_row = start_row + len(df) - 1 if len(df) else last_kept
+        head = _patch_dimension(head, last_row, max(columns.values(), default=1))
+
+        # The calculation chain lists formula cells by position; rows replaced
+        # here would leave it pointing at cells that no longer hold formulas.
+        patched = {}
+        if calc_chain is not None:
+            folder, name = posixpath.split(wb_part)
+            rels_part = posixpath.join(folder, "_rels", f"{name}.rels")
+            patched[rels_part] = re.sub(
+                r"<(?:[\w.-]+:)?Relationship\b[^>]*?/calcChain\"[^>]*?/>", "",
+                zin.read(rels_part).decode("utf-8"),
+            )
+            patched["[Content_Types].xml"] = re.sub(
+                rf"<(?:[\w.-]+:)?Override\b[^>]*?PartName=\"/{re.escape(calc_chain)}\"[^>]*?/>", "",
+                zin.read("[Content_Types].xml").decode("utf-8"),
+            )
+        patched[wb_part] = _patch_workbook(zin.read(wb_part).decode("utf-8"))
+        for t in tables:
+            patched[t] = _patch_table(zin.read(t).decode("utf-8"), start_row, last_row)
+
+        try:
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    if info.filename == calc_chain:
+                        continue
+                    if info.filename == sheet_part:
+                        zi = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                        zi.compress_type = zipfile.ZIP_DEFLATED
+                        with zout.open(zi, "w") as fh:
+                            fh.write(head.encode("utf-8"))
+                            fh.write(kept.encode("utf-8"))
+                            chunk = []
+                            for row in _iter_rows(df, columns, start_row, row_attrs, styles, p):
+                                chunk.append(row)
+                                if len(chunk) == _ROWS_PER_WRITE:
+                                    fh.write("".join(chunk).encode("utf-8"))
+                                    chunk.clear()
+                            fh.write("".join(chunk).encode("utf-8"))
+                            fh.write(tail.encode("utf-8"))
+                    elif info.filename in patched:
+                        zout.writestr(info, patched[info.filename].encode("utf-8"))
+                    else:
+                        zout.writestr(info, zin.read(info.filename))
+            os.replace(tmp, out_path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    return out_path
+
+
+def _write_module(
+    module: str,
+    df: pd.DataFrame,
+    template_path: pl.Path,
+    out_path: pl.Path,
+    mapping: Mapping[str, str] | None,
+    sheet: str | None,
+    start_row: int,
+) -> dict:
+    """One module of a batch. Never raises; lives at module level so process pools can pickle it."""
+    record = {"module": module, "path": str(out_path), "rows": len(df), "seconds": 0.0, "error": None}
+    t = time.perf_counter()
+    try:
+        write_departmental_template(df, template_path, out_path, mapping, sheet=sheet, start_row=start_row)
+    except Exception as e:
+        record["error"] = repr(e)
+    record["seconds"] = time.perf_counter() - t
+    return record
+
+
+def write_departmental_batch(
+    frames,
+    template_path: pl.Path,
+    out_dir: pl.Path,
+    mapping: Mapping[str, str] | None = None,
+    *,
+    sheet: str | None = None,
+    start_row: int = 2,
+    filename: str = "{module}.xlsx",
+    workers: int | None = None,
+    progress: bool = True,
+) -> pd.DataFrame:
+    """
+    Fill one copy of the departmental template per module.
+
+    Args:
+    frames: {module: DataFrame}, or the `DepartmentalBatch` returned by
+        `prepare_departmental_batch` (its successful modules are written).
+    template_path (pl.Path): The departmental template.
+    out_dir (pl.Path): Folder for the filled-in copies; created if needed.
+    mapping, sheet, start_row: As for `write_departmental_template`, shared by all modules.
+    filename (str): Output file name, formatted with `module`. Default "{module}.xlsx"
+        (use ".xlsm" if the template has macros).
+    workers (int|None): Number of worker processes; None or 1 writes serially.
+    progress (bool): Show a tqdm progress bar.
+
+    Returns:
+    pd.DataFrame: One row per module with the output path, rows written, seconds
+        taken and the error if it failed. A failed module doesn't stop the others.
+    """
+    from ..dependencies import tqdm
+
+    frames = getattr(frames, "modules", frames)
+    out_dir = pl.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = {
+        module: (module, df, template_path, out_dir / filename.format(module=module), mapping, sheet, start_row)
+        for module, df in frames.items()
+    }
+
+    records = {}
+    bar = tqdm(total=len(jobs), desc="Writing templates", disable=not progress)
+    try:
+        if workers is None or workers <= 1:
+            for module, args in jobs.items():
+                records[module] = _write_module(*args)
+                bar.update()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_write_module, *args): module for module, args in jobs.items()}
+                for fut in as_completed(futures):
+                    module = futures[fut]
+                    try:
+                        records[module] = fut.result()
+                    except Exception as e:
+                        # Worker died or the frame couldn't be pickled; keep the module.
+                        _, df, _, out_path, *_ = jobs[module]
+                        records[module] = {
+                            "module": module, "path": str(out_path), "rows": len(df), "seconds": 0.0, "error": repr(e)
+                        }
+                    bar.update()
+    finally:
+        bar.close()
+
+    for r in records.values():
+        if r["error"] is not None:
+            logging.warning(f"{r['module']} failed: {r['error']}")
+    return pd.DataFrame(
+        [records[m] for m in jobs], columns=["module", "path", "rows", "seconds", "error"]
+    )
@@ -4,11 +4,21 @@
 """ This is the init file for the ingesting module."""
 
 from .load_graders import load_graders
+from .parsed_cache import ParsedCache
 from .import_brightspace_classlist import import_brightspace_classlist
+from .load_brightspace_classlist import load_brightspace_classlist, ClasslistFormatError
 from .ingest_completed_graderfiles import ingest_completed_graderfiles
+from .find_grader_conflicts import find_grader_conflicts
+from .student_registry import StudentRegistry, Student
 
 __all__ = [
     "load_graders",
     "import_brightspace_classlist",
+    "load_brightspace_classlist",
+    "ClasslistFormatError",
     "ingest_completed_graderfiles",
+    "ParsedCache",
+    "find_grader_conflicts",
+    "StudentRegistry",
+    "Student",
 ]
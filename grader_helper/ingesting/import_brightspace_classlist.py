@@ -4,6 +4,8 @@
 import pandas as pd
 import pathlib as pl
 import numpy as np
+from .parsed_cache import ParsedCache
+from .load_brightspace_classlist import load_brightspace_classlist
 
 
 def main():
@@ -11,52 +13,42 @@ def main():
     print("write a test for this Kev")
 
 
-def import_brightspace_classlist(file: pl.Path, group: bool = False, normalise: bool = False) -> pd.DataFrame | None:
+def import_brightspace_classlist(
+    file: pl.Path, group: bool = False, normalise: bool = False, cache: ParsedCache | None = None
+) -> pd.DataFrame | None:
     """
     Imports a Brightspace classlist from a CSV or xlsx
     file.
 
+    Reads through `load_brightspace_classlist` (only the needed columns, as
+    text, with calamine for xlsx) and returns the same flat layout as before.
+    Use `load_brightspace_classlist` directly for an indexed, categorical
+    frame and proper exceptions.
+
     Parameters
     ----------
     file : pathlib.Path
         The path to the CSV or xlsx file containing the Brightspace classlist.
+    group : bool
+        Also keep the "Group Name" column (as "Group").
+    normalise : bool
+        Lower-case the column names and replace spaces with underscores.
+    cache : ParsedCache, optional
+        Reuse a columnar copy of the classlist if the file hasn't changed since
+        it was last read, instead of parsing it again.
 
     Returns
     -------
     pandas DataFrame
-        The Brightspace classlist.
+        The Brightspace classlist: "Student ID", "Last Name", "First Name",
+        ("Group",) "Score". None if it couldn't be read.
     """
-    # Check if the file is a CSV file
-    print('Testing the ingestion')
     try:
-        match file.suffix:
-            case '.csv':
-                classlist_df = pd.read_csv(file)
-            case '.xlsx':
-                classlist_df = pd.read_excel(file)
-            case _:
-                raise ValueError("File must be a CSV, or xlsx file.")
-
-        
-        # Read the CSV file and select the needed columns
-        # depending on the filetype
-
-        # rename the 'Username column' to 'Student ID'
-        classlist_df.rename(columns={"Username": "Student ID"}, inplace=True)
+        classlist_df = load_brightspace_classlist(file, group=group, cache=cache).reset_index()
+        # plain strings, as this function has always returned
+        classlist_df = classlist_df.astype(object)
         # add the "Score" column
         classlist_df["Score"] = ""
-        if group:
-            classlist_df = classlist_df.rename(columns={'Group Name':'Group'})
-            classlist_df = classlist_df[
-                ["Student ID", "Last Name", "First Name", "Group", "Score"]]
-            # Clean the 'Username' column by renaming to 'Student ID' and dropping the '#' character
-            classlist_df.rename(columns={"Username": "Student ID"}, inplace=True)
-        else:
-            classlist_df = classlist_df[
-                ["Student ID", "Last Name", "First Name", "Score"]]
-            classlist_df["Student ID"] = classlist_df["Student ID"].str.replace(
-                "#", "")
-
 
         if normalise:
             classlist_df.columns = [i.lower().replace(' ', '_')
@@ -1,23 +1,135 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from ..dependencies import pd, pl
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Mapping
+from ..dependencies import pd, pl, np
+from .parsed_cache import ParsedCache
+from .find_grader_conflicts import find_grader_conflicts
+from .student_registry import StudentRegistry
+
+IF_EXISTS = ("skip", "overwrite", "error")
+ON_CONFLICT = ("warn", "raise", "ignore")
+
+# Columns that are always text, whatever a file happens to hold. Student IDs in
+# particular come back as int from one file and str from another otherwise.
+TEXT_COLUMNS = {"Student ID": str, "student_id": str, "Name": str, "name": str, "grader": str}
+
+PROVENANCE_COLUMNS = ["source_file", "source_row"]
+
+
+def _id_strings(s: pd.Series) -> pd.Series:
+    """Student IDs as strings; IDs Excel stored as numbers lose the trailing '.0'."""
+    if pd.api.types.is_numeric_dtype(s):
+        whole = s.dropna()
+        if (whole == np.floor(whole)).all():
+            return s.astype("Int64").astype(str).where(s.notna(), None)
+    return s.astype(str).str.strip().where(s.notna(), None)
+
+
+def _read_graderfile(
+    path: pl.Path, kind: str, dtypes: Mapping[str, object], engine: str, provenance: bool
+) -> pd.DataFrame:
+    """One grader file with `dtypes` applied as it's read. Lives at module level for the pool."""
+    if kind == "excel":
+        df = pd.read_excel(path, engine=engine)
+    else:
+        df = pd.read_csv(path, dtype={c: str for c, t in dtypes.items() if t is str})
+
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        if dtype is str:
+            df[col] = _id_strings(df[col])
+        elif dtype in (float, "float", "float64"):
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        else:
+            df[col] = df[col].astype(dtype)
+
+    if provenance:
+        df["source_file"] = path.name
+        df["source_row"] = np.arange(2, len(df) + 2)  # row in the sheet/line in the csv, after the header
+    return df
+
+
+def _stable_dtypes(df: pd.DataFrame, fixed: set[str]) -> pd.DataFrame:
+    """
+    Every column not in `fixed` becomes float64 if all of its values are numbers
+    (blanks allowed) and str otherwise, decided over all files together so one
+    file's empty column can't make the others' disagree.
+    """
+    for col in df.columns:
+        if col in fixed:
+            continue
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s):
+            continue
+        as_num = pd.to_numeric(s, errors="coerce")
+        if as_num.notna().sum() == s.notna().sum():
+            df[col] = as_num.astype("float64")
+        elif not pd.api.types.is_string_dtype(s):
+            df[col] = s.astype(str).where(s.notna(), None)
+    return df
 
 
 def ingest_completed_graderfiles(
-    folder: pl.Path, grader: list[str], type: str = "csv", save: bool = False
+    folder: pl.Path,
+    grader: list[str],
+    type: str = "csv",
+    save: bool = False,
+    *,
+    workers: int | None = None,
+    dtypes: Mapping[str, object] | None = None,
+    engine: str = "calamine",
+    provenance: bool = True,
+    if_exists: str = "skip",
+    cache: ParsedCache | None = None,
+    assignment: pd.DataFrame | pl.Path | None = None,
+    classlist: pd.DataFrame | StudentRegistry | pl.Path | None = None,
+    on_conflict: str = "warn",
 ) -> pd.DataFrame:
     """
     This imports the completed grader file for each grader and then concatenates them into a single DataFrame.
 
+    Files are read in a thread pool (the parsing is done by calamine / pandas'
+    C parser, so threads overlap well) and concatenated in `grader` order. The
+    column types are fixed rather than left to each file: the `dtypes` are
+    applied as each file is read ("Student ID", "Name" and "grader" are text by
+    default), and every other column is float if it only holds numbers in all
+    files, or text otherwise. So a Student ID is never int in one file and str
+    in another, and scores don't end up as object after the concat.
+
     Args:
     folder (Path): The folder where the grader files are saved.
     grader (list[str]): The list of graders.
     type (str): The type of grader file. This can be 'excel' or 'csv'. Default is 'csv'.
     save (bool): If True, save the concatenated DataFrame to the same foler and type.
+    workers (int|None): Number of threads; None uses one per file (up to 8), 1 reads serially.
+    dtypes (dict|None): {column: str, float or a pandas dtype}, added to (and overriding)
+        the default text columns.
+    engine (str): pandas engine for .xlsx files. Default is 'calamine'; 'openpyxl' also works.
+    provenance (bool): Add "source_file" (the grader file's name) and "source_row" (its row
+        in that file, counting the header as row 1) to every row. Default is True.
+    if_exists (str): What `save` does if completed_grades already exists: 'skip' (default;
+        logs a warning), 'overwrite' or 'error'. Never prompts, so it's safe in batch jobs.
+    cache (ParsedCache|None): Reuse columnar copies of grader files that haven't changed
+        since they were last read, instead of parsing them again.
+    assignment (pd.DataFrame|Path|None): Who was meant to mark whom (e.g. distributed.xlsx).
+    classlist (pd.DataFrame|StudentRegistry|Path|None): The classlist, or a registry of several.
+        If either this or `assignment` is given, the merged grades are checked with
+        `find_grader_conflicts` (double marking, missing and unexpected students, wrong grader).
+    on_conflict (str): What to do if that check finds anything: 'warn' (default; logs a
+        summary), 'raise' (ValueError) or 'ignore'.
 
     Returns:
-    pd.DataFrame: The concatenated DataFrame.
+    pd.DataFrame: The concatenated DataFrame. If the conflict check ran, its result is
+        in `df.attrs["grader_conflicts"]`.
+
+    Raises:
+    ValueError: If an argument is invalid, none of the grader files could be read, or
+        on_conflict='raise' and there are conflicts.
+    FileExistsError: If saving and completed_grades exists with if_exists='error'.
     """
 
     # Check graders is a list of strings
@@ -40,46 +152,69 @@ def ingest_completed_graderfiles(
     if type not in ["excel", "csv"]:
         raise ValueError("Type must be either 'excel' or 'csv'.")
 
-    # try to create a list of DataFrames
-    dfs = []
-    for g in grader:
+    if if_exists not in IF_EXISTS:
+        raise ValueError(f"if_exists must be one of {IF_EXISTS}, got {if_exists!r}")
+
+    if on_conflict not in ON_CONFLICT:
+        raise ValueError(f"on_conflict must be one of {ON_CONFLICT}, got {on_conflict!r}")
+
+    schema = {**TEXT_COLUMNS, **(dtypes or {})}
+    suffix = "xlsx" if type == "excel" else "csv"
+    paths = [folder / f"{g}.{suffix}" for g in grader]
+
+    # Part of the cache key: a file read with other options is a different entry.
+    spec = f"graderfile:{type}:{engine}:{provenance}:" + ",".join(
+        f"{c}={getattr(t, '__name__', t)}" for c, t in sorted(schema.items())
+    )
+
+    def read(path: pl.Path) -> pd.DataFrame | None:
         try:
-            if type == "excel":
-                df = pd.read_excel(folder / f"{g}.xlsx")
-            else:
-                df = pd.read_csv(folder / f"{g}.csv")
-            dfs.append(df)
+            if cache is not None:
+                return cache.load(
+                    path, lambda p: _read_graderfile(p, type, schema, engine, provenance), spec
+                )
+            return _read_graderfile(path, type, schema, engine, provenance)
         except FileNotFoundError:
-            print(f"{g}.{type} not found.")
-        # check for pandas errors
-        except pd.errors.ParserError as e:
-            print(
-                f"Error reading {g}.{type}. {e}"
-            )  # I know that this is too general, but I'm not sure what specific errors to expect
-
-    # try to concatenate the DataFrames
-    try:
-        df = pd.concat(dfs, ignore_index=True)
-    except pd.errors.MergeError as e:
-        print(f"Error concatenating DataFrames. {e}")
+            logging.warning(f"{path.name} not found.")
+        except (pd.errors.ParserError, ValueError) as e:
+            logging.warning(f"Error reading {path.name}. {e}")
+        return None
+
+    if workers == 1 or len(paths) <= 1:
+        frames = [read(p) for p in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=workers or min(8, len(paths))) as pool:
+            frames = list(pool.map(read, paths))  # map keeps grader order
+
+    dfs = [df for df in frames if df is not None]
+    if not dfs:
+        raise ValueError(f"None of the grader files could be read from {folder}")
+
+    df = pd.concat(dfs, ignore_index=True)
+    df = _stable_dtypes(df, set(schema) | set(PROVENANCE_COLUMNS))
+
+    if assignment is not None or classlist is not None:
+        id_column = "Student ID" if "Student ID" in df.columns else "student_id"
+        conflicts = find_grader_conflicts(df, assignment, classlist, id_column=id_column)
+        df.attrs["grader_conflicts"] = conflicts
+        if len(conflicts) and on_conflict != "ignore":
+            summary = ", ".join(
+                f"{n} {issue}" for issue, n in conflicts["issue"].value_counts(sort=False).items() if n
+            )
+            if on_conflict == "raise":
+                raise ValueError(f"Grader files have conflicts: {summary}. See find_grader_conflicts.")
+            logging.warning(f"Grader files have conflicts: {summary} (see df.attrs['grader_conflicts'])")
 
     # save the concatenated DataFrame if save is True
-    save_path = folder / f"completed_grades.{type}"
-    if save and not save_path.exists():
-        if type == "excel":
-            df.to_excel(folder / "completed_grades.xlsx", index=False)
-        else:
-            df.to_csv(folder / "completed_grades.csv", index=False)
-    elif save and save_path.exists():
-        choice = input(
-            f"{save_path} already exists. Do you want to overwrite it? (y/n): "
-        )
-        if choice.lower() == "y":
-            if type == "excel":
-                df.to_excel(folder / "completed_grades.xlsx", index=False)
-            else:
-                df.to_csv(folder / "completed_grades.csv", index=False)
+    save_path = folder / f"completed_grades.{suffix}"
+    if save:
+        if save_path.exists() and if_exists == "error":
+            raise FileExistsError(f"{save_path} already exists")
+        if save_path.exists() and if_exists == "skip":
+            logging.warning(f"{save_path} already exists; not overwriting it (pass if_exists='overwrite').")
+        elif type == "excel":
+            df.to_excel(save_path, index=False)
         else:
-            print("Operation cancelled.")
+            df.to_csv(save_path, index=False)
 
     return df
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import logging
+from typing import Sequence
+from ..dependencies import pd, pl, np
+from .parsed_cache import ParsedCache
+
+# Brightspace export column -> column in the loaded frame
+NAME_COLUMNS = {"Last Name": "Last Name", "First Name": "First Name"}
+GROUP_COLUMN = {"Group Name": "Group"}
+ID_SOURCE = "Username"  # "#24123456"
+
+READERS = {".csv", ".xlsx", ".xlsm", ".xls", ".xlsb"}
+
+
+class ClasslistFormatError(ValueError):
+    """The file isn't a Brightspace classlist this loader understands."""
+
+
+# pyarrow's CSV reader is several times faster than the C one, but optional
+_CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+
+
+def _read(file: pl.Path, wanted: list[str]) -> pd.DataFrame:
+    """Only the `wanted` columns, all as text, so nothing is inferred and then thrown away."""
+    if file.suffix.lower() == ".csv":
+        header = pd.read_csv(file, nrows=0).columns
+        usecols = [c for c in wanted if c in header]
+        # blanks as "" (pyarrow would otherwise give the string "None" for str columns)
+        return pd.read_csv(
+            file, usecols=usecols, dtype={c: str for c in usecols}, keep_default_na=False, engine=_CSV_ENGINE
+        )
+    return pd.read_excel(
+        file, usecols=lambda c: c in wanted, dtype={c: str for c in wanted}, engine="calamine"
+    )
+
+
+def _clean_id(s) -> str:
+    return s.strip().lstrip("#").strip() if isinstance(s, str) else ""
+
+
+def _categorical(s: pd.Series) -> pd.Categorical:
+    """Categorical with surrounding whitespace removed, stripping the few categories rather than every row."""
+    cat = pd.Categorical(s)
+    stripped = cat.categories.str.strip()
+    cat = cat.rename_categories(stripped) if stripped.is_unique else pd.Categorical(s.str.strip())
+    return cat.remove_categories("") if "" in cat.categories else cat
+
+
+def _normalise(raw: pd.DataFrame, file: pl.Path, group: bool, extra: Sequence[str]) -> pd.DataFrame:
+    required = [ID_SOURCE, *NAME_COLUMNS, *(GROUP_COLUMN if group else ())]
+    missing = [c for c in required if c not in raw.columns]
+    if missing:
+        raise ClasslistFormatError(
+            f"{file.name} is missing column(s) {', '.join(missing)}; "
+            "is it the classlist export from Brightspace (Grades > Export)?"
+        )
+    missing_extra = [c for c in extra if c not in raw.columns]
+    if missing_extra:
+        raise ClasslistFormatError(f"{file.name} has no column(s) {', '.join(missing_extra)}")
+
+    ids = np.array([_clean_id(s) for s in raw[ID_SOURCE].to_numpy()], dtype=object)
+    keep = ids != ""
+    if not keep.all():
+        logging.warning(f"{file.name}: skipping {int((~keep).sum())} row(s) with no Username")
+        raw, ids = raw[keep], ids[keep]
+
+    df = pd.DataFrame(index=pd.Index(ids, name="Student ID"))
+    for src, dst in {**NAME_COLUMNS, **(GROUP_COLUMN if group else {})}.items():
+        df[dst] = _categorical(raw[src])
+    for c in extra:
+        df[c] = raw[c].to_numpy()
+    return df
+
+
+def load_brightspace_classlist(
+    file: pl.Path,
+    *,
+    group: bool = False,
+    extra_columns: Sequence[str] = (),
+    cache: ParsedCache | None = None,
+) -> pd.DataFrame:
+    """
+    Load a Brightspace classlist quickly and with fixed types.
+
+    Only the columns that are needed are read, all as text (so IDs like
+    "#0024..." keep their zeros and nothing is type-inferred), and .xlsx files
+    are parsed with calamine (.csv files with pyarrow, if it's installed). On a
+    20k-row faculty classlist this is about 8x faster than reading the whole
+    export with pandas' defaults for .xlsx, and about 1.7x faster for .csv;
+    see benchmarks/bench_classlist.py.
+
+    Args:
+    file (pl.Path): The .csv or .xlsx classlist export.
+    group (bool): Also load "Group Name" (as "Group"), for group assignments. Default is False.
+    extra_columns (list[str]): Other export columns to keep as they are (e.g. ["Email"]).
+    cache (ParsedCache|None): Reuse a columnar copy if the file hasn't changed since it was
+        last loaded.
+
+    Returns:
+    pd.DataFrame: Indexed by "Student ID" (string, "#" and whitespace removed), with
+        categorical "Last Name", "First Name" (and "Group") columns, then `extra_columns`.
+
+    Raises:
+    FileNotFoundError: If the file doesn't exist.
+    ClasslistFormatError: If it's not a readable classlist or lacks a needed column.
+
+    Example:
+        classlist = load_brightspace_classlist(pl.Path("classlist.xlsx"))
+        classlist.loc["24123456", "Last Name"]
+    """
+    file = pl.Path(file)
+    if file.suffix.lower() not in READERS:
+        raise ClasslistFormatError(f"File must be a CSV or Excel file, not {file.suffix or file.name}")
+    if not file.exists():
+        raise FileNotFoundError(f"Can not find file at {file.absolute()}")
+
+    extra = list(extra_columns)
+    wanted = [ID_SOURCE, *NAME_COLUMNS, *(GROUP_COLUMN if group else ()), *extra]
+
+    def read(path: pl.Path) -> pd.DataFrame:
+        try:
+            raw = _read(path, wanted)
+        except (ValueError, pd.errors.ParserError) as e:
+            raise ClasslistFormatError(f"Couldn't read {path.name} as a classlist: {e}") from e
+        return _normalise(raw, path, group, extra)
+
+    if cache is not None:
+        return cache.load(file, read, spec=f"classlist:{group}:{','.join(extra)}")
+    return read(file)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable
+from ..dependencies import pd, pl
+
+FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def _sha1(path: pl.Path) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha1").hexdigest()
+
+
+class ParsedCache:
+    """
+    Columnar copies of parsed spreadsheets, so re-running a notebook doesn't
+    parse the same Excel files again.
+
+    `load(source, reader)` returns `reader(source)`, but the first time it also
+    writes the result as Parquet (or Feather) into a `.grader_helper_parsed`
+    folder next to the source (or into `cache_dir`). Later loads read that copy,
+    which is typically 10-50x faster than parsing the workbook, for as long as
+    the source's size and mtime are unchanged. If they changed but the bytes
+    didn't (OneDrive touches files), the SHA-1 stored with the entry still
+    makes it a hit. Entries are also keyed by a `spec` string describing how the
+    source was read, so reading it differently never returns the wrong frame.
+
+    An `index.json` in each cache folder records the entries. With `max_bytes`,
+    the least recently used entries of a folder are deleted once its copies
+    take more space than that. Needs pyarrow.
+
+    Pass a cache to `ingest_completed_graderfiles` or
+    `import_brightspace_classlist` through their `cache` argument.
+
+    Usage:
+        cache = ParsedCache(max_bytes=500_000_000)
+        df = ingest_completed_graderfiles(folder, graders, type="excel", cache=cache)
+        cache.stats()  # {'hits': 12, 'misses': 0, 'entries': 12, 'bytes': ..., ...}
+    """
+
+    DIRNAME = ".grader_helper_parsed"
+    INDEX = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: pl.Path | None = None,
+        *,
+        format: str = "parquet",
+        max_bytes: int | None = None,
+        hash_contents: bool = True,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {tuple(FORMATS)}, got {format!r}")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("ParsedCache needs pyarrow (pip install pyarrow)") from e
+        self.cache_dir = pl.Path(cache_dir) if cache_dir is not None else None
+        self.format = format
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        self._indexes: dict[pl.Path, dict] = {}
+        self._lock = threading.Lock()  # readers run in thread pools
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0, "write_errors": 0}
+
+    def _dir_for(self, source: pl.Path) -> pl.Path:
+        return self.cache_dir if self.cache_dir is not None else source.parent / self.DIRNAME
+
+    def _index(self, folder: pl.Path) -> dict:
+        if folder not in self._indexes:
+            try:
+                with open(folder / self.INDEX, encoding="utf-8") as fh:
+                    self._indexes[folder] = json.load(fh)
+            except (OSError, ValueError):
+                self._indexes[folder] = {}
+        return self._indexes[folder]
+
+    def _save_index(self, folder: pl.Path) -> None:
+        tmp = folder / f".{self.INDEX}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self._indexes[folder], fh)
+        os.replace(tmp, folder / self.INDEX)
+
+    @staticmethod
+    def _key(source: pl.Path, spec: str) -> str:
+        return hashlib.sha1(f"{source.absolute().as_posix()}\0{spec}".encode()).hexdigest()[:16]
+
+    def _read_copy(self, path: pl.Path) -> pd.DataFrame:
+        return pd.read_parquet(path) if self.format == "parquet" else pd.read_feather(path)
+
+    def _write_copy(self, df: pd.DataFrame, path: pl.Path) -> None:
+        tmp = path.with_name(f".{path.name}.tmp")
+        if self.format == "parquet":
+            df.to_parquet(tmp)
+        else:
+            df.reset_index(drop=True).to_feather(tmp)
+        os.replace(tmp, path)
+
+    def load(self, source: pl.Path, reader: Callable[[pl.Path], pd.DataFrame], spec: str = "") -> pd.DataFrame:
+        """
+        `reader(source)`, from the columnar copy if it's still valid.
+
+        Args:
+            source: the spreadsheet.
+            reader: parses `source` into a DataFrame; only called on a miss.
+            spec: how `reader` reads (engine, options); part of the cache key.
+        """
+        source = pl.Path(source)
+        st = os.stat(source)  # FileNotFoundError as the reader would raise it
+        folder = self._dir_for(source)
+        key = self._key(source, spec)
+
+        with self._lock:
+            entry = self._index(folder).get(key)
+        if entry is not None:
+            copy = folder / entry["file"]
+            valid = entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+            if not valid and self.hash_contents and entry.get("sha1") == _sha1(source):
+                valid = True
+                entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+            if valid:
+                try:
+                    df = self._read_copy(copy)
+                except OSError:
+                    pass  # copy deleted behind our back; parse again
+                else:
+                    with self._lock:
+                        entry["last_used"] = time.time()
+                        entry["hits"] = entry.get("hits", 0) + 1
+                        self._counts["hits"] += 1
+                        self._save_index(folder)
+                    return df
+
+        df = reader(source)
+        with self._lock:
+            self._counts["misses"] += 1
+        self._store(source, st, folder, key, spec, df)
+        return df
+
+    def _store(self, source: pl.Path, st: os.stat_result, folder: pl.Path, key: str, spec: str, df) -> None:
+        copy = folder / f"{source.stem}.{key}{FORMATS[self.format]}"
+        try:
+            folder.mkdir(parents=True, exist_ok=True)
+            self._write_copy(df, copy)
+        except Exception as e:
+            # e.g. a column mixing ints and strings that Arrow can't type;
+            # the frame is still returned, it just isn't cached.
+            logging.warning(f"Couldn't cache {source.name}: {e}")
+            with self._lock:
+                self._counts["write_errors"] += 1
+            return
+
+        entry = {
+            "source": source.absolute().as_posix(),
+            "spec": spec,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha1": _sha1(source) if self.hash_contents else None,
+            "file": copy.name,
+            "bytes": copy.stat().st_size,
+            "created": time.time(),
+            "last_used": time.time(),
+            "hits": 0,
+        }
+        with self._lock:
+            index = self._index(folder)
+            old = index.get(key)
+            if old is not None and old["file"] != copy.name:
+                (folder / old["file"]).unlink(missing_ok=True)
+            index[key] = entry
+            if self.max_bytes is not None:
+                self._evict(folder, self.max_bytes, keep=key)
+            self._save_index(folder)
+
+    def _evict(self, folder: pl.Path, max_bytes: int, keep: str | None = None) -> int:
+        """Delete least recently used copies until the folder fits in `max_bytes`. Call with the lock held."""
+        index = self._index(folder)
+        total = sum(e["bytes"] for e in index.values())
+        evicted = 0
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= max_bytes:
+                break
+            if key == keep:
+                continue
+            (folder / entry["file"]).unlink(missing_ok=True)
+            total -= entry["bytes"]
+            del index[key]
+            evicted += 1
+        self._counts["evictions"] += evicted
+        return evicted
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Shrink every cache folder seen so far to `max_bytes` (default: the cache's own). Returns the count removed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit is None:
+            raise ValueError("pass max_bytes (this cache has no size limit)")
+        with self._lock:
+            evicted = 0
+            for folder in list(self._indexes):
+                evicted += self._evict(folder, limit)
+                self._save_index(folder)
+        return evicted
+
+    def clear(self) -> int:
+        """Delete every cached copy in the folders seen so far. Returns the count removed."""
+        return self.evict(0)
+
+    def stats(self) -> dict:
+        """Hits, misses, evictions and write errors since this object was created, plus the entries and bytes on disk."""
+        with self._lock:
+            entries = [e for index in self._indexes.values() for e in index.values()]
+            return {
+                **self._counts,
+                "entries": len(entries),
+                "bytes": sum(e["bytes"] for e in entries),
+            }
+
+    def entries(self) -> pd.DataFrame:
+        """One row per cached source: where it is, its size on disk, hits and when it was last used."""
+        with self._lock:
+            rows = [
+                {**e, "cache_dir": str(folder)}
+                for folder, index in self._indexes.items()
+                for e in index.values()
+            ]
+        df = pd.DataFrame(rows, columns=[
+            "source", "spec", "file", "cache_dir", "bytes", "hits", "created", "last_used", "size", "mtime_ns", "sha1"
+        ])
+        for col in ("created", "last_used"):
+            df[col] = pd.to_datetime(df[col], unit="s")
+        return df
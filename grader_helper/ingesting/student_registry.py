@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import logging
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+from ..dependencies import pd, pl, np
+from .load_brightspace_classlist import load_brightspace_classlist, ClasslistFormatError
+
+# Column spellings seen in classlists (raw exports, import_brightspace_classlist
+# with normalise=True, load_brightspace_classlist) -> the registry's columns
+_COLUMN_NAMES = {
+    "Student ID": "Student ID",
+    "student_id": "Student ID",
+    "Username": "Student ID",
+    "Last Name": "Last Name",
+    "last_name": "Last Name",
+    "First Name": "First Name",
+    "first_name": "First Name",
+    "Group": "Group",
+    "group": "Group",
+    "Group Name": "Group",
+}
+_ID_INDEX_NAMES = ("Student ID", "student_id", "Username")
+
+
+def _norm_id(x) -> str:
+    """'#24123456', ' 24123456 ', 24123456 and 24123456.0 all become '24123456'; blanks ''."""
+    if isinstance(x, str):
+        return x.strip().lstrip("#").strip()
+    if x is None or (isinstance(x, float) and np.isnan(x)):
+        return ""
+    if isinstance(x, (float, np.floating)) and float(x).is_integer():
+        return str(int(x))
+    return str(x).strip()
+
+
+def _name_key(last, first) -> tuple[str, str]:
+    return (str(last).strip().casefold(), str(first).strip().casefold())
+
+
+@dataclass(frozen=True)
+class Student:
+    """
+    One student in a `StudentRegistry`.
+
+    Attributes:
+        student_id: normalised ID ("24123456").
+        last_name, first_name: as on the first classlist they appear in.
+        group: their group, if the classlists have groups.
+        sections: every section (classlist) they're on, in the order given.
+    """
+
+    student_id: str
+    last_name: str
+    first_name: str
+    group: str | None
+    sections: tuple[str, ...]
+
+
+def _standardise(source, group: bool) -> pd.DataFrame:
+    """One classlist as a flat object frame with the registry's column names."""
+    if isinstance(source, (str, pl.Path)):
+        df = load_brightspace_classlist(pl.Path(source), group=group).reset_index()
+    elif isinstance(source, pd.DataFrame):
+        df = source.reset_index() if source.index.name in _ID_INDEX_NAMES else source
+    else:
+        raise TypeError(f"A classlist must be a path or a DataFrame, not {type(source).__name__}")
+
+    df = df.rename(columns={c: _COLUMN_NAMES[c] for c in df.columns if c in _COLUMN_NAMES})
+    df = df.loc[:, ~df.columns.duplicated()]
+    missing = [c for c in ("Student ID", "Last Name", "First Name") if c not in df.columns]
+    if missing:
+        raise ClasslistFormatError(f"Classlist has no {', '.join(missing)} column")
+
+    columns = ["Student ID", "Last Name", "First Name"] + (["Group"] if "Group" in df.columns else [])
+    out = pd.DataFrame({c: df[c].to_numpy(dtype=object) for c in columns})
+    out["Student ID"] = [_norm_id(x) for x in out["Student ID"]]
+    return out
+
+
+class StudentRegistry:
+    """
+    Every student across several classlists (e.g. one Brightspace export per
+    section), once each, with O(1) lookups by ID and by name.
+
+    Students are deduplicated on their normalised Student ID ('#24123456',
+    24123456 and '24123456' are the same student); a student on more than one
+    classlist keeps the name and group from the first one and is listed in
+    every section they're on. The ID lookup is a dict, and the name lookup a
+    dict keyed on the case-folded (last, first) name, built on first use.
+
+    Anything that takes a classlist DataFrame (`assign_graders_individual`,
+    `assign_graders_groups`, `find_unsubmitted`, `find_grader_conflicts`,
+    `ingest_completed_graderfiles`) also takes a registry.
+
+    Usage:
+        registry = StudentRegistry(
+            subs / "classlist_lec01.csv", subs / "classlist_lec02.csv", sections=["LEC01", "LEC02"]
+        )
+        registry["24123456"].sections
+        registry.by_name("Murphy", "Aoife")
+        assign_graders_individual(registry, graders, seed=1)
+    """
+
+    def __init__(self, *classlists, sections: Sequence[str] | None = None, group: bool = False):
+        """
+        Args:
+            *classlists: Paths to Brightspace classlist exports (read with
+                `load_brightspace_classlist`) and/or classlist DataFrames, raw or as
+                imported by this package.
+            sections: A label for each classlist. By default a path's file name
+                (without extension), and "Section N" for DataFrames.
+            group: Also read "Group Name" from classlist files. DataFrames keep their
+                Group column if they have one.
+
+        Raises:
+            ValueError: If no classlists are given or `sections` is the wrong length.
+            ClasslistFormatError: If a classlist lacks a Student ID or name column.
+        """
+        if not classlists:
+            raise ValueError("StudentRegistry needs at least one classlist")
+        if sections is None:
+            sections = [
+                pl.Path(c).stem if isinstance(c, (str, pl.Path)) else f"Section {i}"
+                for i, c in enumerate(classlists, 1)
+            ]
+        sections = [str(s) for s in sections]
+        if len(sections) != len(classlists):
+            raise ValueError(f"Got {len(sections)} section labels for {len(classlists)} classlists")
+
+        frames = []
+        for source, label in zip(classlists, sections):
+            f = _standardise(source, group)
+            f["Section"] = label
+            frames.append(f)
+        rows = pd.concat(frames, ignore_index=True)
+        if "Group" not in rows.columns:
+            rows["Group"] = None
+        blank = rows["Student ID"] == ""
+        if blank.any():
+            logging.warning(f"Skipping {int(blank.sum())} classlist row(s) with no Student ID")
+            rows = rows[~blank]
+
+        membership: dict[str, list[str]] = {}
+        for sid, label in zip(rows["Student ID"], rows["Section"]):
+            labels = membership.setdefault(sid, [])
+            if label not in labels:
+                labels.append(label)
+
+        repeated = rows[rows["Student ID"].duplicated(keep=False)]
+        if len(repeated):
+            names = repeated.groupby("Student ID")[["Last Name", "First Name"]].nunique()
+            clashes = int((names.max(axis=1) > 1).sum())
+            if clashes:
+                logging.warning(
+                    f"{clashes} student(s) have different names on different classlists; "
+                    "keeping the name from the first classlist"
+                )
+        first = rows.drop_duplicates("Student ID")
+
+        self._ids = first["Student ID"].tolist()
+        self._last = first["Last Name"].tolist()
+        self._first = first["First Name"].tolist()
+        self._group = first["Group"].tolist()
+        self._sections = [tuple(membership[sid]) for sid in self._ids]
+        self._labels = sections
+        self._position = {sid: i for i, sid in enumerate(self._ids)}
+        self._names: dict[tuple[str, str], list[int]] | None = None
+        self.has_groups = any(g is not None and g == g for g in self._group)
+
+    @classmethod
+    def as_frame(cls, classlist, index: Sequence[str] | None = None):
+        """`classlist.to_frame(index)` if it's a registry, otherwise `classlist` unchanged."""
+        if isinstance(classlist, cls):
+            return classlist.to_frame(index)
+        return classlist
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __contains__(self, student_id) -> bool:
+        return _norm_id(student_id) in self._position
+
+    def _student(self, i: int) -> Student:
+        group = self._group[i]
+        return Student(
+            self._ids[i],
+            self._last[i],
+            self._first[i],
+            group if group is not None and group == group else None,
+            self._sections[i],
+        )
+
+    def __getitem__(self, student_id) -> Student:
+        i = self._position.get(_norm_id(student_id))
+        if i is None:
+            raise KeyError(f"No student with ID {student_id!r}")
+        return self._student(i)
+
+    def get(self, student_id, default=None) -> Student | None:
+        i = self._position.get(_norm_id(student_id))
+        return default if i is None else self._student(i)
+
+    def by_name(self, last_name: str, first_name: str) -> list[Student]:
+        """Students with this name (case and surrounding spaces ignored); more than one if it's shared."""
+        if self._names is None:
+            names: dict[tuple[str, str], list[int]] = {}
+            for i, key in enumerate(map(_name_key, self._last, self._first)):
+                names.setdefault(key, []).append(i)
+            self._names = names
+        return [self._student(i) for i in self._names.get(_name_key(last_name, first_name), [])]
+
+    @property
+    def ids(self) -> pd.Index:
+        return pd.Index(self._ids, dtype=object, name="Student ID")
+
+    @property
+    def sections(self) -> list[str]:
+        """The section labels, in the order the classlists were given."""
+        return list(self._labels)
+
+    def in_section(self, section: str) -> list[str]:
+        """Student IDs on one section's classlist."""
+        if section not in self._labels:
+            raise KeyError(f"No section {section!r}; sections are {', '.join(self._labels)}")
+        return [sid for sid, s in zip(self._ids, self._sections) if section in s]
+
+    def multi_section(self) -> list[str]:
+        """Student IDs that are on more than one classlist."""
+        return [sid for sid, s in zip(self._ids, self._sections) if len(s) > 1]
+
+    def to_frame(self, index: Sequence[str] | None = None) -> pd.DataFrame:
+        """
+        The students as a classlist DataFrame: "Student ID", "Last Name", "First Name",
+        ("Group",) "Section" (", "-joined if they're on several), one row each.
+
+        Args:
+            index: Columns to set as the index, e.g. ["Group", "Student ID"] for
+                `assign_graders_groups`.
+        """
+        df = pd.DataFrame({
+            "Student ID": self._ids,
+            "Last Name": self._last,
+            "First Name": self._first,
+        }, dtype=object)
+        if self.has_groups:
+            df["Group"] = pd.Series(self._group, dtype=object)
+        df["Section"] = [", ".join(s) for s in self._sections]
+        if index is not None:
+            missing = [c for c in index if c not in df.columns]
+            if missing:
+                raise ValueError(f"The registry has no {', '.join(missing)} column to index by")
+            df = df.set_index(list(index))
+        return df
+
+    def __repr__(self) -> str:
+        return f"StudentRegistry({len(self)} students, sections={self._labels})"
@@ -0,0 +1,82 @@
+import importlib
+import itertools
+
+import numpy as np
+import pytest
+
+# the package re-exports the function under the module's name
+agc = importlib.import_module("grader_helper.assignment.assign_graders_constrained")
+
+
+def _instance(rng: np.random.Generator):
+    """A small random problem: costs with forbidden (inf) pairs, quotas and capacities."""
+    n, k = int(rng.integers(1, 7)), int(rng.integers(1, 4))
+    cost = rng.integers(-3, 4, (n, k)).astype(float)
+    cost[rng.random((n, k)) < 0.25] = np.inf
+    cap = rng.integers(0, n + 1, k)
+    if cap.sum() < n:
+        cap[0] += n - cap.sum()
+    quota = np.minimum(cap, rng.multinomial(n, np.ones(k) / k))
+    finite = cost[np.isfinite(cost)]
+    penalty = 1 + (k + 1) * (np.ptp(finite) if len(finite) else 0)
+    return cost, quota, cap, penalty
+
+
+def _objective(cost, quota, cap, penalty, grader_of) -> float:
+    load = np.bincount(grader_of, minlength=cost.shape[1])
+    if (load > cap).any():
+        return np.inf
+    return cost[np.arange(len(grader_of)), grader_of].sum() + penalty * np.maximum(load - quota, 0).sum()
+
+
+def _brute_force(cost, quota, cap, penalty) -> float:
+    n, k = cost.shape
+    return min(
+        _objective(cost, quota, cap, penalty, np.array(a)) for a in itertools.product(range(k), repeat=n)
+    )
+
+
+def _check_flow(solver, supply, cap):
+    assert (solver.flow.sum(axis=1) == supply).all()
+    assert (solver.load == solver.flow.sum(axis=0)).all()
+    assert (solver.load <= cap).all()
+    assert np.isfinite(solver.cost[solver.flow > 0]).all()
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_flow_solver_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(60):
+        cost, quota, cap, penalty = _instance(rng)
+        best = _brute_force(cost, quota, cap, penalty)
+
+        solver = agc._FlowSolver(cost.copy(), quota, cap, penalty)
+        unplaced = sum(solver.add(c, 1) for c in range(len(cost)))
+        if np.isinf(best):
+            assert unplaced > 0
+            continue
+        assert unplaced == 0
+        _check_flow(solver, 1, cap)
+        got = _objective(cost, quota, cap, penalty, solver.flow.argmax(axis=1))
+        assert got == pytest.approx(best)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_flow_solver_classes_match_brute_force(seed):
+    """Students with the same cost row added as one class give the same optimum."""
+    rng = np.random.default_rng(100 + seed)
+    for _ in range(40):
+        cost, quota, cap, penalty = _instance(rng)
+        rows, supply = np.unique(cost, axis=0, return_counts=True)
+        best = _brute_force(cost, quota, cap, penalty)
+
+        solver = agc._FlowSolver(rows.copy(), quota, cap, penalty)
+        unplaced = sum(solver.add(c, int(s)) for c, s in enumerate(supply))
+        if np.isinf(best):
+            assert unplaced > 0
+            continue
+        assert unplaced == 0
+        _check_flow(solver, supply, cap)
+        over = np.maximum(solver.load - quota, 0).sum()
+        got = (solver.flow * np.where(solver.flow > 0, rows, 0)).sum() + penalty * over
+        assert got == pytest.approx(best)
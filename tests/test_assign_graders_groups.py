@@ -0,0 +1,41 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the package re-exports the function under the module's name
+agg = importlib.import_module("grader_helper.assignment.assign_graders_groups")
+
+GRADERS = ["Ann", "Bob", "Cat"]
+
+
+def _frame(groups):
+    index = pd.MultiIndex.from_arrays(
+        [groups, [str(24000000 + i) for i in range(len(groups))]], names=["Group", "Student ID"]
+    )
+    return pd.DataFrame({"Score": np.arange(len(groups))}, index=index)
+
+
+@pytest.mark.parametrize("balance", [False, True])
+def test_students_without_a_group_are_graded_alone(balance):
+    d = _frame(["T1", "T1", np.nan, np.nan])
+    out = agg.assign_graders_groups(d, GRADERS, balance=balance, seed=1)
+    assert out is not None
+    assert out["grader"].isin(GRADERS).all()
+    assert out["grader"].iloc[0] == out["grader"].iloc[1]
+    load = out.attrs["grader_load"]
+    assert load["groups"].sum() == 3
+    assert load["students"].sum() == 4
+
+
+def test_balance_spreads_ungrouped_students():
+    d = _frame([np.nan] * 6)
+    out = agg.assign_graders_groups(d, GRADERS, balance=True, seed=2)
+    assert out["grader"].value_counts().tolist() == [2, 2, 2]
+
+
+def test_groups_keep_one_grader():
+    d = _frame(["T1", "T2", "T1", "T3", "T2", "T3"])
+    out = agg.assign_graders_groups(d, GRADERS, balance=True, seed=3)
+    assert (out.groupby(level="Group")["grader"].nunique() == 1).all()
@@ -0,0 +1,64 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from grader_helper.file_operations import json_values
+from grader_helper.file_operations.grade_cache import GradeCache
+from grader_helper.file_operations.grade_checkpoint import GradeCheckpoint
+
+VALUES = [
+    dt.datetime(2025, 9, 13, 15, 10, 30),
+    dt.date(2025, 9, 13),
+    dt.time(15, 10),
+    dt.timedelta(hours=1, seconds=5),
+    55.5,
+    7,
+    "absent",
+    None,
+    True,
+    {"Total": dt.datetime(2025, 1, 2), "Q1": 3.0},
+]
+
+
+@pytest.mark.parametrize("value", VALUES, ids=repr)
+def test_round_trip_keeps_type(value):
+    back = json_values.loads(json_values.dumps(value))
+    assert back == value
+    assert type(back) is type(value)
+
+
+def test_numpy_scalars_become_python():
+    assert json_values.loads(json_values.dumps(np.float64(1.5))) == 1.5
+
+
+def test_unknown_types_are_refused():
+    with pytest.raises(TypeError):
+        json_values.dumps(object())
+
+
+def test_checkpoint_resume_keeps_datetimes(tmp_path):
+    path = tmp_path / "ckpt.jsonl"
+    when = dt.datetime(2025, 9, 13, 15, 10)
+    with GradeCheckpoint(path, "spec") as ckpt:
+        ckpt.append({"file": "a.xlsx", "Student ID": "1", "grade": when, "error": None})
+        ckpt.append({"file": "b.xlsx", "Student ID": "2", "grade": object(), "error": None})
+
+    resumed = GradeCheckpoint(path, "spec", resume=True)
+    resumed.close()
+    assert resumed.done["a.xlsx"]["grade"] == when
+    assert type(resumed.done["a.xlsx"]["grade"]) is dt.datetime
+    assert "b.xlsx" not in resumed.done  # not written, so it's read again
+
+
+def test_grade_cache_keeps_datetimes(tmp_path):
+    sheet = tmp_path / "sheet.xlsx"
+    sheet.write_bytes(b"x")
+    when = dt.datetime(2025, 9, 13, 15, 10)
+    with GradeCache(tmp_path) as cache:
+        cache.store(sheet, sheet.stat(), "1", when, "spec")
+        cache.commit()
+        hits, misses = cache.lookup([sheet], "spec")
+    assert hits[sheet] == ("1", when)
+    assert type(hits[sheet][1]) is dt.datetime
+    assert misses == []
@@ -0,0 +1,39 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the package re-exports the function under the module's name
+ms = importlib.import_module("grader_helper.file_operations.moderation_sample")
+
+IDS = [24000001 + i for i in range(6)]
+
+
+@pytest.fixture
+def subs(tmp_path):
+    root = tmp_path / "subs"
+    for sid in IDS:
+        folder = root / f"LAST{sid}, FIRST({sid})"
+        folder.mkdir(parents=True)
+        (folder / "report.txt").write_text(str(sid))
+    return root
+
+
+@pytest.mark.parametrize(
+    "ids",
+    [
+        [str(i) for i in IDS],
+        [f"#{i}" for i in IDS],
+        [float(i) for i in IDS],  # read back from Excel with a blank in the column
+    ],
+    ids=["str", "hash", "float"],
+)
+def test_ids_match_submission_folders(tmp_path, subs, ids):
+    grades = pd.DataFrame({"Student ID": ids, "Total": np.linspace(20, 95, len(ids))})
+    manifest = ms.moderation_sample(
+        grades, subs, tmp_path / "Moderation", per_band=5, seed=1, progress=False
+    )
+    assert len(manifest) == len(IDS)
+    assert (manifest["status"] == "copied").all()
+    assert set(manifest["Student ID"]) == {str(i) for i in IDS}
@@ -0,0 +1,233 @@
+import importlib
+import math
+import random
+
+import pytest
+
+# the package re-exports the function under the module's name
+rc = importlib.import_module("grader_helper.file_operations.recalculate_cell")
+from grader_helper.file_operations.read_xlsx_cell import _parse_ref
+
+# Excel precedence, lowest first; postfix % and unary minus bind tightest
+_LEVEL = {"=": 0, "<>": 0, "<": 0, ">": 0, "<=": 0, ">=": 0, "&": 1,
+          "+": 2, "-": 2, "*": 3, "/": 3, "^": 4}
+_PCT, _NEG, _ATOM = 5, 6, 7
+
+_REFS = ["A1", "$B$7", "c12", "Rubric!D4", "'My Sheet'!$E$2", "AA10"]
+_RANGES = ["A1:B3", "Rubric!C2:C5"]
+_NAMES = ["Total", "rate", "Bonus_pts"]
+_FUNCS = ["SUM", "IF", "MAX", "ROUND", "_xlfn.STDEV"]
+
+
+def _level(node) -> int:
+    match node[0]:
+        case "bin":
+            return _LEVEL[node[1]]
+        case "pct":
+            return _PCT
+        case "neg":
+            return _NEG
+    return _ATOM
+
+
+def _const(rng: random.Random):
+    match rng.randrange(6):
+        case 0:
+            v = rng.randrange(100)
+            return ("const", v), str(v)
+        case 1:
+            v = rng.randrange(1000) / 8
+            return ("const", v), repr(v)
+        case 2:
+            v = rng.choice(["", "pass", 'say "hi"'])
+            return ("const", v), '"' + v.replace('"', '""') + '"'
+        case 3:
+            v = rng.choice([True, False])
+            return ("const", v), rng.choice([str(v).upper(), str(v).lower()])
+        case 4:
+            text = rng.choice(_REFS)
+            sheet, (coord,) = _parse_ref(text)
+            return ("ref", sheet, coord), text
+        case _:
+            text = rng.choice(_NAMES)
+            return ("name", text), text
+
+
+def _gen(rng: random.Random, depth: int):
+    """A random AST and one way of writing it with as few brackets as Excel needs."""
+    if depth == 0 or rng.random() < 0.2:
+        return _const(rng)
+    kind = rng.randrange(5)
+    if kind == 0:
+        node, text = _gen(rng, depth - 1)
+        return ("neg", node), "-" + (text if _level(node) >= _NEG else f"({text})")
+    if kind == 1:
+        node, text = _gen(rng, depth - 1)
+        return ("pct", node), (text if _level(node) >= _PCT else f"({text})") + "%"
+    if kind == 2:
+        name = rng.choice(_FUNCS)
+        args, texts = [], []
+        for _ in range(rng.randrange(4)):
+            r = rng.random()
+            if r < 0.15:
+                args.append(("const", None))
+                texts.append("")
+            elif r < 0.3:
+                text = rng.choice(_RANGES)
+                sheet, coords = _parse_ref(text)
+                args.append(("range", sheet, tuple(coords)))
+                texts.append(text)
+            else:
+                node, text = _gen(rng, depth - 1)
+                args.append(node)
+                texts.append(text)
+        if texts == [""]:  # "F()" is no arguments, not one omitted one
+            args, texts = [], []
+        upper = name.upper().removeprefix("_XLFN.")
+        return ("call", upper, tuple(args)), f"{name}({', '.join(texts)})"
+    op = rng.choice(list(_LEVEL))
+    (left, lt), (right, rt) = _gen(rng, depth - 1), _gen(rng, depth - 1)
+    if _level(left) < _LEVEL[op]:
+        lt = f"({lt})"
+    if _level(right) <= _LEVEL[op]:  # left-associative
+        rt = f"({rt})"
+    sep = rng.choice(["", " "])
+    return ("bin", op, left, right), f"{lt}{sep}{op}{sep}{rt}"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_parser_matches_generated_trees(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        tree, text = _gen(rng, 4)
+        assert rc._Parser(text).parse() == tree, text
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tokenizer_ignores_spacing(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        _, text = _gen(rng, 4)
+        tokens = rc._tokenize(text)
+        spaced = "  ".join(t for _, t in tokens)
+        assert rc._tokenize(spaced) == tokens, text
+
+
+def _reference(node):
+    """Excel arithmetic on a numbers-only tree, written out longhand."""
+    match node:
+        case ("const", v):
+            return v
+        case ("neg", x):
+            x = _reference(x)
+            return x if isinstance(x, str) else -x
+        case ("pct", x):
+            x = _reference(x)
+            return x if isinstance(x, str) else x / 100
+        case ("bin", op, a, b):
+            a, b = _reference(a), _reference(b)
+            if isinstance(a, str):
+                return a
+            if isinstance(b, str):
+                return b
+            if op == "/":
+                return "#DIV/0!" if b == 0 else a / b
+            if op == "^":
+                if a == 0 and b < 0:
+                    return "#NUM!"
+                if a < 0 and b != int(b):
+                    return "#NUM!"
+                try:
+                    return float(a) ** b
+                except OverflowError:
+                    return "#NUM!"
+            return {"+": a + b, "-": a - b, "*": a * b}[op]
+
+
+def _arithmetic(rng: random.Random, depth: int):
+    if depth == 0 or rng.random() < 0.25:
+        v = rng.choice([0, 1, 2, 3, 10, 0.5, 2.5])
+        return ("const", v), str(v)
+    kind = rng.randrange(4)
+    if kind == 0:
+        node, text = _arithmetic(rng, depth - 1)
+        return ("neg", node), "-" + (text if _level(node) >= _NEG else f"({text})")
+    if kind == 1:
+        node, text = _arithmetic(rng, depth - 1)
+        return ("pct", node), (text if _level(node) >= _PCT else f"({text})") + "%"
+    op = rng.choice("+-*/^")
+    (left, lt), (right, rt) = _arithmetic(rng, depth - 1), _arithmetic(rng, depth - 1)
+    if _level(left) < _LEVEL[op]:
+        lt = f"({lt})"
+    if _level(right) <= _LEVEL[op]:
+        rt = f"({rt})"
+    return ("bin", op, left, right), f"{lt}{op}{rt}"
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_evaluator_matches_reference_arithmetic(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        tree, text = _arithmetic(rng, 4)
+        want = _reference(tree)
+        got = rc._Evaluator(None).eval(rc._parse_formula("=" + text), "Sheet1")
+        if isinstance(want, str):
+            assert got == want, text
+        else:
+            assert not isinstance(got, str), text
+            assert math.isclose(got, want, rel_tol=1e-12, abs_tol=1e-12), text
+
+
+@pytest.mark.parametrize(
+    "text, value",
+    [("-2^2", 4.0), ("2^-1", 0.5), ("50%^2", 0.25), ("1+2*3", 7), ("2^3^2", 64.0),
+     ("(-8)^(1/3)", "#NUM!"), ('"a"&1+1', "a2"), ("1<2=TRUE", True)],
+)
+def test_excel_precedence(text, value):
+    assert rc._Evaluator(None).eval(rc._parse_formula("=" + text), "Sheet1") == value
+
+
+@pytest.mark.parametrize("text", ["1+", "SUM(1", "(1))", "1 2", "A1:", "@x"])
+def test_malformed_formulas_are_unsupported(text):
+    with pytest.raises(rc.UnsupportedFormulaError):
+        rc._Parser(text).parse()
+
+
+def _workbook(path, formulas):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Rubric"
+    for cell, value in formulas.items():
+        ws[cell] = value
+    wb.save(path)
+    return path
+
+
+def test_plans_are_kept_per_template(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc, "_PLANS", type(rc._PLANS)())
+    a = _workbook(tmp_path / "a.xlsx", {"A1": 2, "A2": 3, "B1": "=A1+A2"})
+    b = _workbook(tmp_path / "b.xlsx", {"A1": 2, "C9": 40, "B1": "=A1*C9"})
+    # a template with a defined name has a different workbook part
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.load_workbook(b)
+    wb.defined_names["Marks"] = openpyxl.workbook.defined_name.DefinedName("Marks", attr_text="Rubric!$C$9")
+    wb.save(b)
+
+    assert rc.recalculate_cell(a, "B1") == 5
+    assert rc.recalculate_cell(b, "B1") == 80
+    assert rc.recalculate_cell(a, "b1") == 5
+    plans = list(rc._PLANS.values())
+    assert len(plans) == 2
+    assert {rc_ for cells in plans[0].values() for rc_ in cells} != {
+        rc_ for cells in plans[1].values() for rc_ in cells
+    }
+
+
+def test_plans_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc, "_PLANS", type(rc._PLANS)())
+    monkeypatch.setattr(rc, "_MAX_PLANS", 3)
+    path = _workbook(tmp_path / "a.xlsx", {f"A{i}": i for i in range(1, 7)})
+    for i in range(1, 7):
+        assert rc.recalculate_cell(path, f"A{i}") == i
+    assert [cell for cell, _ in rc._PLANS] == ["A4", "A5", "A6"]
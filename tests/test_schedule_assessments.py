@@ -0,0 +1,42 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the package re-exports the function under the module's name
+sa = importlib.import_module("grader_helper.assignment.schedule_assessments")
+
+GRADERS = ["Ann", "Bob", "Cat"]
+
+
+def _students(n=30):
+    return pd.DataFrame({"Student ID": [str(24000000 + i) for i in range(n)]})
+
+
+@pytest.mark.parametrize("effort", [0, -5, float("nan"), float("inf")])
+def test_effort_must_be_positive(effort):
+    with pytest.raises(ValueError, match="effort"):
+        sa.schedule_assessments(_students(), {"Lab 1": 10, "Lab 2": effort}, GRADERS, seed=1)
+
+
+def test_fallback_gives_nothing_to_graders_missing_from_weights():
+    rng = np.random.default_rng(0)
+    counts = sa._counts(12, GRADERS, np.zeros(3), {"Ann": 1, "Bob": 1}, np.ones(3, dtype=bool), rng)
+    assert counts.tolist() == [6, 6, 0]
+
+
+def test_fallback_without_weights_is_uniform():
+    rng = np.random.default_rng(0)
+    counts = sa._counts(12, GRADERS, np.zeros(3), None, np.ones(3, dtype=bool), rng)
+    assert counts.tolist() == [4, 4, 4]
+
+
+def test_graders_missing_from_weights_get_no_scripts():
+    out = sa.schedule_assessments(
+        _students(), {"Lab 1": 10, "Lab 2": 20, "Report": 30}, GRADERS,
+        weights={"Ann": 2, "Bob": 1}, seed=3,
+    )
+    load = out.attrs["grader_load"]
+    assert load.loc["Cat", ["Lab 1", "Lab 2", "Report"]].sum() == 0
+    assert load["Lab 1"].sum() == 30